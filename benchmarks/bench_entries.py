@@ -0,0 +1,49 @@
+"""Benchmarks entry rendering over the Pathfinder 2e corpus.
+
+Usage:
+    PATHFINDER_DATA_PATH=... python benchmarks/bench_entries.py [--repeat N]
+"""
+from argparse import ArgumentParser
+from collections import Counter
+import json
+import timeit
+
+from auditor import get_entry_type
+from pathfinder2e.card import Card
+from records import PF2eToolsData
+import utils
+
+
+def main(argv: None | list[str] = None):
+    """Prints per entry type rendering throughput for the Pathfinder 2e corpus."""
+    parser = ArgumentParser(prog="bench_entries")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    data_source = PF2eToolsData(utils.get_env_variable("PATHFINDER_DATA_PATH"))
+    entries = [
+        entry
+        for records in (data_source.spells, data_source.feats, data_source.actions)
+        for entry_list in records["entries"].dropna()
+        for entry in entry_list
+    ]
+    counts = Counter(map(get_entry_type, entries))
+
+    def render():
+        for entry in entries:
+            try:
+                Card.handle_entry(entry)
+            except (KeyError, TypeError, ValueError):
+                pass
+
+    seconds = min(timeit.repeat(render, number=1, repeat=args.repeat))
+    print(json.dumps({
+        "entries": len(entries),
+        "seconds": seconds,
+        "entries_per_second": len(entries) / seconds,
+        "entry_types": dict(counts.most_common()),
+    }, indent=4))
+
+
+if __name__ == "__main__":
+    main()
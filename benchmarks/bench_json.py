@@ -0,0 +1,53 @@
+"""Benchmarks JSON parsing and serialisation of the DnD 5e corpus for each installed codec backend.
+
+Usage:
+    DND_DATA_PATH=... python benchmarks/bench_json.py [--record_types spells items] [--repeat N]
+"""
+from argparse import ArgumentParser
+import json
+import timeit
+
+from archive import open_json
+from records import Dnd5eToolsData, TTRPGRecords
+import utils
+from utils import codec
+
+
+def main(argv: None | list[str] = None):
+    """Prints per backend parse and dump throughput for the source files of the record types provided."""
+    parser = ArgumentParser(prog="bench_json")
+    parser.add_argument("--record_types", nargs="+", default=["spells", "items", "monsters"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    data_source = Dnd5eToolsData(utils.get_env_variable("DND_DATA_PATH"))
+    record_sets = data_source.record_sets()
+    files = [
+        file
+        for record_type in args.record_types
+        for file in TTRPGRecords.get_source_files(data_source.locate(record_sets[record_type]))
+    ]
+    contents = []
+    for file in files:
+        with open_json(file) as stream:
+            contents.append(stream.read())
+    parsed = [codec.loads(data) for data in contents]
+    size = sum(map(len, contents))
+
+    results = {}
+    for backend in codec.BACKENDS:
+        parse = min(timeit.repeat(lambda: [codec.loads(data, backend) for data in contents], number=1, repeat=args.repeat))
+        dump = min(timeit.repeat(
+            lambda: [codec.dumps(data, backend=backend) for data in parsed], number=1, repeat=args.repeat
+        ))
+        results[backend] = {
+            "parse_seconds": parse,
+            "parse_mb_per_second": size / parse / 2**20,
+            "dump_seconds": dump,
+            "dump_mb_per_second": size / dump / 2**20,
+        }
+    print(json.dumps({"files": len(files), "bytes": size, "backends": results}, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Implements reading TTRPG Data from compressed JSON files and zip or tar archives of a data tree."""
+from contextlib import contextmanager
+import fnmatch
+import gzip
+import io
+from pathlib import Path, PurePosixPath
+import tarfile
+import threading
+import time
+from typing import IO, Iterator, NamedTuple
+import zipfile
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON_SUFFIXES = (".json", ".json.gz", ".json.zst")
+"""Suffixes of plain and compressed JSON files."""
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+"""Suffixes of archives of a TTRPG Data tree."""
+
+
+def is_json(path: "Path | ArchiveMember") -> bool:
+    """Returns whether the path provided is a plain or compressed JSON file."""
+    return path.name.endswith(JSON_SUFFIXES)
+
+
+def is_archive(path: Path) -> bool:
+    """Returns whether the path provided is a zip or tar archive."""
+    return path.name.endswith(ARCHIVE_SUFFIXES)
+
+
+def resolve_json(path: "Path | ArchiveMember") -> "Path | ArchiveMember | None":
+    """Returns the plain or compressed JSON file for a `.json` path, e.g. `spells.json.gz` for `spells.json`.
+
+    Args:
+        path (Path | ArchiveMember): Path to a `.json` file.
+    """
+    for suffix in ("", ".gz", ".zst"):
+        if (candidate := path.with_name(path.name + suffix)).exists():
+            return candidate
+    return None
+
+
+@contextmanager
+def open_json(path: "Path | ArchiveMember") -> Iterator[IO[bytes]]:
+    """Opens a plain or compressed JSON file for binary reading, decompressing it as it's read.
+
+    Args:
+        path (Path | ArchiveMember): Path to a JSON file, on disk or within an archive.
+
+    Raises:
+        ImportError: If a `.json.zst` file is opened without zstandard installed.
+    """
+    with path.open("rb") as raw:
+        if path.name.endswith(".gz"):
+            with gzip.GzipFile(fileobj=raw) as stream:
+                yield stream
+        elif path.name.endswith(".zst"):
+            if zstandard is None:
+                raise ImportError(f"Reading {path.name} requires the zstandard package.")
+            with zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+                yield stream
+        else:
+            yield raw
+
+
+class MemberStat(NamedTuple):
+    """File status of an archive member, as far as archives record it.
+
+    Reproducible archives fix every member's modification time, so members are only
+    unchanged if their size and the CRC-32 of their content are too. Zips record the
+    CRC-32, tar members are checksummed on first `ArchiveMember.stat`.
+    """
+
+    st_mtime_ns: int
+    st_size: int
+    checksum: int | None
+
+
+class DataArchive:
+    """Zip or tar archive of a TTRPG Data tree, read without unpacking it.
+
+    Members are listed once, from a zip's central directory or a tar's headers, and only the
+    members read are decompressed. Archives whose members all sit within a single top level
+    directory are read as if rooted at it.
+    """
+
+    def __init__(self, path: Path):
+        """Lists the members of an archive.
+
+        Args:
+            path (Path): Path to a zip or tar archive.
+        """
+        self.path = Path(path)
+        self.stamp = self.get_stamp(self.path)
+        self._lock = threading.Lock()
+        self._handle: zipfile.ZipFile | tarfile.TarFile | None = None
+        self._members: dict[str, tarfile.TarInfo] = {}
+        if zipfile.is_zipfile(self.path):
+            with zipfile.ZipFile(self.path) as archive:
+                self.files = {
+                    info.filename: MemberStat(
+                        int(time.mktime((*info.date_time, 0, 0, -1)) * 10**9), info.file_size, info.CRC
+                    )
+                    for info in archive.infolist()
+                    if not info.is_dir()
+                }
+        else:
+            with tarfile.open(self.path) as archive:
+                self._members = {member.name: member for member in archive if member.isfile()}
+            self.files = {
+                name: MemberStat(int(member.mtime * 10**9), member.size, None)
+                for name, member in self._members.items()
+            }
+        self.dirs = {parent.as_posix() for name in self.files for parent in PurePosixPath(name).parents}
+        tops = {name.split("/", 1)[0] for name in self.files}
+        self.root = tops.pop() if len(tops) == 1 and tops <= self.dirs else ""
+
+    @staticmethod
+    def get_stamp(path: Path) -> tuple[int, ...]:
+        """Returns the status of an archive file that changes whenever it's rebuilt.
+
+        The change time is included, as rebuilt reproducible archives can keep their size and modification time.
+        """
+        stat = path.stat()
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns
+
+    def __reduce__(self):
+        # archive handles can't be pickled, so worker processes list the archive again
+        return type(self), (self.path,)
+
+    def member(self, relative: str) -> "ArchiveMember":
+        """Returns the member at the path provided, relative to the archive's root.
+
+        Args:
+            relative (str): Path relative to the data tree, e.g. `data/spells/`.
+        """
+        member = ArchiveMember(self, PurePosixPath(relative).as_posix())
+        if not member.exists() and self.root:
+            member = ArchiveMember(self, f"{self.root}/{member.path}")
+        return member
+
+    def open(self, name: str) -> IO[bytes]:
+        """Opens an archive member for binary reading.
+
+        Members are decompressed as they're read. Tar members are located by their listed
+        headers, and read under the archive's lock, as reads share the archive's file.
+
+        Args:
+            name (str): Member name.
+        """
+        with self._lock:
+            if self._handle is None:
+                self._handle = zipfile.ZipFile(self.path) if zipfile.is_zipfile(self.path) else tarfile.open(self.path)
+            if isinstance(self._handle, zipfile.ZipFile):
+                return self._handle.open(name)
+            return io.BufferedReader(LockedReader(self._handle.extractfile(self._members[name]), self._lock))
+
+    def checksum(self, name: str) -> int:
+        """Returns the CRC-32 of an archive member's content, reading it in chunks.
+
+        Args:
+            name (str): Member name.
+        """
+        checksum = 0
+        with self.open(name) as stream:
+            while chunk := stream.read(2**20):
+                checksum = zlib.crc32(chunk, checksum)
+        return checksum
+
+
+class LockedReader(io.RawIOBase):
+    """Binary stream reading from another under a lock, for streams sharing a file between threads."""
+
+    def __init__(self, stream: IO[bytes], lock: threading.Lock):
+        """Initialises a locked stream.
+
+        Args:
+            stream (IO[bytes]): Stream to read from.
+            lock (threading.Lock): Lock held while reading.
+        """
+        self.stream = stream
+        self.lock = lock
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        with self.lock:
+            data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self.stream.close()
+        super().close()
+
+
+class ArchiveMember:
+    """Path to a file or directory within a DataArchive, supporting the Path methods TTRPG Data loading uses."""
+
+    __slots__ = ("archive", "path")
+
+    def __init__(self, archive: DataArchive, path: str):
+        """Initialises a member path.
+
+        Args:
+            archive (DataArchive): Archive containing the member.
+            path (str): Member name, without a trailing slash.
+        """
+        self.archive = archive
+        self.path = path
+
+    @property
+    def name(self) -> str:
+        """:str: Final component of the member path."""
+        return PurePosixPath(self.path).name
+
+    @property
+    def suffix(self) -> str:
+        """:str: File extension of the member path."""
+        return PurePosixPath(self.path).suffix
+
+    def __truediv__(self, other: str) -> "ArchiveMember":
+        return ArchiveMember(self.archive, (PurePosixPath(self.path) / other).as_posix())
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ArchiveMember) and (self.archive.path, self.path) == (other.archive.path, other.path)
+
+    def __hash__(self) -> int:
+        return hash((self.archive.path, self.path))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_posix()!r})"
+
+    def with_name(self, name: str) -> "ArchiveMember":
+        """Returns the member path with its final component replaced."""
+        return ArchiveMember(self.archive, PurePosixPath(self.path).with_name(name).as_posix())
+
+    def as_posix(self) -> str:
+        """Returns the member path, prefixed by the archive's path."""
+        return f"{self.archive.path.as_posix()}/{self.path}"
+
+    def exists(self) -> bool:
+        """Returns whether the member is a file or directory of the archive."""
+        return self.is_file() or self.is_dir()
+
+    def is_file(self) -> bool:
+        """Returns whether the member is a file of the archive."""
+        return self.path in self.archive.files
+
+    def is_dir(self) -> bool:
+        """Returns whether the member is a directory of the archive."""
+        return self.path in self.archive.dirs
+
+    def glob(self, pattern: str) -> list["ArchiveMember"]:
+        """Returns the files directly within the member directory whose names match the pattern provided."""
+        return [
+            ArchiveMember(self.archive, name)
+            for name in self.archive.files
+            if PurePosixPath(name).parent.as_posix() == self.path and fnmatch.fnmatch(PurePosixPath(name).name, pattern)
+        ]
+
+    def stat(self) -> MemberStat:
+        """Returns the member's status, as recorded by the archive, checksumming tar members the first time."""
+        stat = self.archive.files[self.path]
+        if stat.checksum is None:
+            stat = self.archive.files[self.path] = stat._replace(checksum=self.archive.checksum(self.path))
+        return stat
+
+    def open(self, mode: str = "rb") -> IO[bytes]:
+        """Opens the member for binary reading, see `DataArchive.open`."""
+        if mode != "rb":
+            raise ValueError(f"Archive members can only be opened for binary reading, not {mode}.")
+        return self.archive.open(self.path)
@@ -0,0 +1,170 @@
+"""Implements a streaming, parallel auditor of TTRPG Record entries."""
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import json
+from pathlib import Path
+import re
+from typing import Iterator
+
+from jsonpath_ng import ext
+
+from dnd5e.card import Card as Dnd5eCard
+from formatting import CardData
+from pathfinder2e.card import Card as PF2eCard
+from records import Dnd5eToolsData, PF2eToolsData, TTRPGData, TTRPGRecords
+import utils
+
+TAG_PATTERN = re.compile(r"\{@(\w+)")
+ENTRY_FIELDS = ("entries", "entriesHigherLevel", "trait", "action", "bonus", "reaction", "legendary", "mythic")
+
+
+def iter_entries(entries: list) -> Iterator[str | dict]:
+    """Yields every entry within the entries provided, depth first, without recursion.
+
+    Args:
+        entries (list): List of TTRPG entries.
+    """
+    stack = [iter(entries)]
+    while stack:
+        try:
+            entry = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        yield entry
+        if not isinstance(entry, dict):
+            continue
+        for key in ("entries", "items"):
+            match entry.get(key):
+                case list(children):
+                    stack.append(iter(children))
+                case dict(children):
+                    stack.append(iter(children.values()))
+
+
+def get_entry_type(entry: str | dict) -> str:
+    """Returns the type of the entry provided, `txt` for plain text."""
+    if not isinstance(entry, dict):
+        return "txt"
+    return entry.get("type", "entries" if "entries" in entry else "txt")
+
+
+def audit_file(file_path: Path, json_path: str) -> dict:
+    """Returns entry type and tag counts for the TTRPG Records in a single file.
+
+    Args:
+        file_path (Path): Path to a JSON file.
+        json_path (str): JSON path to a list of TTRPG Records.
+    """
+    entry_types = Counter()
+    tags = Counter()
+    examples = {}
+    records = TTRPGRecords.get_records(file_path, ext.parse(json_path))
+    for record in records:
+        for entry in iter_entries([*itertools.chain.from_iterable(record.get(field, []) for field in ENTRY_FIELDS)]):
+            entry_type = get_entry_type(entry)
+            entry_types[entry_type] += 1
+            if isinstance(entry, str):
+                tags.update(TAG_PATTERN.findall(entry))
+            elif entry_type not in examples:
+                examples[entry_type] = (record.get("name"), entry)
+    return {"records": len(records), "entry_types": entry_types, "tags": tags, "examples": examples}
+
+
+def check_entry(card_cls: type[CardData], entry_type: str, entry: dict) -> str | None:
+    """Returns why card_cls can't handle entries of the type provided, or None if it can.
+
+    Args:
+        card_cls (type[CardData]): Card class to check.
+        entry_type (str): Entry type.
+        entry (dict): Example entry of that type.
+    """
+    if entry_type == "txt":
+        return None
+    if not card_cls.supports_entry(entry_type):
+        return f"Entry type: {entry_type} is not supported."
+    try:
+        card_cls.handle_entry(entry)
+    except ValueError as error:
+        if not str(error).startswith("Entry type: "):
+            return f"{type(error).__name__}: {error}"
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    return None
+
+
+def audit(files: list[Path], json_path: str, card_cls: type[CardData], workers: int | None = None) -> dict:
+    """Returns a summary of entry types, tag usage and entries unsupported by card_cls.
+
+    Files are audited in parallel and merged as they complete, so no more than one file
+    per worker is held in memory at once.
+
+    Args:
+        files (list[Path]): Paths to JSON files.
+        json_path (str): JSON path to a list of TTRPG Records.
+        card_cls (type[CardData]): Card class to check entry support against.
+        workers (int | None, optional): Number of worker processes. Defaults to None, one per CPU.
+    """
+    records = 0
+    entry_types = Counter()
+    tags = Counter()
+    examples = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(audit_file, files, itertools.repeat(json_path)):
+            records += result["records"]
+            entry_types.update(result["entry_types"])
+            tags.update(result["tags"])
+            examples = result["examples"] | examples
+
+    unsupported = {}
+    for entry_type, (record_name, entry) in examples.items():
+        if (error := check_entry(card_cls, entry_type, entry)) is not None:
+            unsupported[entry_type] = {
+                "count": entry_types[entry_type],
+                "error": error,
+                "record": record_name,
+                "example": entry,
+            }
+
+    return {
+        "files": len(files),
+        "records": records,
+        "entries": entry_types.total(),
+        "entry_types": dict(entry_types.most_common()),
+        "tags": dict(tags.most_common()),
+        "unsupported": unsupported,
+    }
+
+
+def main(argv: None | list[str] = None):
+    """Command Line Interface for retreiving entry data."""
+    parser = ArgumentParser(
+        prog="data_auditor",
+        description="Exports a JSON summary of Entry Data."
+    )
+    parser.add_argument("system_source", choices=["dnd5e", "pf2e"])
+    parser.add_argument("record_type")
+    parser.add_argument("--workers", type=int, help="Number of worker processes. One per CPU by default.")
+
+    args = parser.parse_args(argv)
+    data_source: TTRPGData
+    if args.system_source == "dnd5e":
+        data_source = Dnd5eToolsData(utils.get_env_variable("DND_DATA_PATH"))
+        card_cls = Dnd5eCard
+    else:
+        data_source = PF2eToolsData(utils.get_env_variable("PATHFINDER_DATA_PATH"))
+        card_cls = PF2eCard
+
+    try:
+        record_set = data_source.record_sets()[args.record_type]
+    except KeyError:
+        parser.error(f"Unknown record type {args.record_type}, choose from {', '.join(data_source.record_sets())}.")
+    files = TTRPGRecords.get_source_files(data_source.locate(record_set))
+    summary = audit(files, record_set.json_path, card_cls, workers=args.workers)
+    print(json.dumps(summary, indent=4))
+
+
+if __name__ == "__main__":
+    main()
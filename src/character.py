@@ -1,30 +1,92 @@
 
 from collections import UserDict
-import json
+from pathlib import Path
+from typing import Self
 
 from jsonpath_ng.ext import parse
 import requests
 
+from profiling import PROFILER
+from records import TTRPGData
+from utils import codec
+
 
 
 class BaseBuild(UserDict):
     """Class for ingesting JSON character data."""
 
+    @classmethod
+    def from_json_id(cls, id: int) -> Self:
+        """Creates a build from a JSON id."""
+        raise NotImplementedError(f"No JSON id service implemented for {cls.__name__}. Please implement one.")
+
+    @classmethod
+    def from_json(cls, json_data: bytes | str) -> Self:
+        """Creates a build from JSON data."""
+        raise NotImplementedError(f"No JSON format implemented for {cls.__name__}. Please implement one.")
+
+    @classmethod
+    def load(
+        cls,
+        json_path: Path | None,
+        json_id: int | None,
+        data_source: TTRPGData | None = None,
+        eager: tuple[str, ...] = (),
+        needed: tuple[str, ...] = (),
+    ) -> Self:
+        """Loads a build from a JSON id or file, loading the TTRPG Data it needs meanwhile.
+
+        RecordSets in `eager` start loading before the build is fetched, so that fetching and
+        loading overlap. Of the RecordSets in `needed`, only those the build has records in,
+        see `record_types`, start loading once it's fetched.
+
+        Args:
+            json_path (Path | None): Path to a character JSON File.
+            json_id (int | None): Character JSON ID.
+            data_source (TTRPGData | None, optional): TTRPG Data source to load RecordSets of. Defaults to None.
+            eager (tuple[str, ...], optional): Names of RecordSets to load while fetching. Defaults to ().
+            needed (tuple[str, ...], optional): Names of RecordSets to load if the build has records in them.
+                Defaults to ().
+
+        Raises:
+            ValueError: If neither json_path nor json_id is provided.
+        """
+        if not (json_id or json_path):
+            raise ValueError("One of json_path or json_id must be provided.")
+        if data_source is not None and eager:
+            data_source.prewarm(*eager)
+        if json_id:
+            build = cls.from_json_id(json_id)
+        else:
+            build = cls.from_json(json_path.read_bytes())
+        if data_source is not None and (
+            lazy := [name for name in needed if name not in eager and name in build.record_types]
+        ):
+            data_source.prewarm(*lazy)
+        return build
+
+    @property
+    def record_types(self) -> list[str]:
+        """:list[str]: Names of the TTRPG Data RecordSets the build has records in."""
+        return []
+
     @classmethod
     def _from_url(cls, url_format: str, format_params: tuple, headers: dict = None,  data_path: str = "$"):
         """Pulls character data from URL and JSON Path."""
         url = url_format.format(*format_params)
-        with requests.get(url, headers=headers) as response:
+        with PROFILER.stage("build.fetch"), requests.get(url, headers=headers) as response:
             response.raise_for_status()
-            return cls._from_json_data(json_data=response.text, data_path=data_path)
+            json_data = response.content
+        return cls._from_json_data(json_data=json_data, data_path=data_path)
         
 
     
     @classmethod
-    def _from_json_data(cls, json_data: str, data_path: str = "$"):
+    def _from_json_data(cls, json_data: bytes | str, data_path: str = "$"):
         """Pulls character data from JSON data and JSON path."""
-        build_data, *_ = parse(data_path).find(json.loads(json_data))
-        return cls(build_data.value)
+        with PROFILER.stage("build.parse"):
+            build_data, *_ = parse(data_path).find(codec.loads(json_data))
+            return cls(build_data.value)
 
 
 
@@ -1,16 +1,29 @@
 """Module for manage package command line interface."""
 import argparse
+import math
 from pathlib import Path
+import sys
 from typing import Callable
 
 from dnd5e import (
     get_spell_cards as dnd_spell,
-    get_magic_item_cards as dnd_magic
+    get_magic_item_cards as dnd_magic,
+    get_monster_cards as dnd_monsters,
+    get_full_character_cards as dnd_full,
+    get_record_estimate as dnd_estimate
 )
 from pathfinder2e import (
     get_spell_cards as pf2e_spell, 
-    get_full_character_cards as pf2e_full
+    get_full_character_cards as pf2e_full,
+    get_record_estimate as pf2e_estimate
 )
+from dnd5e.script import CARD_TYPES as DND_CARD_TYPES
+from formatting import merge_shards
+from pathfinder2e.script import CARD_TYPES as PF2E_CARD_TYPES
+from profiling import PROFILER
+from records import REGISTRY, TTRPGRecords
+import utils
+from utils import codec
 
 
 class TTRPGParentParser(argparse.ArgumentParser):
@@ -54,6 +67,54 @@ class TTRPGParentParser(argparse.ArgumentParser):
             default=(3, 3),
         )
 
+        self.add_argument(
+            "--estimate",
+            action="store_true",
+            help="Prints the approximate number of cards and pages instead of rendering them.",
+        )
+
+        self.add_argument(
+            "--manifest",
+            type=Path,
+            metavar="PATH",
+            help="Path to a manifest of previously rendered cards. Only new or changed cards are rendered, and the manifest is updated.",
+        )
+
+        self.add_argument(
+            "--source_priority",
+            metavar="SOURCE",
+            nargs="+",
+            help="Space separated TTRPG Sources, highest priority first, used to pick between records sharing a name. e.g. `PC1 CRB`.",
+        )
+
+        self.add_argument(
+            "--shard",
+            type=utils.shard,
+            metavar="I/N",
+            help="Renders only the I-th of N shards of the cards, split by a stable hash of each record's name and source. Shards are combined with the `merge` subcommand.",
+        )
+
+        self.add_argument(
+            "--timings",
+            nargs="?",
+            const="-",
+            metavar="PATH",
+            help="Writes a JSON report of per-stage timings, record counts and cache hit rates. Written to stderr if no path is provided.",
+        )
+
+        self.add_argument(
+            "--trace_memory",
+            action="store_true",
+            help="Adds peak memory to the --timings report. Tracing memory slows down the run, inflating its timings.",
+        )
+
+        self.add_argument(
+            "--profile",
+            type=Path,
+            metavar="PATH",
+            help="Writes a cProfile/pstats dump of the run to the provided path.",
+        )
+
 
     def get_subparser(self, name: str, func: Callable, description: None | str = None):
         subparser = self.subparers.add_parser(name, description=description)
@@ -61,6 +122,40 @@ class TTRPGParentParser(argparse.ArgumentParser):
         subparser.set_defaults(func=func)
         return subparser
 
+def add_estimate_args(parser: argparse.ArgumentParser, record_types: list[str]):
+        parser.add_argument("--record_type", choices=record_types, required=True, help="TTRPG Record type to estimate.")
+        parser.add_argument(
+            "--sources",
+            metavar="SOURCE",
+            nargs="+",
+            help="Space separated TTRPG Sources to estimate. All sources by default."
+        )
+        return parser
+
+def challenge_rating(value: str) -> float:
+        """Parses a challenge rating argument, e.g. `1/4` or `5`."""
+        try:
+            rating = utils.challenge_rating(value)
+        except (ValueError, ZeroDivisionError):
+            rating = None
+        if rating is None or not math.isfinite(rating) or rating < 0:
+            raise argparse.ArgumentTypeError(f"invalid challenge rating: {value!r}, expected e.g. `1/4` or `5`.")
+        return rating
+
+def add_monster_args(parser: argparse.ArgumentParser):
+        parser.add_argument(
+            "--cr_range",
+            metavar="CR",
+            nargs=2,
+            type=challenge_rating,
+            help="Inclusive range of challenge ratings. Formatted as `MIN MAX`, e.g. `1/4 5`."
+        )
+        parser.add_argument("--types", metavar="TYPE", nargs="+", help="Space separated creature types, e.g. `dragon fiend`.")
+        parser.add_argument("--environments", metavar="ENVIRONMENT", nargs="+", help="Space separated environments, e.g. `forest`.")
+        parser.add_argument("--sources", metavar="SOURCE", nargs="+", help="Space separated TTRPG Sources, e.g. `MM`.")
+        parser.add_argument("--workers", type=int, help="Number of worker processes to render with. One per CPU by default.")
+        return parser
+
 def add_names_arg(parser: argparse.ArgumentParser):
         parser.data_input.add_argument(
             "--names",
@@ -71,6 +166,11 @@ def add_names_arg(parser: argparse.ArgumentParser):
         )
         return parser
 
+def merge_shard_decks(shard_paths: list[Path], page_layout: tuple[int, int], **_):
+        """Prints the RPGCards of every shard of an export, see `formatting.merge_shards`."""
+        shards = [codec.loads(path.read_bytes()) for path in shard_paths]
+        codec.echo(codec.dumps(merge_shards(shards, page_layout), indent=True))
+
 class CardParamAction(argparse.Action):
 
     def __call__(self, parser, namespace, values, option_string = None):
@@ -115,9 +215,61 @@ def main(argv: None | list[str] = None):
         func=dnd_magic
     )
 
+    parent_parser.get_subparser(
+        name="dnd5efullcharacter",
+        description="Creates DnD 5th Edition (2014) Spells, Class Features, Feats and Magic Items cards from provided params.",
+        func=dnd_full
+    )
+
+    dnd5emonsters_subparser = parent_parser.get_subparser(
+        name="dnd5emonsters",
+        description="Creates DnD 5th Edition (2014) Monster stat block cards by name, or for whole CR ranges, types and environments.",
+        func=dnd_monsters
+    )
+    add_monster_args(parser=dnd5emonsters_subparser)
+
+    dnd5eestimate_subparser = parent_parser.get_subparser(
+        name="dnd5eestimate",
+        description="Estimates the DnD 5th Edition (2014) cards and pages a whole record type would take.",
+        func=dnd_estimate
+    )
+    add_estimate_args(parser=dnd5eestimate_subparser, record_types=[*DND_CARD_TYPES])
+
+    pf2eestimate_subparser = parent_parser.get_subparser(
+        name="pf2eestimate",
+        description="Estimates the Pathfinder 2e cards and pages a whole record type would take.",
+        func=pf2e_estimate
+    )
+    add_estimate_args(parser=pf2eestimate_subparser, record_types=[*PF2E_CARD_TYPES])
+
+    merge_subparser = parent_parser.get_subparser(
+        name="merge",
+        description="Combines the outputs of every `--shard` of an export into its pages, as a single export would print.",
+        func=merge_shard_decks
+    )
+    merge_subparser.add_argument(
+        "--shard_paths", metavar="PATH", type=Path, nargs="+", required=True, help="Space separated paths to each shard's output."
+    )
+
 
     
     
     args = parent_parser.parse_args(argv)
-    kwargs = dict(kw for kw in args._get_kwargs() if kw[0] not in ["func"])
-    args.func(**kwargs)
+    kwargs = dict(kw for kw in args._get_kwargs() if kw[0] not in ["func", "timings", "profile", "trace_memory", "source_priority"])
+    TTRPGRecords.set_source_priority(args.source_priority)
+    if args.timings is None and args.profile is None:
+        return args.func(**kwargs)
+
+    PROFILER.start(profile=args.profile is not None, trace_memory=args.trace_memory)
+    try:
+        with PROFILER.stage("total"):
+            args.func(**kwargs)
+    finally:
+        PROFILER.stop()
+        if args.profile is not None:
+            PROFILER.dump_stats(args.profile)
+        report = PROFILER.report() | {"datasets": REGISTRY.usage()}
+        if args.timings == "-":
+            print(codec.dumps(report, indent=True).decode(), file=sys.stderr)
+        elif args.timings is not None:
+            Path(args.timings).write_bytes(codec.dumps(report, indent=True))
@@ -1,12 +1,20 @@
 """Implements DnD5e functionality for RPG cards."""
 from dnd5e.build import DnDBeyond
-from dnd5e.card import SpellCard, MagicItemCard
-from dnd5e.script import get_spell_cards, get_magic_item_cards
+from dnd5e.card import SpellCard, MagicItemCard, MonsterCard, ClassFeatureCard, FeatCard
+from dnd5e.script import (
+	get_spell_cards, get_magic_item_cards, get_monster_cards, get_full_character_cards, get_record_estimate
+)
 
 __all__ = [
 	get_spell_cards,
 	get_magic_item_cards,
+	get_monster_cards,
+	get_full_character_cards,
+	get_record_estimate,
 	DnDBeyond,
 	SpellCard,
-	MagicItemCard
+	MagicItemCard,
+	MonsterCard,
+	ClassFeatureCard,
+	FeatCard
 ]
\ No newline at end of file
@@ -3,7 +3,9 @@
 from functools import cached_property
 import itertools
 import logging
+import pandas as pd
 from character import BaseBuild
+from records import TTRPGRecords
 
 
 logger = logging.getLogger(__name__)
@@ -22,8 +24,8 @@ class DnDBeyond(BaseBuild):
 	
 		
 	@classmethod
-	def from_json(cls, json_data: str):
-		"""Creates a pathbuilder buils from JSON string data."""
+	def from_json(cls, json_data: bytes | str):
+		"""Creates a pathbuilder buils from JSON data."""
 		return cls._from_json_data(
 			json_data=json_data,
 			data_path="$.data",
@@ -73,3 +75,76 @@ class DnDBeyond(BaseBuild):
 			for item in self["inventory"]
 			if item["definition"].get("magic", False)
 		]
+
+	@property
+	def feats(self):
+		""":list[str]: List of Feat names."""
+		return [feat["definition"]["name"] for feat in self.get("feats", [])]
+
+	@property
+	def record_types(self):
+		""":list[str]: Names of the Dnd5eToolsData RecordSets the build has records in."""
+		raw = {
+			"spells": self.spell_data,
+			"class_features": self.get("classes"),
+			"feats": self.get("feats"),
+			"items": self.magic_items,
+			"homebrew_items": self.magic_items,
+		}
+		return [name for name, records in raw.items() if records]
+
+	@property
+	def class_features(self) -> pd.DataFrame:
+		""":pd.DataFrame: Class and subclass features gained, one row per (name, className, subclass, level), in build order.
+
+		`subclass` is the DnDBeyond subclass name, e.g. `School of Evocation`, of subclass features, and missing for class features.
+		"""
+		features = []
+		for char_class in self["classes"]:
+			class_name = char_class["definition"]["name"]
+			subclass = char_class.get("subclassDefinition") or {}
+			for subclass_name, class_features in (
+				(None, char_class.get("classFeatures", [])),
+				(subclass.get("name"), subclass.get("classFeatures", [])),
+			):
+				for feature in class_features:
+					required_level = feature["definition"].get("requiredLevel", 1)
+					if required_level <= char_class["level"]:
+						features.append((feature["definition"]["name"], class_name, subclass_name, required_level))
+		return pd.DataFrame(features, columns=["name", "className", "subclass", "level"]).drop_duplicates(ignore_index=True)
+
+	@staticmethod
+	def is_subclass(subclass: str | None, short_name: str | None) -> bool:
+		"""Returns whether a DnDBeyond subclass name names the subclass of a Class Feature Data record.
+
+		DnDBeyond names subclasses in full, e.g. `School of Evocation`, where the Class Feature Data
+		uses short names, e.g. `Evocation`, so every word of the short name must be in the full name.
+		Class features have neither.
+
+		Args:
+			subclass (str | None): DnDBeyond subclass name, missing for class features.
+			short_name (str | None): Subclass short name of the record, missing for class features.
+		"""
+		if pd.isna(subclass) or pd.isna(short_name):
+			return pd.isna(subclass) and pd.isna(short_name)
+		words = set(TTRPGRecords.normalize_name(subclass).split())
+		return set(TTRPGRecords.normalize_name(short_name).split()) <= words
+
+	def eligible_class_features(self, keys: pd.DataFrame, sources: tuple[str, ...] = ()) -> list[int]:
+		"""Returns the Class Feature Data positions of every feature gained, in build order, as a single join.
+
+		Features are joined on their name, class, subclass and level, see `is_subclass`. Features
+		matching records of several sources are resolved by source priority, then position.
+
+		Args:
+			keys (pd.DataFrame): Class feature key table, see `Dnd5eToolsData.class_feature_keys`.
+			sources (tuple[str, ...], optional): TTRPG Sources, highest priority first. Defaults to (), the global source priority.
+		"""
+		features = self.class_features
+		features = features.assign(key=features["name"].map(TTRPGRecords.normalize_name), order=range(len(features)))
+		joined = features.merge(keys, on=["key", "className", "level"])
+		joined = joined[[*map(self.is_subclass, joined["subclass"], joined["subclassShortName"])]]
+		ranks = TTRPGRecords.source_ranks(tuple(sources) or TTRPGRecords.source_priority)
+		joined = joined.assign(source_rank=joined["source"].map(lambda source: ranks.get(source, len(ranks))))
+		joined = joined.sort_values(["order", "source_rank", "position"]).drop_duplicates("order")
+		return joined["position"].tolist()
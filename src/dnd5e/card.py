@@ -3,7 +3,8 @@
 from itertools import starmap
 import itertools
 import logging
-from formatting import CardData
+import re
+from formatting import CardData, projected_property
 import utils
 from utils import static
 
@@ -48,7 +49,7 @@ class SpellCard(Card):
 			"rule"
 		]
   
-	@property
+	@projected_property
 	def level(self):
 		""":str: Spell level as wordsd."""
 		match self["level"]:
@@ -65,7 +66,7 @@ class SpellCard(Card):
 			case _:
 				raise ValueError(f"Unsupported spell level {self['level']}")
 
-	@property
+	@projected_property
 	def school(self):
 		""":str: Spell school name."""
 		try:
@@ -86,7 +87,7 @@ class SpellCard(Card):
 
 		return [(k, v) for k, v in raw if v is not None]
  
-	@property
+	@projected_property
 	def casting_time(self):
 		""":str: Spell casting time."""
 		return ", ".join(
@@ -94,7 +95,7 @@ class SpellCard(Card):
 			for each in self["time"]
 		) or None
 		
-	@property
+	@projected_property
 	def range(self):
 		""":str: Spell range name."""
 		match self["range"]:
@@ -112,7 +113,7 @@ class SpellCard(Card):
 			case _:
 				raise ValueError(f"Unsupported range type: {self['range']['type']} for spell {self['name']}")
 			
-	@property
+	@projected_property
 	def components(self):
 		""":str: List of Spell components."""
 		component_strs = []
@@ -130,7 +131,7 @@ class SpellCard(Card):
 			
 		return ", ".join(component_strs) or None
 
-	@property
+	@projected_property
 	def duration(self):
 		""":str: Spell duration."""
 		durations = []
@@ -154,7 +155,7 @@ class SpellCard(Card):
 		return ", ".join(durations) or None
 	
 
-	@property
+	@projected_property
 	def heightened(self):
 		""":listr[str]: Heightened text lines.."""
 		hightened_entries = list(map(self.handle_entry, self.get("entriesHigherLevel", [])))
@@ -222,4 +223,265 @@ class MagicItemCard(Card):
 			(name.capitalize(), self[name])
 			for name in property_names
 			if self.get(name)
-		]
\ No newline at end of file
+		]
+
+class MonsterCard(Card):
+	"""Class to handle conversion between DnD5e Monster TTRPG Records and cards."""
+
+	FEATURE_SECTIONS: tuple[tuple[str, str | None], ...] = (
+		("trait", None),
+		("action", "Actions"),
+		("bonus", "Bonus Actions"),
+		("reaction", "Reactions"),
+		("legendary", "Legendary Actions"),
+		("mythic", "Mythic Actions"),
+	)
+	"""Monster feature fields and their section titles."""
+
+	@property
+	def tags(self):
+		creature_type = utils.creature_type(self.get("type", []))
+		return [
+			*super().tags,
+			"monster",
+			*(creature_type if isinstance(creature_type, list) else [creature_type]),
+		]
+
+	@property
+	def icon(self):
+		""":str: Space separated list of icon names."""
+		return "imp-laugh"
+
+	@classmethod
+	def scrub_refs(cls, text: str):
+		"""Removes references from text, spelling out attack, hit and DC tags."""
+		text = re.sub(r"\{@atk ([^}]+)\}", lambda match: f"<i>{static.ATTACK_TYPES.get(match[1], match[1])}:</i>", text)
+		text = re.sub(r"\{@hit (-?\d+)\}", lambda match: f"{int(match[1]):+d}", text)
+		text = re.sub(r"\{@dc (\d+)\}", r"DC \1", text)
+		text = re.sub(r"\{@recharge ?(\d?)\}", lambda match: f"(Recharge {match[1] + '-6' if match[1] else '6'})", text)
+		return super().scrub_refs(text.replace("{@h}", "<i>Hit:</i> "))
+
+	@property
+	def header(self):
+		""":list[str]: header text."""
+		return [
+			f"subtitle | {self.subtitle}",
+			"rule",
+			*starmap("property | {} | {}".format, self.defences),
+			"rule",
+			f"dndstats | {' | '.join(str(self.get(ability, 10)) for ability in static.ABILITIES)}",
+			"rule",
+			*starmap("property | {} | {}".format, self.properties),
+			"rule",
+		]
+
+	@property
+	def body(self):
+		""":list[str]: Text body."""
+		lines = []
+		for field, title in self.FEATURE_SECTIONS:
+			if not (features := self.get(field)):
+				continue
+			if title is not None:
+				lines.append(f"section | {title}")
+			for feature in features:
+				lines.extend(self.get_feature_lines(feature))
+		return list(map(self.scrub_refs, lines))
+
+	@classmethod
+	def get_feature_lines(cls, feature: dict) -> list[str]:
+		"""Returns the lines of a named monster feature, with its name inline with its first entry."""
+		first, *rest = feature.get("entries", [""]) or [""]
+		if isinstance(first, str):
+			lines = [f"property | {feature.get('name', '')} | {first}"]
+		else:
+			lines = [f"text | <b>{feature.get('name', '')}</b>", *cls.handle_entry(first)]
+		return [*lines, *itertools.chain.from_iterable(map(cls.handle_entry, rest))]
+
+	@property
+	def subtitle(self):
+		""":str: Size, type and alignment."""
+		sizes = "/".join(static.SIZE_MAPPING.get(size, size) for size in self.get("size", []))
+		creature_type = utils.creature_type(self.get("type", ""))
+		if isinstance(creature_type, list):
+			creature_type = utils.word_list(*creature_type, join="or")
+		match self.get("type"):
+			case {"tags": [*tags]}:
+				creature_type += f" ({', '.join(tag if isinstance(tag, str) else tag.get('tag', '') for tag in tags)})"
+		return f"{sizes} {creature_type}, {self.alignment}".capitalize()
+
+	@property
+	def alignment(self):
+		""":str: Alignment."""
+		words = [
+			static.ALIGNMENT_MAPPING.get(part, part) if isinstance(part, str) else "varies"
+			for part in self.get("alignment", ["U"])
+		]
+		return " ".join(dict.fromkeys(words))
+
+	@property
+	def challenge_rating(self):
+		""":str: Challenge rating."""
+		match self.get("cr"):
+			case {"cr": rating}:
+				return rating
+			case rating:
+				return rating
+
+	@property
+	def defences(self):
+		""":list[tuple[str, str]]: Armor class, hit points and speed."""
+		armor_classes = []
+		for ac in self.get("ac", []):
+			match ac:
+				case {"ac": value, "from": [*sources]}:
+					armor_classes.append(f"{value} ({', '.join(map(self.scrub_refs, sources))})")
+				case {"ac": value}:
+					armor_classes.append(str(value))
+				case value:
+					armor_classes.append(str(value))
+		match self.get("hp"):
+			case {"average": average, "formula": formula}:
+				hit_points = f"{average} ({formula})"
+			case {"special": special}:
+				hit_points = special
+			case hp:
+				hit_points = hp
+		raw = (
+			("Armor Class", ", ".join(armor_classes) or None),
+			("Hit Points", hit_points),
+			("Speed", self.speed),
+		)
+		return [(k, v) for k, v in raw if v is not None]
+
+	@property
+	def speed(self):
+		""":str: Movement speeds."""
+		speeds = []
+		for mode, value in self.get("speed", {}).items():
+			match value:
+				case {"number": number, "condition": condition}:
+					value = f"{number} ft. {condition}"
+				case int(number):
+					value = f"{number} ft."
+				case _:
+					continue
+			speeds.append(value if mode == "walk" else f"{mode} {value}")
+		return ", ".join(speeds) or None
+
+	@staticmethod
+	def join_values(values: list) -> str:
+		"""Returns a comma separated list of damage or condition values, with any nested notes."""
+		joined = []
+		for value in values:
+			match value:
+				case str():
+					joined.append(value)
+				case {"special": special}:
+					joined.append(special)
+				case dict():
+					nested = next((v for v in value.values() if isinstance(v, list)), [])
+					note = " ".join(filter(None, [value.get("preNote"), MonsterCard.join_values(nested), value.get("note")]))
+					joined.append(note)
+		return ", ".join(joined)
+
+	@property
+	def properties(self):
+		""":list[tuple[str, str]]: Monster properties."""
+		senses = [*(self.get("senses") or []), f"passive Perception {self.get('passive', 10)}"]
+		raw = (
+			("Saving Throws", ", ".join(f"{k.capitalize()} {v}" for k, v in (self.get("save") or {}).items()) or None),
+			("Skills", ", ".join(f"{k.capitalize()} {v}" for k, v in (self.get("skill") or {}).items()) or None),
+			("Damage Vulnerabilities", self.join_values(self.get("vulnerable") or []) or None),
+			("Damage Resistances", self.join_values(self.get("resist") or []) or None),
+			("Damage Immunities", self.join_values(self.get("immune") or []) or None),
+			("Condition Immunities", self.join_values(self.get("conditionImmune") or []) or None),
+			("Senses", ", ".join(senses)),
+			("Languages", ", ".join(self.get("languages") or []) or "—"),
+			("Challenge", self.challenge_rating),
+		)
+		return [(k, self.scrub_refs(str(v))) for k, v in raw if v is not None]
+
+
+class ClassFeatureCard(Card):
+	"""Class to handle conversion between DnD5e Class and Subclass Feature TTRPG Records and cards."""
+
+	@property
+	def tags(self):
+		raw = [
+			*super().tags,
+			"class_feature",
+			self.get("className", "").lower() or None,
+			self.get("subclassShortName", "").lower() or None,
+		]
+		return [tag for tag in raw if tag is not None]
+
+	@property
+	def icon(self):
+		""":str: Space separated list of icon names."""
+		return "upgrade"
+
+	@property
+	def header(self):
+		""":list[str]: header text."""
+		return [f"subtitle | {self.subtitle}", "rule"]
+
+	@property
+	def subtitle(self):
+		""":str: Class, subclass and level the feature is gained at."""
+		class_name = self["className"]
+		if subclass := self.get("subclassShortName"):
+			class_name = f"{class_name} ({subclass})"
+		return f"{class_name} Level {self['level']} Feature"
+
+
+class FeatCard(Card):
+	"""Class to handle conversion between DnD5e Feat TTRPG Records and cards."""
+
+	@property
+	def tags(self):
+		return super().tags + ["feat"]
+
+	@property
+	def icon(self):
+		""":str: Space separated list of icon names."""
+		return "vitruvian-man"
+
+	@property
+	def header(self):
+		""":list[str]: header text."""
+		if not (prerequisite := self.prerequisite):
+			return ["subtitle | Feat", "rule"]
+		return ["subtitle | Feat", "rule", f"property | Prerequisite | {prerequisite}", "rule"]
+
+	@property
+	def prerequisite(self):
+		""":str | None: Feat prerequisites, alternatives separated by "or"."""
+		alternatives = []
+		for requirement in self.get("prerequisite") or []:
+			parts = []
+			for kind, value in requirement.items():
+				match kind, value:
+					case "level", {"level": level}:
+						parts.append(f"Level {level}")
+					case "level", level:
+						parts.append(f"Level {level}")
+					case "ability", [*abilities]:
+						parts.append(" or ".join(
+							f"{ability.upper()} {score}"
+							for choice in abilities for ability, score in choice.items()
+						))
+					case "race", [*races]:
+						parts.append(" or ".join(race["name"].title() for race in races))
+					case "spellcasting" | "spellcasting2020", True:
+						parts.append("The ability to cast at least one spell")
+					case "proficiency", [*proficiencies]:
+						parts.append(" or ".join(
+							f"{name.title()} {category} proficiency"
+							for choice in proficiencies for category, name in choice.items()
+						))
+					case "other", str():
+						parts.append(value)
+			if parts:
+				alternatives.append(", ".join(parts))
+		return " or ".join(alternatives) or None
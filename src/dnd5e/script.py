@@ -1,19 +1,45 @@
 """"""
 
+import functools
 import itertools
-import json
 import logging
 from pathlib import Path
 
 
-from dnd5e.card import MagicItemCard
-from formatting import CardPage
+from dnd5e.card import ClassFeatureCard, FeatCard, MagicItemCard, MonsterCard
+from formatting import CardData, export_deck, estimate_deck
+from manifest import Manifest
+from profiling import PROFILER
 from dnd5e import SpellCard, DnDBeyond
 from records import Dnd5eToolsData, TTRPGRecords
 import utils
+from utils import codec
 
 logger = logging.getLogger(__name__)
 
+CARD_TYPES: dict[str, type[CardData]] = {
+	"spells": SpellCard,
+	"items": MagicItemCard,
+	"homebrew_items": MagicItemCard,
+	"monsters": MonsterCard,
+}
+"""Card classes by Dnd5eToolsData record set."""
+
+def load_spell_card(spells: TTRPGRecords, name: str, source: str | None) -> SpellCard:
+	"""Returns the card of a spell, labelled with the source granting it if one is provided.
+
+	Args:
+		spells (TTRPGRecords): Spell Data.
+		name (str): Spell name.
+		source (str | None): Class, race or feature granting the spell.
+	"""
+	position = spells.query_position(name, fuzzy=True)
+	if source is None:
+		return SpellCard.from_records(spells, position)
+	name = spells.index.get_level_values("name")[position]
+	return SpellCard.from_records(spells, position, name=f"{name} ({source})", spell_source=source)
+
+
 def get_spell_cards(
 		json_path: Path | None = None, 
 		json_id: int | None = None, 
@@ -21,6 +47,9 @@ def get_spell_cards(
 		card_params: dict = None,
 		page_layout: tuple[int, int] = None, 
 		card_layout: tuple[int, int] = None,
+		estimate: bool = False,
+		manifest: Path | None = None,
+		shard: tuple[int, int] | None = None,
 	):
 	"""Prints RPGCards to the command line.
 
@@ -31,44 +60,46 @@ def get_spell_cards(
 		card_params (dict): Card Parameter Dictionary.
 		page_layout (tuple[int, int]): Page layout dimentions.
 		card_layout (tuple[int, int]): _Card Layout dimentions.
+		estimate (bool, optional): Whether to print an estimate of the cards and pages instead. Defaults to False.
+		manifest (Path | None, optional): Path to a manifest of previously rendered cards, to reuse and update.
+			Defaults to None.
+		shard (tuple[int, int] | None, optional): Shard to render and number of shards, see `formatting.export_deck`.
+			Defaults to None, rendering every card.
 	"""
 
 	## Extract Names
-	data_source = Dnd5eToolsData(utils.get_env_variable("DND_DATA_PATH"))
-	records = data_source.spells
+	data_source = Dnd5eToolsData.open(utils.get_env_variable("DND_DATA_PATH"))
+	deck_manifest = Manifest.open(None if estimate else manifest, data_source, ["spells"], card_params, card_layout)
 	if names:
 		spell_and_source = list(itertools.product(names, [None]))
-	else:
-		if json_id:
-			build = DnDBeyond.from_json_id(json_id)
-		elif json_path:
-			build = DnDBeyond.from_json(json_path.read_text())
-		else:
-			raise ValueError("One of names, json_path or json_id must be provided.")
+	elif json_id or json_path:
+		build = DnDBeyond.load(
+			json_path, json_id, None if deck_manifest.cached else data_source, eager=("spells",)
+		)
 		spell_and_source = build.spells_with_sources
+	else:
+		raise ValueError("One of names, json_path or json_id must be provided.")
 	
 
 	## Query Data
-	card_pairs = []
-	c_h, c_w = card_layout
+	cards = []
 	for name, source in spell_and_source:
 		try:
-			record = records.query_record(name)
-			if source is not None:
-				record["name"] += f" ({source})"
-				records["spell_source"] = source
-			spell = SpellCard(record)
+			cards.append(deck_manifest.card(
+				f"SpellCard:{name}:{source}",
+				lambda: load_spell_card(data_source.spells, name, source)
+			))
 		except (KeyError, IndexError):
 			logger.warning(f"Unable to find TTRPG Record: {name} in PC1 or PC2.")
-		card_pairs.extend(spell.get_card_pairs(height=c_h, width=c_w, **card_params))
+			continue
 
 	## Page formatting
-	p_h, p_w = page_layout
-	rpg_card_data = []
-	for page in CardPage.from_pairs(card_pairs=card_pairs, height=p_h, width=p_w):
-		rpg_card_data.extend(page.export())
+	deck = export_deck(cards, card_params, page_layout, card_layout, estimate=estimate, shard=shard)
+	deck_manifest.save()
 
-	print(json.dumps(rpg_card_data, indent=4))
+	with PROFILER.stage("output.serialize"):
+		output = codec.dumps(deck, indent=True)
+	codec.echo(output)
 
 
 def get_magic_item_cards(
@@ -78,6 +109,9 @@ def get_magic_item_cards(
 		card_params: dict = None,
 		page_layout: tuple[int, int] = None, 
 		card_layout: tuple[int, int] = None,
+		estimate: bool = False,
+		manifest: Path | None = None,
+		shard: tuple[int, int] | None = None,
 	):
 	"""Prints RPGCards to the command line.
 
@@ -88,37 +122,251 @@ def get_magic_item_cards(
 		card_params (dict): Card Parameter Dictionary.
 		page_layout (tuple[int, int]): Page layout dimentions.
 		card_layout (tuple[int, int]): _Card Layout dimentions.
+		estimate (bool, optional): Whether to print an estimate of the cards and pages instead. Defaults to False.
+		manifest (Path | None, optional): Path to a manifest of previously rendered cards, to reuse and update.
+			Defaults to None.
+		shard (tuple[int, int] | None, optional): Shard to render and number of shards, see `formatting.export_deck`.
+			Defaults to None, rendering every card.
 	"""
 
 	## Extract Names
-	data_source = Dnd5eToolsData(utils.get_env_variable("DND_DATA_PATH"))
-	records = TTRPGRecords.combine([data_source.items, data_source.homebrew_items])
+	data_source = Dnd5eToolsData.open(utils.get_env_variable("DND_DATA_PATH"))
+	get_records = functools.cache(lambda: TTRPGRecords.combine([data_source.items, data_source.homebrew_items]))
+	deck_manifest = Manifest.open(
+		None if estimate else manifest, data_source, ["items", "homebrew_items"], card_params, card_layout
+	)
 	if names:
 		item_names = names
-	else:
-		if json_id:
-			build = DnDBeyond.from_json_id(json_id)
-		elif json_path:
-			build = DnDBeyond.from_json(json_path.read_text())
-		else:
-			raise ValueError("One of names, json_path or json_id must be provided.")
+	elif json_id or json_path:
+		build = DnDBeyond.load(
+			json_path, json_id, None if deck_manifest.cached else data_source, eager=("items", "homebrew_items")
+		)
 		item_names = build.magic_items
+	else:
+		raise ValueError("One of names, json_path or json_id must be provided.")
 	
 	## Query Data
-	card_pairs = []
-	c_h, c_w = card_layout
+	cards = []
 	for name in item_names:
 		try:
-			spell = MagicItemCard(records.query_record(name))
+			cards.append(deck_manifest.card(
+				f"MagicItemCard:{name}",
+				lambda: MagicItemCard.from_records(get_records(), get_records().query_position(name, fuzzy=True))
+			))
+		except (KeyError, IndexError):
+			logger.warning(f"Unable to find TTRPG Record: {name} in Dnd Sources or Homebrew.")
+			continue
+
+	## Page formatting
+	deck = export_deck(cards, card_params, page_layout, card_layout, estimate=estimate, shard=shard)
+	deck_manifest.save()
+
+	with PROFILER.stage("output.serialize"):
+		output = codec.dumps(deck, indent=True)
+	codec.echo(output)
+
+
+def get_monster_cards(
+		names: list[str] | None = None,
+		cr_range: tuple[float, float] | None = None,
+		types: list[str] | None = None,
+		environments: list[str] | None = None,
+		sources: list[str] | None = None,
+		card_params: dict = None,
+		page_layout: tuple[int, int] = None, 
+		card_layout: tuple[int, int] = None,
+		estimate: bool = False,
+		manifest: Path | None = None,
+		shard: tuple[int, int] | None = None,
+		workers: int | None = None,
+		**_
+	):
+	"""Prints RPGCards to the command line.
+
+	Monsters are either queried by name, or selected in bulk through the bestiary's
+	secondary indexes and rendered in parallel.
+
+	Args:
+		names (list[str] | None): List of Monster Names.
+		cr_range (tuple[float, float] | None): Inclusive range of challenge ratings.
+		types (list[str] | None): List of creature types, e.g. `dragon`.
+		environments (list[str] | None): List of environments, e.g. `forest`.
+		sources (list[str] | None): List of TTRPG Sources.
+		card_params (dict): Card Parameter Dictionary.
+		page_layout (tuple[int, int]): Page layout dimentions.
+		card_layout (tuple[int, int]): _Card Layout dimentions.
+		estimate (bool, optional): Whether to print an estimate of the cards and pages instead. Defaults to False.
+		manifest (Path | None, optional): Path to a manifest of previously rendered cards, to reuse and update.
+			Monsters are rendered in this process if provided. Defaults to None.
+		shard (tuple[int, int] | None, optional): Shard to render and number of shards, see `formatting.export_deck`.
+			Defaults to None, rendering every card.
+		workers (int | None, optional): Number of worker processes. Defaults to None, one per CPU.
+	"""
+
+	## Query Data
+	data_source = Dnd5eToolsData.open(utils.get_env_variable("DND_DATA_PATH"))
+	deck_manifest = Manifest.open(None if estimate else manifest, data_source, ["monsters"], card_params, card_layout)
+	cards = []
+	if names:
+		for name in names:
+			try:
+				cards.append(deck_manifest.card(
+					f"MonsterCard:{name}",
+					lambda: MonsterCard.from_records(
+						data_source.monsters, data_source.monsters.query_position(name, sources, fuzzy=True)
+					)
+				))
+			except (KeyError, IndexError):
+				logger.warning(f"Unable to find TTRPG Record: {name} in the Bestiary.")
+				continue
+	else:
+		criteria = {
+			"cr": slice(*cr_range) if cr_range else None,
+			"type": set(types) if types else None,
+			"environment": set(environments) if environments else None,
+			"source": set(sources) if sources else None,
+		}
+		criteria = {field: criterion for field, criterion in criteria.items() if criterion is not None}
+		if not criteria:
+			raise ValueError("One of names, cr_range, types, environments or sources must be provided.")
+		monsters = data_source.monsters
+		cards = [
+			deck_manifest.card(f"MonsterCard:{name}:{source}", lambda: MonsterCard.from_records(monsters, position))
+			for position in monsters.select_positions(**criteria)
+			for name, source in [monsters.index[position]]
+		]
+
+	## Page formatting
+	deck = export_deck(
+		cards, card_params, page_layout, card_layout,
+		estimate=estimate,
+		workers=1 if manifest is not None else workers,
+		shard=shard
+	)
+	deck_manifest.save()
+
+	with PROFILER.stage("output.serialize"):
+		output = codec.dumps(deck, indent=True)
+	codec.echo(output)
+
+
+def get_full_character_cards(
+		json_path: Path | None = None, 
+		json_id: int | None = None, 
+		card_params: dict = None,
+		page_layout: tuple[int, int] = None, 
+		card_layout: tuple[int, int] = None,
+		estimate: bool = False,
+		manifest: Path | None = None,
+		shard: tuple[int, int] | None = None,
+		**_
+	):
+	"""Prints RPGCards to the command line.
+
+	Class and subclass features are matched against the Class Feature Data in a single join,
+	see `DnDBeyond.eligible_class_features`.
+
+	Args:
+		json_path (Path | None): Path to a character JSON File.
+		json_id (int | None): DnDBeyond Character JSON ID.
+		card_params (dict): Card Parameter Dictionary.
+		page_layout (tuple[int, int]): Page layout dimentions.
+		card_layout (tuple[int, int]): _Card Layout dimentions.
+		estimate (bool, optional): Whether to print an estimate of the cards and pages instead. Defaults to False.
+		manifest (Path | None, optional): Path to a manifest of previously rendered cards, to reuse and update.
+			Defaults to None.
+		shard (tuple[int, int] | None, optional): Shard to render and number of shards, see `formatting.export_deck`.
+			Defaults to None, rendering every card.
+	"""
+
+	## Extract Names
+	data_source = Dnd5eToolsData.open(utils.get_env_variable("DND_DATA_PATH"))
+	get_items = functools.cache(lambda: TTRPGRecords.combine([data_source.items, data_source.homebrew_items]))
+	record_types = ["spells", "class_features", "feats", "items", "homebrew_items"]
+	deck_manifest = Manifest.open(None if estimate else manifest, data_source, record_types, card_params, card_layout)
+	build = DnDBeyond.load(
+		json_path,
+		json_id,
+		None if deck_manifest.cached else data_source,
+		eager=("spells", "class_features"),
+		needed=tuple(record_types)
+	)
+	cards = []
+
+	## Join Class Features
+	with PROFILER.stage("class_features.join"):
+		class_features = deck_manifest.cards(
+			f"ClassFeatureCard:{build.class_features.to_json(orient='values')}",
+			lambda: [
+				ClassFeatureCard.from_records(data_source.class_features, position)
+				for position in build.eligible_class_features(data_source.class_feature_keys)
+			]
+		)
+		PROFILER.records("class_features.join", len(class_features))
+	cards.extend(class_features)
+
+	## Query Feats
+	for name in build.feats:
+		try:
+			cards.append(deck_manifest.card(
+				f"FeatCard:{name}",
+				lambda: FeatCard.from_records(data_source.feats, data_source.feats.query_position(name, fuzzy=True))
+			))
+		except (KeyError, IndexError):
+			logger.warning(f"Unable to find TTRPG Record: {name} in Dnd Sources.")
+			continue
+
+	## Query Spells
+	for name, source in build.spells_with_sources:
+		try:
+			cards.append(deck_manifest.card(
+				f"SpellCard:{name}:{source}",
+				lambda: load_spell_card(data_source.spells, name, source)
+			))
+		except (KeyError, IndexError):
+			logger.warning(f"Unable to find TTRPG Record: {name} in Dnd Sources.")
+			continue
+
+	## Query Magic Items
+	for name in build.magic_items:
+		try:
+			cards.append(deck_manifest.card(
+				f"MagicItemCard:{name}",
+				lambda: MagicItemCard.from_records(get_items(), get_items().query_position(name, fuzzy=True))
+			))
 		except (KeyError, IndexError):
 			logger.warning(f"Unable to find TTRPG Record: {name} in Dnd Sources or Homebrew.")
-		card_pairs.extend(spell.get_card_pairs(height=c_h, width=c_w, **card_params))
+			continue
 
 	## Page formatting
-	p_h, p_w = page_layout
-	rpg_card_data = []
-	for page in CardPage.from_pairs(card_pairs=card_pairs, height=p_h, width=p_w):
-		rpg_card_data.extend(page.export())
+	deck = export_deck(cards, card_params, page_layout, card_layout, estimate=estimate, shard=shard)
+	deck_manifest.save()
 
-	print(json.dumps(rpg_card_data, indent=4))
- 
\ No newline at end of file
+	with PROFILER.stage("output.serialize"):
+		output = codec.dumps(deck, indent=True)
+	codec.echo(output)
+
+
+def get_record_estimate(
+		record_type: str,
+		sources: list[str] | None,
+		page_layout: tuple[int, int], 
+		card_layout: tuple[int, int],
+		**_
+	):
+	"""Prints an estimate of the cards and pages a whole set of TTRPG Records would take, without rendering them.
+
+	Args:
+		record_type (str): Name of a Dnd5eToolsData record set, see `CARD_TYPES`.
+		sources (list[str] | None): List of TTRPG Sources to estimate. All sources if None.
+		page_layout (tuple[int, int]): Page layout dimentions.
+		card_layout (tuple[int, int]): _Card Layout dimentions.
+	"""
+	data_source = Dnd5eToolsData.open(utils.get_env_variable("DND_DATA_PATH"))
+	records = getattr(data_source, record_type)
+	c_h, c_w = card_layout
+	size_index = CARD_TYPES[record_type].get_size_index(records, width=c_w)
+	if sources:
+		size_index = size_index.iloc[records.select_positions(source=set(sources))]
+	card_counts = CardData.estimate_card_counts(size_index["header"].to_numpy(), size_index["body"].to_numpy(), height=c_h)
+	codec.echo(codec.dumps(estimate_deck(card_counts, page_layout), indent=True))
@@ -1,14 +1,159 @@
-from collections import UserDict
-from copy import deepcopy
+from collections import ChainMap, OrderedDict, UserDict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
 import itertools
 import json
+import logging
+import math
+import os
 import re
-from typing import Self
+from typing import Any, Callable, Hashable, Self
+
+import numpy as np
+import pandas as pd
+
+from profiling import PROFILER, profiled
+
+logger = logging.getLogger(__name__)
+
+INTERNED_PARAMS = 1024
+"""Maximum number of distinct card parameters interned at once, see `CardFace.intern_params`."""
+
+
+def freeze_params(value: Any) -> Hashable:
+	"""Returns a hashable key of card parameters, preserving their order and the types of their values.
+
+	Args:
+		value (Any): Card parameters, or a value within them.
+	"""
+	match value:
+		case dict():
+			return tuple((key, freeze_params(item)) for key, item in value.items())
+		case list() | tuple():
+			return tuple(map(freeze_params, value))
+		case str() | int() | float() | bool() | None:
+			return type(value), value
+		case _:
+			return type(value), str(value)
+
+
+def entry_handler(*entry_types: str, pattern: str | None = None):
+	"""Decorator declaring a CardData function as the handler of TTRPG entries of the provided types.
+
+	Handlers are plain functions of the card class and entry, collected into `CardData.entry_handlers`
+	when the class is created.
+
+	Args:
+		*entry_types (str): TTRPG entry types.
+		pattern (str | None, optional): Regular expression of TTRPG entry types. Defaults to None.
+	"""
+	def decorator(func):
+		func.entry_types = entry_types
+		func.entry_pattern = pattern
+		return func
+	return decorator
+
+
+class projected_property(property):
+	"""Card property computed once per TTRPG Record by `CardData.get_projection`, then read from the card's projection."""
+
+	def __get__(self, card: "CardData | None", owner: type | None = None):
+		if card is not None and card.projection is not None:
+			return card.projection[self.fget.__name__]
+		return super().__get__(card, owner)
 
 
 class CardData(UserDict):
 	"""Class to handle conversion between TTRPG Records and cards."""
 
+	entry_handlers: ChainMap[str, Callable[[type[Self], dict], list[str]]]
+	"""Entry handlers by entry type, chained onto those of parent classes."""
+
+	entry_patterns: ChainMap[re.Pattern, Callable[[type[Self], dict], list[str]]]
+	"""Entry handlers by entry type regular expression, chained onto those of parent classes."""
+
+	overlay_params: dict = {}
+	"""Per card parameters of an overlay, applied over every other card parameter. See `from_overlay`."""
+
+	projection: pd.Series | None = None
+	"""Projected properties of the card's TTRPG Record, see `from_records`."""
+
+	origin: tuple[pd.DataFrame, int] | None = None
+	"""Record set and row position of the card's TTRPG Record, see `from_records`. Not sent to worker processes."""
+
+	@classmethod
+	def from_overlay(cls, record: dict, card_params: dict | None = None, **annotations) -> Self:
+		"""Returns a card of a shared TTRPG Record, with per build annotations layered over it.
+
+		Annotations, and any later changes to the card, are held in the overlay, so the record
+		is never copied or modified.
+
+		Args:
+			record (dict): Shared TTRPG Record.
+			card_params (dict | None, optional): Card parameters of this card only. Defaults to None.
+			**annotations: Fields to add or replace, e.g. `name="Heal (Cleric)"`.
+		"""
+		card = cls()
+		card.data = ChainMap(annotations, record)
+		if card_params:
+			card.overlay_params = card_params
+		return card
+
+	@classmethod
+	def from_records(cls, records: pd.DataFrame, position: int, card_params: dict | None = None, **annotations) -> Self:
+		"""Returns a card of the TTRPG Record at a row position, reading its projected properties from the record set's projection.
+
+		Annotations must not replace fields that projected properties are computed from. The card's
+		size is estimated from the record set's size index, see `get_sizes`.
+
+		Args:
+			records (pd.DataFrame): TTRPG Records, see `records.TTRPGRecords`.
+			position (int): Row position of the TTRPG Record.
+			card_params (dict | None, optional): Card parameters of this card only. Defaults to None.
+			**annotations: Fields to add or replace, see `from_overlay`.
+		"""
+		record = records.record_at(position)
+		card = cls.from_overlay(record, card_params, **annotations) if annotations or card_params else cls(record)
+		card.origin = (records, position)
+		if cls.projected_properties() and (projection := cls.get_projection(records).iloc[position])["projected"]:
+			card.projection = projection
+		return card
+
+	def __getstate__(self) -> dict:
+		# the record set is left behind, as worker processes only render the card
+		return {**self.__dict__, "origin": None}
+
+	@classmethod
+	def projected_properties(cls) -> list[str]:
+		"""Returns the names of the card class's projected properties, see `projected_property`."""
+		names = dict.fromkeys(name for klass in reversed(cls.__mro__) for name in vars(klass))
+		return [name for name in names if isinstance(getattr(cls, name, None), projected_property)]
+
+	@classmethod
+	def get_projection(cls, records: pd.DataFrame) -> pd.DataFrame:
+		"""Returns the projected properties of every TTRPG Record in a record set, by row position.
+
+		Computed once per card class, then cached with the record set's other indexes. Records
+		whose properties can't be computed aren't `projected`, and their cards compute them as usual.
+
+		Args:
+			records (pd.DataFrame): TTRPG Records, see `records.TTRPGRecords`.
+		"""
+		if (projection := records.projections.get(cls)) is None:
+			names = cls.projected_properties()
+			rows = []
+			with PROFILER.stage("cards.project"):
+				for position in range(len(records)):
+					card = cls(records.record_at(position))
+					try:
+						rows.append((True, *(getattr(card, name) for name in names)))
+					except Exception as error:
+						logger.debug(f"Unable to project {cls.__name__}: {card.get('name')}. {error}")
+						rows.append((False, *[None] * len(names)))
+				PROFILER.records("cards.project", len(rows))
+			projection = records.projections[cls] = pd.DataFrame(rows, columns=["projected", *names], dtype=object)
+		return projection
+
 	@staticmethod
 	def scrub_refs(text: str):
 		"""Removes references from text."""
@@ -31,6 +176,11 @@ class CardData(UserDict):
 		""":str: Card data name."""
 		return self["name"]
 
+	@property
+	def shard_key(self) -> tuple[str, str | None]:
+		""":tuple[str, str | None]: Name and source of the card's TTRPG Record, see `get_shard`."""
+		return self.name, self.get("source")
+
 	@property
 	def icon(self):
 		""":str | None: Card Icon."""
@@ -53,45 +203,107 @@ class CardData(UserDict):
 
 
 	@classmethod
-	def handle_entry(cls, entry: list | dict):
+	def handle_entry(cls, entry: str | dict) -> list[str]:
 		"""
 		Converts TTRPG entry to RPGCard compatible line.
 
+		Dispatches on entry type through `entry_handlers`, falling back to `entry_patterns`.
+
 		Args:
-			entry (list | dict): TTRPG entry
+			entry (str | dict): TTRPG entry
 
 		Raises:
 			ValueError: If unsupported entry type is supplied.
 		"""
 		if isinstance(entry, str):
 			return[ f"text | {entry}"]
-		match entry["type"]:
-			case "list":
-				title, *bullets = entry["items"]
-				return [
-					f"text | {title}",
-					*map("bullet | {}".format, bullets)
-				]
-			case "entries":
-				sub_entries = itertools.chain.from_iterable(map(cls.handle_entry, entry["entries"]))
-				return [
-					f"text | <b>{entry['name']}</b>",
-					*sub_entries,
-				]
-			case "table":
-				return ["text | <b> See source table </b>"]
-			case "inset" | "quote":
-				return []
-			case _:
-				cls._raise_entry(entry)
+		try:
+			handler = cls.entry_handlers[entry["type"]]
+		except KeyError:
+			handler = cls._match_entry_pattern(entry)
+		return handler(cls, entry)
 
 	@classmethod
-	def get_block_height(cls, line: str, width: int):
-		"""Returns the approximate height of a line if confirming to the provided width.
+	def _match_entry_pattern(cls, entry: dict) -> Callable[[type[Self], dict], list[str]]:
+		"""Returns the handler of the first entry pattern matching the entry's type, memoising it by type."""
+		for pattern, handler in cls.entry_patterns.items():
+			if pattern.fullmatch(entry["type"]):
+				cls.entry_handlers[entry["type"]] = handler
+				return handler
+		cls._raise_entry(entry)
+
+	@classmethod
+	def supports_entry(cls, entry_type: str) -> bool:
+		"""Returns whether entries of the provided type have a handler."""
+		return entry_type in cls.entry_handlers or any(pattern.fullmatch(entry_type) for pattern in cls.entry_patterns)
+
+	@classmethod
+	def register_entry(cls, entry_type: str, handler: Callable[[type[Self], dict], list[str]]):
+		"""Registers an entry handler for this class and its subclasses.
+
+		Args:
+			entry_type (str): TTRPG entry type.
+			handler (Callable[[type[Self], dict], list[str]]): Function of the card class and entry, returning lines.
+		"""
+		cls.entry_handlers[entry_type] = handler
+
+	@classmethod
+	def register_entry_pattern(cls, pattern: str, handler: Callable[[type[Self], dict], list[str]]):
+		"""Registers an entry handler for entry types fully matching a regex, for this class and its subclasses.
+
+		Args:
+			pattern (str): Regular expression of TTRPG entry types.
+			handler (Callable[[type[Self], dict], list[str]]): Function of the card class and entry, returning lines.
+		"""
+		cls.entry_patterns[re.compile(pattern)] = handler
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		cls._collect_entry_handlers()
+
+	@classmethod
+	def _collect_entry_handlers(cls):
+		"""Chains handlers declared with `entry_handler` in cls onto those of its parent class."""
+		handlers, patterns = {}, {}
+		for attr in vars(cls).values():
+			handlers.update(dict.fromkeys(getattr(attr, "entry_types", ()), attr))
+			if (pattern := getattr(attr, "entry_pattern", None)) is not None:
+				patterns[re.compile(pattern)] = attr
+		parent_handlers = getattr(super(cls, cls), "entry_handlers", ChainMap())
+		parent_patterns = getattr(super(cls, cls), "entry_patterns", ChainMap())
+		cls.entry_handlers = parent_handlers.new_child(handlers)
+		cls.entry_patterns = parent_patterns.new_child(patterns)
+
+	@entry_handler("list")
+	def _list_entry(cls, entry: dict) -> list[str]:
+		title, *bullets = entry["items"]
+		return [
+			f"text | {title}",
+			*map("bullet | {}".format, bullets)
+		]
+
+	@entry_handler("entries")
+	def _entries_entry(cls, entry: dict) -> list[str]:
+		sub_entries = itertools.chain.from_iterable(map(cls.handle_entry, entry["entries"]))
+		return [
+			f"text | <b>{entry['name']}</b>",
+			*sub_entries,
+		]
+
+	@entry_handler("table")
+	def _table_entry(cls, entry: dict) -> list[str]:
+		return ["text | <b> See source table </b>"]
+
+	@entry_handler("inset", "quote")
+	def _skipped_entry(cls, entry: dict) -> list[str]:
+		return []
+
+	@staticmethod
+	def get_line_layout(line: str) -> float | tuple[str, int, int, int]:
+		"""Returns the fixed height of a line, or the content and paddings to wrap it with.
 
 		Args:
 			line (str): Text line.
-			width (int): Card width in approximate characters.
 
 		Raises:
 			ValueError: If line is an unexpected format.
@@ -116,12 +328,34 @@ class CardData(UserDict):
 				return 0
 			case ["p2e_end_trait_section"]:
 				return 2
+			case ["dndstats", *_]:
+				return 2
+			case ["section", _]:
+				return 1.0
 			case ["p2e_activity", _, _, content]:
 				tabbed_padding = 2
 			case [_, _]:
 				return 0
 			case unhandled:
 				raise ValueError(f"Unhandled entry type case:\n{unhandled}")
+		return content, line_length, tabbed_padding, end_padding
+
+	@classmethod
+	def get_block_height(cls, line: str, width: int):
+		"""Returns the approximate height of a line if confirming to the provided width.
+
+		Args:
+			line (str): Text line.
+			width (int): Card width in approximate characters.
+
+		Raises:
+			ValueError: If line is an unexpected format.
+		"""
+		match cls.get_line_layout(line):
+			case (content, line_length, tabbed_padding, end_padding):
+				pass
+			case fixed_height:
+				return fixed_height
 		size = 0
 		for word in content.split(" "):
 			word_length = len(word) + 1
@@ -131,7 +365,52 @@ class CardData(UserDict):
 			line_length += word_length
 		return size + end_padding + (line_length / width)
 
+	@classmethod
+	def get_block_heights(cls, lines: list[str], width: int) -> np.ndarray:
+		"""Returns the approximate heights of many lines at once, matching `get_block_height`.
+
+		Lines are wrapped in lockstep, a word column of every line at a time, so the work in
+		Python scales with the longest line rather than the number of lines.
+
+		Args:
+			lines (list[str]): Text lines, possibly of many cards.
+			width (int): Card width in approximate characters.
+
+		Raises:
+			ValueError: If a line is an unexpected format.
+		"""
+		heights = np.zeros(len(lines))
+		wrapped, word_lengths, line_lengths, tabbed_paddings, end_paddings = [], [], [], [], []
+		for i, line in enumerate(lines):
+			match cls.get_line_layout(line):
+				case (content, line_length, tabbed_padding, end_padding):
+					wrapped.append(i)
+					word_lengths.append([len(word) + 1 for word in content.split(" ")])
+					line_lengths.append(line_length)
+					tabbed_paddings.append(tabbed_padding)
+					end_paddings.append(end_padding)
+				case fixed_height:
+					heights[i] = fixed_height
+		if not wrapped:
+			return heights
+
+		word_counts = np.fromiter(map(len, word_lengths), dtype=np.int64, count=len(wrapped))
+		words = np.zeros((len(wrapped), word_counts.max()), dtype=np.int64)
+		words[np.arange(words.shape[1]) < word_counts[:, None]] = np.fromiter(
+			itertools.chain.from_iterable(word_lengths), dtype=np.int64, count=word_counts.sum()
+		)
+		line_length = np.array(line_lengths, dtype=np.int64)
+		tabbed_padding = np.array(tabbed_paddings, dtype=np.int64)
+		size = np.zeros(len(wrapped), dtype=np.int64)
+		for column, word_length in enumerate(words.T):
+			wraps = (column < word_counts) & (line_length + word_length > width)
+			size += wraps
+			line_length = np.where(wraps, tabbed_padding, line_length) + word_length
+		heights[wrapped] = (size + np.array(end_paddings, dtype=np.int64)) + (line_length / width)
+		return heights
+
 	
+	@profiled("cards.split")
 	def split_body(self, height: int, width: int):
 		"""Splits body into units to provided card dimentions.
 
@@ -139,13 +418,13 @@ class CardData(UserDict):
 			height (int): Card height in approximate lines.
 			width (int): Card width in approximate characters.
 		"""
-		header_size = sum(self.get_block_height(line, width=width) for line in self.header)
+		header_size = sum(self.get_block_heights(self.header, width=width).tolist())
 		line_count = header_size
-		content = deepcopy(self.body)
+		content = self.body
+		pending = [*zip(content, self.get_block_heights(content, width=width).tolist())][::-1]
 		sublists = [[]]
-		while content:
-			line = content.pop(0)
-			block_size = self.get_block_height(line=line, width=width)
+		while pending:
+			line, block_size = pending.pop()
 			if block_size + line_count > height:
 				*head, text = line.split(" | ")
 				line_overspill = height - (block_size + line_count)
@@ -160,13 +439,119 @@ class CardData(UserDict):
 					sublists[-1].append(f"{' | '.join([*head, front])} (cont.)")
 				line_count = header_size
 				if back:
-					content.insert(0, f"{' | '.join([*head, '(cont.) ' + back])}")
+					back_line = f"{' | '.join([*head, '(cont.) ' + back])}"
+					pending.append((back_line, self.get_block_height(line=back_line, width=width)))
 				sublists.append([])
 			else:
 				sublists[-1].append(line)
 				line_count += int(block_size)
 		return [*filter(bool, sublists)]
 
+	@classmethod
+	@profiled("cards.measure")
+	def measure(cls, cards: list[Self], width: int) -> tuple[np.ndarray, np.ndarray]:
+		"""Returns the header and body heights of each card, measured in one batch without splitting them.
+
+		Cards whose header or body can't be produced are measured as NaN.
+
+		Args:
+			cards (list[Self]): Cards to measure.
+			width (int): Card width in approximate characters.
+		"""
+		lines: list[str] = []
+		owners: list[int] = []
+		unmeasured: list[int] = []
+		for i, card in enumerate(cards):
+			try:
+				header, body = card.header, card.body
+			except Exception as error:
+				logger.debug(f"Unable to measure {type(card).__name__}: {card.get('name')}. {error}")
+				unmeasured.append(i)
+				continue
+			lines.extend(header)
+			lines.extend(body)
+			owners.extend([2 * i] * len(header) + [2 * i + 1] * len(body))
+		PROFILER.records("cards.measure", len(cards))
+
+		# body lines take up whole lines once placed, as in `split_body`
+		owners = np.array(owners, dtype=np.int64)
+		heights = cls.get_block_heights(lines, width=width)
+		heights = np.where(owners % 2, np.floor(heights), heights)
+		sizes = np.bincount(owners, weights=heights, minlength=2 * len(cards)).reshape(-1, 2).astype(float)
+		sizes[unmeasured] = np.nan
+		return sizes[:, 0], sizes[:, 1]
+
+	@classmethod
+	def get_size_index(cls, records: pd.DataFrame, width: int, positions: list[int] | None = None) -> pd.DataFrame:
+		"""Returns the header and body heights of the TTRPG Records in a record set, indexed like the records.
+
+		Records are measured once per card class and width, when first looked up, then cached with
+		the record set's other indexes. `measured` is False for records not looked up yet.
+
+		Args:
+			records (pd.DataFrame): TTRPG Records, see `records.TTRPGRecords`.
+			width (int): Card width in approximate characters.
+			positions (list[int] | None, optional): Row positions of the records to look up. Defaults to None, every record.
+		"""
+		key = (cls, width)
+		if (size_index := records.size_indexes.get(key)) is None:
+			size_index = records.size_indexes[key] = pd.DataFrame(
+				{"header": np.nan, "body": np.nan, "measured": False}, index=records.index
+			)
+		positions = np.arange(len(records)) if positions is None else np.asarray(positions, dtype=np.int64)
+		if len(missing := np.unique(positions[~size_index["measured"].to_numpy()[positions]])):
+			header, body = cls.measure([cls(records.record_at(position)) for position in missing], width)
+			size_index.iloc[missing, size_index.columns.get_loc("header")] = header
+			size_index.iloc[missing, size_index.columns.get_loc("body")] = body
+			size_index.iloc[missing, size_index.columns.get_loc("measured")] = True
+		return size_index
+
+	@staticmethod
+	def get_sizes(cards: list["CardData"], width: int) -> tuple[np.ndarray, np.ndarray]:
+		"""Returns the header and body heights of each card, without rendering any text for cards of TTRPG Records.
+
+		Cards with an `origin` are looked up in their record set's size index, see `get_size_index`,
+		ignoring any annotations. Other cards are measured, see `measure`.
+
+		Args:
+			cards (list[CardData]): Cards to size.
+			width (int): Card width in approximate characters.
+		"""
+		header, body = np.full(len(cards), np.nan), np.full(len(cards), np.nan)
+		measured: list[int] = []
+		looked_up: dict[tuple[type, int], list[int]] = {}
+		for i, card in enumerate(cards):
+			if getattr(card, "origin", None) is None:
+				measured.append(i)
+			else:
+				looked_up.setdefault((type(card), id(card.origin[0])), []).append(i)
+
+		for (card_type, _), indices in looked_up.items():
+			records = cards[indices[0]].origin[0]
+			positions = [cards[i].origin[1] for i in indices]
+			size_index = card_type.get_size_index(records, width, positions)
+			header[indices] = size_index["header"].to_numpy()[positions]
+			body[indices] = size_index["body"].to_numpy()[positions]
+		if measured:
+			header[measured], body[measured] = CardData.measure([cards[i] for i in measured], width)
+		return header, body
+
+	@staticmethod
+	def estimate_card_counts(header: np.ndarray, body: np.ndarray, height: int) -> np.ndarray:
+		"""Returns the approximate number of cards, each a front and back, that measured cards split into.
+
+		Each side is assumed to hold a line less than the space left by the header, for the line split
+		across it and the next.
+
+		Args:
+			header (np.ndarray): Header heights, see `measure`.
+			body (np.ndarray): Body heights, see `measure`.
+			height (int): Card height in approximate lines.
+		"""
+		sides = np.maximum(np.ceil(body / np.maximum(height - header - 1, 1)), 1)
+		return np.ceil(sides / 2)
+
+	@profiled("cards.render")
 	def get_card_pairs(self, height: int, width: int, **card_params):
 		"""Produces front and back card pairs.
 
@@ -191,11 +576,12 @@ class CardData(UserDict):
 			if n > 1 else [""]
 		)
 
-		default_params = self.card_params | card_params
+		default_params = CardFace.intern_params(self.card_params | card_params | self.overlay_params)
+		PROFILER.records("cards.render", 1)
 
 		return [
 			tuple(
-				{"title": self.name + card_index[i], "contents": content} | default_params if content else  default_params
+				CardFace(default_params, self.name + card_index[i], content) if content else CardFace(default_params)
 				for content in card_pair
 			)
 			for i, card_pair in enumerate(card_data_pairs)
@@ -206,46 +592,331 @@ class CardData(UserDict):
 		"""Raises an Value error for a unssuprted entry type."""
 		raise ValueError(f"Entry type: {entry['type']} is not supported.\n{json.dumps(entry, indent=4)}")
 
-class CardPage(tuple[tuple[dict, ...], ...]):
-	"""Class for formatting, controlling and outputting pages of cards."""
+CardData._collect_entry_handlers()
+
+
+class CardFace:
+	"""Class for a single side of a card, sharing interned parameters with every other side."""
+
+	__slots__ = ("params", "title", "contents")
+
+	interned: OrderedDict[Hashable, dict] = OrderedDict()
+	"""Interned card parameters by frozen value, see `freeze_params`. Least recently used first."""
+
+	def __init__(self, params: dict, title: str | None = None, contents: list[str] | None = None):
+		"""Initialises a card side.
+
+		Args:
+			params (dict): Interned card parameters, shared between sides and never mutated.
+			title (str | None, optional): Card title. Defaults to None, for a blank side.
+			contents (list[str] | None, optional): Card contents. Defaults to None, for a blank side.
+		"""
+		self.params = params
+		self.title = title
+		self.contents = contents
+
+	@classmethod
+	def intern_params(cls, params: dict) -> dict:
+		"""Returns the shared instance of the card parameters provided.
+
+		Only the `INTERNED_PARAMS` most recently used parameters are kept, so long running and
+		worker processes don't accumulate every parameter they've rendered.
+
+		Args:
+			params (dict): Card parameters.
+		"""
+		key = freeze_params(params)
+		if (interned := cls.interned.get(key)) is not None:
+			PROFILER.hit("cards.params", True)
+			cls.interned.move_to_end(key)
+			return interned
+		PROFILER.hit("cards.params", False)
+		cls.interned[key] = params
+		if len(cls.interned) > INTERNED_PARAMS:
+			cls.interned.popitem(last=False)
+		return params
+
+	@classmethod
+	def from_dict(cls, card: dict) -> Self:
+		"""Returns the card side of RPGCard compatible card data, see `to_dict`.
+
+		Args:
+			card (dict): RPGCard compatible card data.
+		"""
+		params = {key: value for key, value in card.items() if key not in ("title", "contents")}
+		return cls(cls.intern_params(params), card.get("title"), card.get("contents"))
+
+	@property
+	def key(self) -> tuple:
+		""":tuple: Hashable content of the side, excluding its count."""
+		params = freeze_params({k: v for k, v in self.params.items() if k != "count"})
+		return self.title, tuple(self.contents or ()), params
+
+	def with_count(self, count: int) -> Self:
+		"""Returns a copy of the side with the count provided.
+
+		Args:
+			count (int): Number of copies of the card.
+		"""
+		return type(self)(self.intern_params(self.params | {"count": count}), self.title, self.contents)
+
+	def to_dict(self) -> dict:
+		"""Returns RPGCard compatible card data."""
+		if self.title is None:
+			return dict(self.params)
+		return {"title": self.title, "contents": self.contents} | self.params
+
+	def __eq__(self, other) -> bool:
+		if not isinstance(other, CardFace):
+			return NotImplemented
+		return self.to_dict() == other.to_dict()
+
+	def __repr__(self) -> str:
+		return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class CardPage:
+	"""Class for formatting, controlling and outputting pages of cards.
+
+	Pages are views onto a shared list of card sides by index, only becoming dicts once exported.
+	"""
+
+	__slots__ = ("faces", "order")
+
+	def __init__(self, faces: list[CardFace], order: list[int]):
+		"""Initialises a page.
+
+		Args:
+			faces (list[CardFace]): Card sides shared between pages.
+			order (list[int]): Indices of the page's card sides, row by row. Out of range indices are blank.
+		"""
+		self.faces = faces
+		self.order = order
 
 	@classmethod
-	def from_pairs(cls, card_pairs: list[tuple[dict, dict]], height: int, width: int) -> list[Self]:
+	@profiled("cards.paginate")
+	def from_pairs(cls, card_pairs: list[tuple[CardFace, CardFace]], height: int, width: int) -> list[Self]:
 		"""Intilises formatted pages from a list of card pairs, and provided page dimentions.
 
+		Back pages mirror each row of their front page, so sides line up once printed double sided.
+
 		Args:
-			card_pairs (list[tuple[dict, dict]]): List of paired cards fronts and backs.
+			card_pairs (list[tuple[CardFace, CardFace]]): List of paired cards fronts and backs.
 			height (int): Page height in cards.
 			width (int): Page width in cards.
 		"""
 		page_max = height * width
+		fronts, backs = map(list, zip(*card_pairs)) if card_pairs else ([], [])
 
 		pages: list[Self] = []
-
-		for batch in itertools.batched(card_pairs, n=page_max):
-			listed = zip(*batch)
-			front_page, back_page = map(lambda xs: xs + ({},) * (page_max - len(xs)), listed)
-			front = cls(cls.to_matrix(*front_page, height=height, width=width))
-			back = cls(cls.flip_h(cls.to_matrix(*back_page, height=height, width=width)))
-			pages.extend([front, back])
+		for start in range(0, len(fronts), page_max):
+			front_order = range(start, start + page_max)
+			back_order = [*itertools.chain.from_iterable(row[::-1] for row in itertools.batched(front_order, n=width))]
+			pages.extend([cls(fronts, front_order), cls(backs, back_order)])
 		
 		return pages
 	
 	@staticmethod
-	def to_matrix(*cards, height, width):
-		"""Returns a height by width matrixs of cards."""
-		return tuple(
-			tuple(*itertools.batched(row, n=width))
-			for row in itertools.batched(cards, n=height)
-		)	
-    
-	@staticmethod
-	def flip_h(page: tuple[tuple[dict, ...], ...]):
-		"""Horizontally flips provided page."""
-		return tuple(row[::-1] for row in page)
-	
-	 
-	def export(self):
+	@profiled("cards.collapse")
+	def collapse_duplicates(card_pairs: list[tuple[CardFace, CardFace]]) -> list[tuple[CardFace, ...]]:
+		"""Collapses identical card pairs into the first of them, summing their `count`.
+
+		Args:
+			card_pairs (list[tuple[CardFace, CardFace]]): List of paired cards fronts and backs.
+		"""
+		collapsed: dict[tuple, tuple[CardFace, ...]] = {}
+		for pair in card_pairs:
+			key = tuple(face.key for face in pair)
+			if (existing := collapsed.get(key)) is None:
+				collapsed[key] = tuple(pair)
+				continue
+			collapsed[key] = tuple(
+				face.with_count(int(face.params["count"]) + int(duplicate.params.get("count", 1)))
+				if "count" in face.params else face
+				for face, duplicate in zip(existing, pair)
+			)
+		return [*collapsed.values()]
+
+	def export(self) -> list[dict]:
 		"""Returns RPGCard compatible json list of formatted pages."""
-		return [*itertools.chain.from_iterable(self)]
-    
+		n = len(self.faces)
+		return [self.faces[i].to_dict() if i < n else {} for i in self.order]
+
+
+def estimate_deck(card_counts: np.ndarray, page_layout: tuple[int, int]) -> dict:
+	"""Returns the number of cards and pages a deck would export to, from per record card counts.
+
+	Args:
+		card_counts (np.ndarray): Cards per record, see `CardData.estimate_card_counts`. NaN if unmeasured.
+		page_layout (tuple[int, int]): Page layout dimentions.
+	"""
+	p_h, p_w = page_layout
+	unmeasured = np.isnan(card_counts)
+	cards = int(card_counts[~unmeasured].sum())
+	return {
+		"records": len(card_counts),
+		"unmeasured": int(unmeasured.sum()),
+		"cards": cards,
+		"pages": 2 * math.ceil(cards / (p_h * p_w)),
+	}
+
+
+def get_shard(name: str, source: str | None, shards: int) -> int:
+	"""Returns the shard of a TTRPG Record, from 1 to `shards`, by a hash of its name and source stable between processes and machines.
+
+	Args:
+		name (str): TTRPG Record name.
+		source (str | None): TTRPG Record source.
+		shards (int): Number of shards.
+	"""
+	digest = hashlib.blake2b(f"{name}\0{source}".encode(), digest_size=8).digest()
+	return int.from_bytes(digest, "big") % shards + 1
+
+
+def _render_card(card: CardData, height: int, width: int, card_params: dict) -> list[tuple[CardFace, ...]]:
+	"""Returns the card pairs of a card, in a worker process."""
+	return card.get_card_pairs(height=height, width=width, **card_params)
+
+
+def render_each_card(
+		cards: list[CardData],
+		height: int,
+		width: int,
+		card_params: dict,
+		workers: int | None = 1
+	) -> list[list[tuple[CardFace, ...]]]:
+	"""Returns the card pairs of each card provided, in order, optionally rendered in parallel.
+
+	Args:
+		cards (list[CardData]): Cards, in order.
+		height (int): Card height in approximate lines.
+		width (int): Card width in approximate characters.
+		card_params (dict): Card Parameter Dictionary.
+		workers (int | None, optional): Number of worker processes. Defaults to 1, rendering in this process.
+			None for one per CPU.
+	"""
+	if workers == 1 or len(cards) < 2:
+		return [card.get_card_pairs(height=height, width=width, **card_params) for card in cards]
+
+	chunksize = max(1, len(cards) // (4 * (workers or os.cpu_count() or 1)))
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		rendered = executor.map(
+			_render_card, cards, *map(itertools.repeat, (height, width, card_params)), chunksize=chunksize
+		)
+		# parameters are re-interned, as each worker interns its own
+		return [
+			[
+				tuple(CardFace(CardFace.intern_params(face.params), face.title, face.contents) for face in pair)
+				for pair in pairs
+			]
+			for pairs in rendered
+		]
+
+
+def render_cards(
+		cards: list[CardData],
+		height: int,
+		width: int,
+		card_params: dict,
+		workers: int | None = 1
+	) -> list[tuple[CardFace, ...]]:
+	"""Returns the card pairs of every card provided, in order, see `render_each_card`."""
+	return [*itertools.chain.from_iterable(render_each_card(cards, height, width, card_params, workers=workers))]
+
+
+def paginate_deck(card_pairs: list[tuple[CardFace, ...]], page_layout: tuple[int, int]) -> list[dict]:
+	"""Returns RPGCard compatible json list of the pages of card pairs provided, collapsing duplicate pairs.
+
+	Args:
+		card_pairs (list[tuple[CardFace, ...]]): List of paired cards fronts and backs, in order.
+		page_layout (tuple[int, int]): Page layout dimentions.
+	"""
+	card_pairs = CardPage.collapse_duplicates(card_pairs)
+	p_h, p_w = page_layout
+	return [
+		*itertools.chain.from_iterable(
+			page.export() for page in CardPage.from_pairs(card_pairs=card_pairs, height=p_h, width=p_w)
+		)
+	]
+
+
+def export_deck(
+		cards: list[CardData],
+		card_params: dict,
+		page_layout: tuple[int, int],
+		card_layout: tuple[int, int],
+		estimate: bool = False,
+		workers: int | None = 1,
+		shard: tuple[int, int] | None = None
+	) -> list[dict] | dict:
+	"""Returns RPGCard compatible json list of the pages of cards provided, or an estimate of their size.
+
+	If a shard is provided, only the cards of that shard are rendered, see `get_shard`, and their
+	card pairs are returned by position for `merge_shards` to paginate alongside the other shards.
+
+	Args:
+		cards (list[CardData]): Cards, in order.
+		card_params (dict): Card Parameter Dictionary.
+		page_layout (tuple[int, int]): Page layout dimentions.
+		card_layout (tuple[int, int]): Card Layout dimentions.
+		estimate (bool, optional): Whether to estimate the number of cards and pages, without rendering them.
+			Defaults to False.
+		workers (int | None, optional): Number of worker processes to render with, see `render_cards`. Defaults to 1.
+		shard (tuple[int, int] | None, optional): Shard to render and number of shards, e.g. `(1, 4)`.
+			Defaults to None, rendering every card.
+	"""
+	c_h, c_w = card_layout
+	positions = range(len(cards))
+	if shard is not None:
+		index, shards = shard
+		positions = [position for position in positions if get_shard(*cards[position].shard_key, shards) == index]
+		logger.info(f"Shard {index}/{shards} holds {len(positions)} of {len(cards)} cards.")
+	selected = [cards[position] for position in positions]
+
+	if estimate:
+		unique = [*{(type(card), card.name): card for card in selected}.values()]
+		header, body = CardData.get_sizes(unique, width=c_w)
+		return estimate_deck(CardData.estimate_card_counts(header, body, height=c_h), page_layout)
+
+	if shard is None:
+		return paginate_deck(render_cards(selected, c_h, c_w, card_params, workers=workers), page_layout)
+
+	rendered = render_each_card(selected, c_h, c_w, card_params, workers=workers)
+	return {
+		"shard": [*shard],
+		"cards": len(cards),
+		"pairs": [
+			[position, [[face.to_dict() for face in pair] for pair in pairs]]
+			for position, pairs in zip(positions, rendered)
+		],
+	}
+
+
+def merge_shards(shards: list[dict], page_layout: tuple[int, int]) -> list[dict]:
+	"""Returns RPGCard compatible json list of the pages of every shard of an export, as a single export would.
+
+	Args:
+		shards (list[dict]): Shard exports, see `export_deck`, in any order.
+		page_layout (tuple[int, int]): Page layout dimentions.
+
+	Raises:
+		ValueError: If the shards provided aren't every shard of the same export, exactly once.
+	"""
+	counts = {(shard["shard"][1], shard["cards"]) for shard in shards}
+	if len(counts) != 1:
+		raise ValueError(f"Shards of different exports can't be merged: {sorted(counts)}.")
+	(n_shards, n_cards), = counts
+	if sorted(shard["shard"][0] for shard in shards) != [*range(1, n_shards + 1)]:
+		raise ValueError(
+			f"Expected shards 1 to {n_shards} once each, got {sorted(shard['shard'][0] for shard in shards)}."
+		)
+	rendered = dict(itertools.chain.from_iterable(shard["pairs"] for shard in shards))
+	if sum(len(shard["pairs"]) for shard in shards) != n_cards or len(rendered) != n_cards:
+		raise ValueError(f"Shards hold {len(rendered)} distinct of {n_cards} cards, were they all split alike?")
+
+	card_pairs = [
+		tuple(map(CardFace.from_dict, pair))
+		for position in range(n_cards)
+		for pair in rendered[position]
+	]
+	return paginate_deck(card_pairs, page_layout)
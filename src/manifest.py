@@ -0,0 +1,178 @@
+"""Implements manifests of rendered cards, for incremental deck regeneration."""
+import itertools
+import json
+import logging
+from pathlib import Path
+from typing import Callable, Self
+
+from formatting import CardData, CardFace
+from profiling import PROFILER
+from records import TTRPGData, TTRPGRecords
+from utils import codec
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+
+
+class ManifestCard:
+    """Card, or group of cards, rendered through a Manifest.
+
+    Cards cached by the previous export are rebuilt from their card pairs without
+    loading or rendering any TTRPG Records.
+    """
+
+    __slots__ = ("manifest", "key", "cards")
+
+    def __init__(self, manifest: "Manifest", key: str, cards: list[CardData] | None = None):
+        """Initialises a card of a manifest.
+
+        Args:
+            manifest (Manifest): Manifest rendering the card.
+            key (str): Manifest key of the card.
+            cards (list[CardData] | None, optional): Cards to render. Defaults to None, for cached cards.
+        """
+        self.manifest = manifest
+        self.key = key
+        self.cards = cards
+
+    @property
+    def name(self) -> str:
+        """:str: Manifest key of the card."""
+        return self.key
+
+    @property
+    def shard_key(self) -> tuple[str, None]:
+        """:tuple[str, None]: Manifest key of the card, see `formatting.get_shard`.
+
+        Cards are sharded by key whether or not they're cached, so every shard of an export
+        must be run with a manifest, or every shard without one.
+        """
+        return self.key, None
+
+    def get_card_pairs(self, height: int, width: int, **card_params) -> list[tuple[CardFace, ...]]:
+        """Produces front and back card pairs, see `formatting.CardData.get_card_pairs`.
+
+        Args:
+            height (int): Card height in approximate lines.
+            width (int): Card width in approximate characters.
+            **card_params (dict): Parameters to be applied to card.
+        """
+        if self.cards is None:
+            pairs = [tuple(map(CardFace.from_dict, pair)) for pair in self.manifest.cached[self.key]]
+        else:
+            pairs = [
+                *itertools.chain.from_iterable(
+                    card.get_card_pairs(height=height, width=width, **card_params)
+                    for card in self.cards
+                )
+            ]
+        self.manifest.entries[self.key] = [[face.to_dict() for face in pair] for pair in pairs]
+        return pairs
+
+
+class Manifest:
+    """Class for the card pairs of a previous export, by the build entries that produced them.
+
+    A manifest is only reused while its fingerprint, covering the TTRPG Data files,
+    card parameters, card layout and source priority, is unchanged.
+    """
+
+    def __init__(self, path: Path | None = None, fingerprint: str = "", cached: dict[str, list] | None = None):
+        """Initialises a manifest.
+
+        Args:
+            path (Path | None, optional): Manifest file path. Defaults to None, rendering every card.
+            fingerprint (str, optional): Fingerprint of the export, see `get_fingerprint`. Defaults to "".
+            cached (dict[str, list] | None, optional): Card pairs of the previous export by key. Defaults to None.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.cached = cached or {}
+        self.entries: dict[str, list] = {}
+
+    @staticmethod
+    def get_fingerprint(data_source: TTRPGData, names: list[str], card_params: dict, card_layout: tuple[int, int]) -> str:
+        """Returns the fingerprint of an export.
+
+        Args:
+            data_source (TTRPGData): TTRPG Data source.
+            names (list[str]): Names of the RecordSets used by the export.
+            card_params (dict): Card Parameter Dictionary.
+            card_layout (tuple[int, int]): Card Layout dimentions.
+        """
+        return json.dumps([
+            data_source.fingerprint(*names),
+            card_params,
+            card_layout,
+            TTRPGRecords.source_priority,
+        ], default=str)
+
+    @classmethod
+    def open(
+        cls,
+        path: Path | None,
+        data_source: TTRPGData,
+        names: list[str],
+        card_params: dict,
+        card_layout: tuple[int, int]
+    ) -> Self:
+        """Opens the manifest at the path provided, discarding its cards if the export's fingerprint has changed.
+
+        Args:
+            path (Path | None): Manifest file path. If None, every card is rendered and nothing is saved.
+            data_source (TTRPGData): TTRPG Data source.
+            names (list[str]): Names of the RecordSets used by the export.
+            card_params (dict): Card Parameter Dictionary.
+            card_layout (tuple[int, int]): Card Layout dimentions.
+        """
+        if path is None:
+            return cls()
+        fingerprint = cls.get_fingerprint(data_source, names, card_params, card_layout)
+        cached = {}
+        if path.exists():
+            manifest = codec.loads(path.read_bytes())
+            if manifest.get("version") == VERSION and manifest.get("fingerprint") == fingerprint:
+                cached = manifest["cards"]
+            else:
+                logger.info(f"Manifest {path} is out of date, rendering every card.")
+        return cls(path, fingerprint, cached)
+
+    def cards(self, key: str, load: Callable[[], list[CardData]]) -> list[CardData | ManifestCard]:
+        """Returns the cards of a build entry, only loading them if they aren't cached.
+
+        Build entries missing from the TTRPG Data are cached too, and raise again without loading.
+
+        Args:
+            key (str): Manifest key of the build entry, e.g. `SpellCard:Heal`.
+            load (Callable[[], list[CardData]]): Function returning the build entry's cards.
+
+        Raises:
+            KeyError: If the build entry was missing from the TTRPG Data.
+            IndexError: If the build entry was missing from the sources queried.
+        """
+        if self.path is None:
+            return load()
+        cached = key in self.cached
+        PROFILER.hit("manifest", cached)
+        if cached:
+            if self.cached[key] is None:
+                self.entries[key] = None
+                raise KeyError(f"{key} is missing from the TTRPG Data.")
+            return [ManifestCard(self, key)]
+        try:
+            return [ManifestCard(self, key, load())]
+        except (KeyError, IndexError):
+            self.entries[key] = None
+            raise
+
+    def card(self, key: str, load: Callable[[], CardData]) -> CardData | ManifestCard:
+        """Returns the card of a build entry, only loading it if it isn't cached, see `cards`."""
+        card, = self.cards(key, lambda: [load()])
+        return card
+
+    def save(self):
+        """Writes the card pairs rendered since opening to the manifest file."""
+        if self.path is None:
+            return
+        self.path.write_bytes(codec.dumps({"version": VERSION, "fingerprint": self.fingerprint, "cards": self.entries}))
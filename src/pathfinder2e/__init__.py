@@ -1,11 +1,12 @@
 """"""
 from pathfinder2e.build import Pathbuilder
 from pathfinder2e.card import SpellCard, BasicActionCard, FeatCard
-from pathfinder2e.script import get_spell_cards, get_full_character_cards
+from pathfinder2e.script import get_spell_cards, get_full_character_cards, get_record_estimate
 
 __all__ = [
 	get_spell_cards,
 	get_full_character_cards,
+	get_record_estimate,
 	Pathbuilder,
 	BasicActionCard,
 	SpellCard,
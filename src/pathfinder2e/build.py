@@ -2,8 +2,10 @@
 
 import itertools
 import logging
+import pandas as pd
 from character import BaseBuild
 import utils
+import utils.static
 
 
 logger = logging.getLogger(__name__)
@@ -24,8 +26,8 @@ class Pathbuilder(BaseBuild):
 	
 		
 	@classmethod
-	def from_json(cls, json_data: str):
-		"""Creates a pathbuilder buils from JSON string data."""
+	def from_json(cls, json_data: bytes | str):
+		"""Creates a pathbuilder buils from JSON data."""
 		return cls._from_json_data(
 			json_data=json_data,
 			data_path="$.build",
@@ -45,11 +47,26 @@ class Pathbuilder(BaseBuild):
         
 	
 		for level, skill in skill_reqs:
-			required_level = utils.static.PROFICIENCY_LEVELS.index(level) * 2
+			required_level = utils.static.PROFICIENCY_RANKS[level]
 			if  required_level <= self["proficiencies"].get(skill, 0) and required_level >= 2:
 				return True
 		
 		return False
+
+	def eligible_basic_actions(self, requirements: pd.DataFrame, sources: list[str]) -> pd.MultiIndex:
+		"""Returns the (name, source) index of Basic Actions whose proficiency requirements self meets.
+
+		Equivalent to `meets_requirements` over every Basic Action, as a single join.
+
+		Args:
+			requirements (pd.DataFrame): Basic Action requirement table, see `PF2eToolsData.basic_action_requirements`.
+			sources (list[str]): TTRPG Sources to select from, in output order.
+		"""
+		proficiencies = pd.DataFrame(self["proficiencies"].items(), columns=["skill", "proficiency"])
+		joined = requirements[requirements["source"].isin(sources)].merge(proficiencies, on="skill")
+		met = joined[(joined["rank"] >= 2) & (joined["rank"] <= joined["proficiency"])]
+		met = met.assign(source_rank=met["source"].map(sources.index)).sort_values(["source_rank", "position"])
+		return pd.MultiIndex.from_frame(met[["name", "source"]].drop_duplicates())
 		
 
 	@property
@@ -80,3 +97,13 @@ class Pathbuilder(BaseBuild):
 			for spell in spell_level["list"]
 		]
 	
+
+	@property
+	def record_types(self):
+		""":list[str]: Names of the PF2eToolsData RecordSets the build has records in."""
+		raw = {
+			"spells": [*self.spells, *self.focus],
+			"feats": self.feats,
+			"actions": self.get("proficiencies"),
+		}
+		return [name for name, records in raw.items() if records]
@@ -4,7 +4,7 @@ from itertools import starmap
 import itertools
 import logging
 import re
-from formatting import CardData
+from formatting import CardData, entry_handler, projected_property
 
 logger = logging.getLogger(__name__)
 
@@ -12,46 +12,33 @@ class Card(CardData):
 	"""Class to handle conversion between PF2e TTRPG Records and cards."""
 
 
-	@classmethod
-	def handle_entry(cls, entry: str | dict) -> list[str]:
-		"""Converts TTRPG entry to RPGCard compatible line.
-
-		Args:
-			entry (list | dict): TTRPG entry
-
-		Raises:
-			ValueError: If unsupported entry type is supplied.
-		"""
-		try:
-			return super().handle_entry(entry)
-		except ValueError:
-			pass
-		except:
-			cls._raise_entry(entry)
-			
-		match entry["type"]:
-			case "successDegree":
-				return [*starmap("property | {} | {}".format, entry["entries"].items())]
-			case "ability":
-				return cls.to_ability(entry)
-			case "affliction":
-				return cls.to_affiction(entry)
-			case "lvlEffect":
-				return [
-					f"property | {e['range']} | {e['entry']}"
-					for e in entry['entries']
-				]
-			case "pf2-options":
-				return [
-					[f"property | {item['name']}", *map(cls.handle_entry, item["entries"])]
-					for item in [entry["items"]]
-				]
-			case "pf2-brown-box":
-				return []
-			case heading if re.match(r"pf2-h[0-9]+", heading):
-				return []
-		
-		cls._raise_entry(entry)
+	@entry_handler("successDegree")
+	def _success_degree_entry(cls, entry: dict) -> list[str]:
+		return [*starmap("property | {} | {}".format, entry["entries"].items())]
+
+	@entry_handler("ability")
+	def _ability_entry(cls, entry: dict) -> list[str]:
+		return cls.to_ability(entry)
+
+	@entry_handler("affliction")
+	def _affliction_entry(cls, entry: dict) -> list[str]:
+		return cls.to_affiction(entry)
+
+	@entry_handler("lvlEffect")
+	def _level_effect_entry(cls, entry: dict) -> list[str]:
+		return cls.to_level_effect(entry)
+
+	@entry_handler("pf2-options")
+	def _options_entry(cls, entry: dict) -> list[str]:
+		return [
+			line
+			for item in entry["items"]
+			for line in [f"text | <b>{item['name']}</b>", *itertools.chain.from_iterable(map(cls.handle_entry, item["entries"]))]
+		]
+
+	@entry_handler("pf2-brown-box", pattern=r"pf2-h[0-9]+")
+	def _skipped_pf2_entry(cls, entry: dict) -> list[str]:
+		return []
 	
 	@staticmethod
 	def camel_to_words(string: str):
@@ -203,26 +190,26 @@ class SpellCard(Card):
 		return "{number} {unit}".format(**self["cast"])
 
 	
-	@property
+	@projected_property
 	def spell_cast(self):
 		""":str: Casting Requirements."""
 		components = list(itertools.chain(*self.get("components", [])))
 		components += [] if "requirements" not in self else [self["requirements"]]
 		return f"{self.spell_cast_time}  {', '.join(components)}"
 	
-	@property
+	@projected_property
 	def spell_range(self):
 		""":str: Spell range:"""
 		if "range" in self:
 			return "{number} {unit}".format(**self["range"])
 		
-	@property
+	@projected_property
 	def spell_area(self):
 		""":str: Spell area."""
 		if "area" in self:
 			return self["area"].get("entry")
 		
-	@property
+	@projected_property
 	def spell_duration(self):
 		""":str: Spell duration."""
 		if "duration" not in self:
@@ -233,7 +220,7 @@ class SpellCard(Card):
 			case duration:
 				return "{number} {unit}".format(**duration)
 	
-	@property
+	@projected_property
 	def saving_throw(self):
 		""":str: Spell saving throw."""
 		if "savingThrow" not in self:
@@ -260,7 +247,7 @@ class SpellCard(Card):
 				raise ValueError(f"Unsupported Saving Throw Type: {short}")
 
 
-	@property
+	@projected_property
 	def heightened(self):
 		""":listr[str]: Heightened text lines.."""
 		match self.get("heightened"):
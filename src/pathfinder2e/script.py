@@ -1,25 +1,54 @@
 """"""
 
-import itertools
+import functools
 import json
 import logging
 from pathlib import Path
 
 
-from formatting import CardPage
+from formatting import CardData, export_deck, estimate_deck
+from manifest import Manifest
+from profiling import PROFILER
 from pathfinder2e import BasicActionCard, FeatCard, SpellCard, Pathbuilder
 from records import PF2eToolsData, TTRPGRecords
 import utils
+from utils import codec
 
 logger = logging.getLogger(__name__)
 
+CARD_TYPES: dict[str, type[CardData]] = {
+	"spells": SpellCard,
+	"feats": FeatCard,
+	"actions": BasicActionCard,
+}
+"""Card classes by PF2eToolsData record set."""
+
+def load_spell_card(records: TTRPGRecords, spells: TTRPGRecords, name: str) -> SpellCard:
+	"""Returns the card of a spell queried from records combined from the Spell Data and others, see `TTRPGRecords.combine`.
+
+	Records from the Spell Data read their projected properties from it.
+
+	Args:
+		records (TTRPGRecords): Combined records, starting with the Spell Data.
+		spells (TTRPGRecords): Spell Data.
+		name (str): Spell name.
+	"""
+	position = records.query_position(name, ["PC1", "PC2"], fuzzy=True)
+	if position < len(spells):
+		return SpellCard.from_records(spells, position)
+	return SpellCard(records.record_at(position))
+
+
 def get_spell_cards(
 		json_path: Path | None, 
 		json_id: int | None, 
 		names: list[str] | None, 
 		card_params: dict,
 		page_layout: tuple[int, int], 
-		card_layout: tuple[int, int]
+		card_layout: tuple[int, int],
+		estimate: bool = False,
+		manifest: Path | None = None,
+		shard: tuple[int, int] | None = None
 	):
 	"""Prints RPGCards to the command line.
 
@@ -30,40 +59,49 @@ def get_spell_cards(
 		card_params (dict): Card Parameter Dictionary.
 		page_layout (tuple[int, int]): Page layout dimentions.
 		card_layout (tuple[int, int]): _Card Layout dimentions.
+		estimate (bool, optional): Whether to print an estimate of the cards and pages instead. Defaults to False.
+		manifest (Path | None, optional): Path to a manifest of previously rendered cards, to reuse and update.
+			Defaults to None.
+		shard (tuple[int, int] | None, optional): Shard to render and number of shards, see `formatting.export_deck`.
+			Defaults to None, rendering every card.
 	"""
 
 	## Extract Names
-	data_source = PF2eToolsData(utils.get_env_variable("PATHFINDER_DATA_PATH"))
-	records = TTRPGRecords.combine([data_source.spells, data_source.actions])
+	data_source = PF2eToolsData.open(utils.get_env_variable("PATHFINDER_DATA_PATH"))
+	get_records = functools.cache(lambda: TTRPGRecords.combine([data_source.spells, data_source.actions]))
+	deck_manifest = Manifest.open(
+		None if estimate else manifest, data_source, ["spells", "actions"], card_params, card_layout
+	)
 	if names:
 		spell_names = names
-	else:
-		if json_id:
-			build = Pathbuilder.from_json_id(json_id)
-		elif json_path:
-			build = Pathbuilder.from_json(json_path.read_text())
-		else:
-			raise ValueError("One of names, json_path or json_id must be provided.")
+	elif json_id or json_path:
+		build = Pathbuilder.load(
+			json_path, json_id, None if deck_manifest.cached else data_source, eager=("spells", "actions")
+		)
 		spell_names = [*build.spells, *build.focus]
+	else:
+		raise ValueError("One of names, json_path or json_id must be provided.")
 	
 
 	## Query Data
-	card_pairs = []
-	c_h, c_w = card_layout
+	cards = []
 	for name in spell_names:
 		try:
-			spell = SpellCard(records.query_record(name, ["PC1", "PC2"]))
+			cards.append(deck_manifest.card(
+				f"SpellCard:{name}",
+				lambda: load_spell_card(get_records(), data_source.spells, name)
+			))
 		except (KeyError, IndexError):
 			logger.warning(f"Unable to find TTRPG Record: {name} in PC1 or PC2.")
-		card_pairs.extend(spell.get_card_pairs(height=c_h, width=c_w, **card_params))
+			continue
 
 	## Page formatting
-	p_h, p_w = page_layout
-	rpg_card_data = []
-	for page in CardPage.from_pairs(card_pairs=card_pairs, height=p_h, width=p_w):
-		rpg_card_data.extend(page.export())
+	deck = export_deck(cards, card_params, page_layout, card_layout, estimate=estimate, shard=shard)
+	deck_manifest.save()
 
-	print(json.dumps(rpg_card_data, indent=4))
+	with PROFILER.stage("output.serialize"):
+		output = codec.dumps(deck, indent=True)
+	codec.echo(output)
 
 
 def get_full_character_cards(
@@ -72,6 +110,9 @@ def get_full_character_cards(
 		card_params: dict,
 		page_layout: tuple[int, int], 
 		card_layout: tuple[int, int],
+		estimate: bool = False,
+		manifest: Path | None = None,
+		shard: tuple[int, int] | None = None,
 		**_
 	):
 	"""Prints RPGCards to the command line.
@@ -82,34 +123,45 @@ def get_full_character_cards(
 		card_params (dict): Card Parameter Dictionary.
 		page_layout (tuple[int, int]): Page layout dimentions.
 		card_layout (tuple[int, int]): _Card Layout dimentions.
+		estimate (bool, optional): Whether to print an estimate of the cards and pages instead. Defaults to False.
+		manifest (Path | None, optional): Path to a manifest of previously rendered cards, to reuse and update.
+			Defaults to None.
+		shard (tuple[int, int] | None, optional): Shard to render and number of shards, see `formatting.export_deck`.
+			Defaults to None, rendering every card.
 	"""
 
 	## Extract Names
-	data_source = PF2eToolsData(utils.get_env_variable("PATHFINDER_DATA_PATH"))
-	records = TTRPGRecords.combine([data_source.spells, data_source.actions, data_source.feats])
-	if json_id:
-		build = Pathbuilder.from_json_id(json_id)
-	elif json_path:
-		build = Pathbuilder.from_json(json_path.read_text())
-	else:
-		raise ValueError("One of json_path or json_id must be provided.")
-	
+	data_source = PF2eToolsData.open(utils.get_env_variable("PATHFINDER_DATA_PATH"))
+	get_records = functools.cache(lambda: TTRPGRecords.combine([data_source.spells, data_source.actions, data_source.feats]))
+	deck_manifest = Manifest.open(
+		None if estimate else manifest, data_source, ["spells", "actions", "feats"], card_params, card_layout
+	)
+	build = Pathbuilder.load(
+		json_path, json_id, None if deck_manifest.cached else data_source, eager=("spells", "actions", "feats")
+	)
 	cards = []
 
 	## Filter Basic Actions Index
-	basic_actions = [
-		BasicActionCard(action_data.dropna().to_dict())
-		for source in ["PC1", "PC2"]
-		for _, action_data in data_source.actions.loc[(slice(None), source), :].reset_index().iterrows()
-		if build.meets_requirements(action_data.dropna().to_dict())
-	]
+	with PROFILER.stage("basic_actions.filter"):
+		basic_actions = deck_manifest.cards(
+			f"BasicActionCard:{json.dumps(build['proficiencies'], sort_keys=True)}",
+			lambda: [
+				BasicActionCard(action_data.dropna().to_dict())
+				for _, action_data in data_source.actions.loc[
+					build.eligible_basic_actions(data_source.basic_action_requirements, ["PC1", "PC2"])
+				].reset_index().iterrows()
+			]
+		)
+		PROFILER.records("basic_actions.filter", len(basic_actions))
 	cards.extend(basic_actions)
 
 	## Filter Feats
 	for name in build.feats:
 		try:
-			feat_data = records.query_record(name, ["PC1", "PC2"])
-			cards.append(FeatCard(feat_data))
+			cards.append(deck_manifest.card(
+				f"FeatCard:{name}",
+				lambda: FeatCard(get_records().query_record(name, ["PC1", "PC2"], fuzzy=True))
+			))
 		except (KeyError, IndexError):
 			logger.warning(f"Unable to find TTRPG Record: {name} in PC1 or PC2.")
 			continue
@@ -117,24 +169,44 @@ def get_full_character_cards(
 	## Query Spells
 	for name in [*build.spells, *build.focus]:
 		try:
-			spell_data = records.query_record(name, ["PC1", "PC2"])
-			cards.append(SpellCard(spell_data))
+			cards.append(deck_manifest.card(
+				f"SpellCard:{name}",
+				lambda: load_spell_card(get_records(), data_source.spells, name)
+			))
 		except (KeyError, IndexError):
 			logger.warning(f"Unable to find TTRPG Record: {name} in PC1 or PC2.")
 			continue
 
 
-	## Query Data
-	c_h, c_w = card_layout
-	card_pairs = itertools.chain.from_iterable(
-		card.get_card_pairs(height=c_h, width=c_w, **card_params)
-		for card in cards
-	)
-
 	## Page formatting
-	p_h, p_w = page_layout
-	rpg_card_data = []
-	for page in CardPage.from_pairs(card_pairs=card_pairs, height=p_h, width=p_w):
-		rpg_card_data.extend(page.export())
+	deck = export_deck(cards, card_params, page_layout, card_layout, estimate=estimate, shard=shard)
+	deck_manifest.save()
 
-	print(json.dumps(rpg_card_data, indent=4))
+	with PROFILER.stage("output.serialize"):
+		output = codec.dumps(deck, indent=True)
+	codec.echo(output)
+
+
+def get_record_estimate(
+		record_type: str,
+		sources: list[str] | None,
+		page_layout: tuple[int, int], 
+		card_layout: tuple[int, int],
+		**_
+	):
+	"""Prints an estimate of the cards and pages a whole set of TTRPG Records would take, without rendering them.
+
+	Args:
+		record_type (str): Name of a PF2eToolsData record set, see `CARD_TYPES`.
+		sources (list[str] | None): List of TTRPG Sources to estimate. All sources if None.
+		page_layout (tuple[int, int]): Page layout dimentions.
+		card_layout (tuple[int, int]): _Card Layout dimentions.
+	"""
+	data_source = PF2eToolsData.open(utils.get_env_variable("PATHFINDER_DATA_PATH"))
+	records = getattr(data_source, record_type)
+	c_h, c_w = card_layout
+	size_index = CARD_TYPES[record_type].get_size_index(records, width=c_w)
+	if sources:
+		size_index = size_index.iloc[records.select_positions(source=set(sources))]
+	card_counts = CardData.estimate_card_counts(size_index["header"].to_numpy(), size_index["body"].to_numpy(), height=c_h)
+	codec.echo(codec.dumps(estimate_deck(card_counts, page_layout), indent=True))
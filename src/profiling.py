@@ -0,0 +1,160 @@
+"""Implements per-stage timing and profiling instrumentation for card pipelines."""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import cProfile
+import functools
+from pathlib import Path
+import pstats
+import time
+import tracemalloc
+
+
+class Profiler:
+    """Class for recording per-stage timings, counters and cache hit rates.
+
+    The profiler is disabled by default, in which case every instrumentation
+    call is a cheap no-op.
+    """
+
+    def __init__(self):
+        """Initialises a disabled Profiler instance."""
+        self.enabled = False
+        self.stages: dict[str, dict] = defaultdict(lambda: {"calls": 0, "wall": 0.0, "cpu": 0.0, "records": 0})
+        self.counters: Counter = Counter()
+        self.hits: dict[str, Counter] = defaultdict(Counter)
+        self._profile: cProfile.Profile | None = None
+        self._trace_memory = False
+        self.peak_memory: int | None = None
+
+    def start(self, profile: bool = False, trace_memory: bool = False):
+        """Enables instrumentation.
+
+        Args:
+            profile (bool, optional): Whether to run cProfile alongside the timings. Defaults to False.
+            trace_memory (bool, optional): Whether to track peak memory through tracemalloc, which slows down
+                allocation heavy stages. Defaults to False.
+        """
+        self.enabled = True
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._trace_memory = True
+        if profile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        """Disables instrumentation, leaving recorded data in place, and stops tracing memory if `start` began it."""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._trace_memory:
+            _, self.peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._trace_memory = False
+        self.enabled = False
+
+    def reset(self):
+        """Clears all recorded data."""
+        self.stages.clear()
+        self.counters.clear()
+        self.hits.clear()
+        self._profile = None
+        self.peak_memory = None
+        if self._trace_memory:
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager recording the wall and CPU time of a pipeline stage.
+
+        Args:
+            name (str): Stage name. Repeated stages are accumulated.
+        """
+        if not self.enabled:
+            yield
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.stages[name]
+            stats["calls"] += 1
+            stats["wall"] += time.perf_counter() - wall
+            stats["cpu"] += time.process_time() - cpu
+
+    def records(self, name: str, count: int):
+        """Adds to the record count of a stage.
+
+        Args:
+            name (str): Stage name.
+            count (int): Number of records processed.
+        """
+        if self.enabled:
+            self.stages[name]["records"] += count
+
+    def count(self, name: str, n: int = 1):
+        """Increments a named counter.
+
+        Args:
+            name (str): Counter name.
+            n (int, optional): Amount to increment by. Defaults to 1.
+        """
+        if self.enabled:
+            self.counters[name] += n
+
+    def hit(self, name: str, hit: bool):
+        """Records a cache hit or miss.
+
+        Args:
+            name (str): Cache name.
+            hit (bool): Whether the lookup was a hit.
+        """
+        if self.enabled:
+            self.hits[name]["hits" if hit else "misses"] += 1
+
+    def report(self) -> dict:
+        """Returns a JSON serialisable report of all recorded data."""
+        caches = {
+            name: {**counts, "hit_rate": counts["hits"] / ((counts["hits"] + counts["misses"]) or 1)}
+            for name, counts in self.hits.items()
+        }
+        report = {
+            "stages": {name: dict(stats) for name, stats in self.stages.items()},
+            "counters": dict(self.counters),
+            "caches": caches,
+        }
+        if self._trace_memory:
+            _, report["peak_memory_bytes"] = tracemalloc.get_traced_memory()
+        elif self.peak_memory is not None:
+            report["peak_memory_bytes"] = self.peak_memory
+        return report
+
+    def dump_stats(self, path: Path):
+        """Writes cProfile data to a pstats file.
+
+        Args:
+            path (Path): Output file path.
+
+        Raises:
+            ValueError: If the profiler wasn't started with profiling enabled.
+        """
+        if self._profile is None:
+            raise ValueError("Profiler was not started with cProfile enabled.")
+        pstats.Stats(self._profile).dump_stats(path)
+
+
+def profiled(name: str):
+    """Decorator recording each call of the decorated function as a stage of the global profiler.
+
+    Args:
+        name (str): Stage name.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with PROFILER.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+PROFILER = Profiler()
@@ -1,22 +1,87 @@
 """Imeplements classes for querying TTRPG Records."""
-from argparse import ArgumentParser
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import cached_property
 import functools
+import hashlib
+import heapq
 import itertools
-import json
+import logging
+import os
 from pathlib import Path
+import re
 import sys
-from typing import Literal, Self
+import threading
+from typing import Any, Callable, Hashable, Literal, NamedTuple, Self
 import pandas as pd
 from jsonpath_ng import JSONPath, ext
 
+from archive import ArchiveMember, DataArchive, MemberStat, is_archive, is_json, open_json, resolve_json
+from profiling import PROFILER, profiled
 import utils
+from utils import codec
+import utils.static
+
+logger = logging.getLogger(__name__)
 
 Source = Literal["dnd5etools", "pf2etools"]
 
+LEGACY_SUFFIX = re.compile(r"\s*\((legacy|\d{4})\)\s*$")
+APOSTROPHES = re.compile(r"['’‘`]")
+NON_WORD = re.compile(r"[^\w]+")
+
+FUZZY_MATCH_SCORE = 0.8
+"""Minimum similarity score of a name substituted for a missing one by fuzzy queries, see `TTRPGRecords.match_names`."""
+
+INTERN_LENGTH = 32
+"""Maximum length of strings interned process-wide, e.g. sources, traits, schools and units."""
+
+
+class RecordPool:
+    """Pool of the values of TTRPG Records read together, so that repeated values are held once.
+
+    Short strings are interned process-wide, and longer strings, lists and dicts equal to one
+    already pooled are replaced by it. Pooled values are shared between records, so must not
+    be modified.
+    """
+
+    __slots__ = ("values", "saved")
+
+    def __init__(self):
+        """Initialises an empty pool."""
+        self.values: dict[tuple, Any] = {}
+        self.saved = 0
+
+    def share(self, value: Any) -> Any:
+        """Returns the pooled value equal to the value provided, pooling it if there isn't one.
+
+        Args:
+            value (Any): JSON value.
+        """
+        match value:
+            case str() if len(value) <= INTERN_LENGTH:
+                shared = sys.intern(value)
+                if shared is not value:
+                    self.saved += sys.getsizeof(value)
+                return shared
+            case list():
+                value = [self.share(item) for item in value]
+                key = (list, *map(id, value))
+            case dict():
+                value = {self.share(field): self.share(item) for field, item in value.items()}
+                key = (dict, *itertools.chain.from_iterable((id(field), id(item)) for field, item in value.items()))
+            case _:
+                key = (type(value), value)
+        if (shared := self.values.setdefault(key, value)) is not value:
+            self.saved += sys.getsizeof(value)
+        return shared
+
+
 class TTRPGRecords(pd.DataFrame):
     """Class for holding, querying and indexing TTRPG Record data."""
 
+    source_priority: tuple[str, ...] = ()
+
     def __init__(self, records: list[dict], index: list[str]):
         """Intilises a TTRPGRecords instance.
 
@@ -24,101 +89,400 @@ class TTRPGRecords(pd.DataFrame):
             records (list[dict]): List or TTRPG Records
             index (list[str]): List of columns to index data by.
         """
-        super().__init__(records, dtype="object")
+        super().__init__(records, columns=None if len(records) else index, dtype="object")
         self.set_index(index, inplace=True)
 
     
     @classmethod
-    def from_paths(cls, fs_path: Path, json_path: JSONPath, index: list[str] | None = None) -> type[Self]:
+    def from_paths(
+        cls, fs_path: Path, json_path: JSONPath, index: list[str] | None = None, fields: frozenset[str] | None = None
+    ) -> type[Self]:
         """Procuces a TTRPGRecords instance, from file_system_path and a JSON Path.
 
         Args:
             fs_path (Path): Path to a directory or .json file f
             json_path (JSONPath): JSON path to TTRPGRecord data.
             index (list[str] | None, optional): List of TTRPG Record value to index by. Defaults to None.
+            fields (frozenset[str] | None, optional): Fields to keep, see `get_records`. Defaults to None.
+        """
+        return cls.from_files(cls.read_files(cls.get_source_files(fs_path), json_path, fields), index)
+
+    @classmethod
+    @profiled("records.frame")
+    def from_files(cls, records_by_file: dict[Path, list[dict]], index: list[str] | None = None) -> Self:
+        """Produces a TTRPGRecords instance from TTRPG Records grouped by source file.
+
+        Args:
+            records_by_file (dict[Path, list[dict]]): Mapping of JSON files to their TTRPG Records.
+            index (list[str] | None, optional): List of TTRPG Record value to index by. Defaults to None.
         """
-        files = cls.get_source_files(fs_path)
-        records = [*itertools.chain.from_iterable(
-            cls.get_records(file, json_path)
-            for file in files
-        )]
+        records = [*itertools.chain.from_iterable(records_by_file.values())]
+        PROFILER.records("records.frame", len(records))
         return cls(records, index or ["name", "source"])
 
+    @classmethod
+    @profiled("records.load")
+    def read_files(
+        cls, files: list[Path], json_path: JSONPath, fields: frozenset[str] | None = None
+    ) -> dict[Path, list[dict]]:
+        """Produces a mapping of JSON files to the TTRPG Records they contain.
+
+        Args:
+            files (list[Path]): Paths to JSON files.
+            json_path (JSONPath): JSON path to TTRPGRecord data.
+            fields (frozenset[str] | None, optional): Fields to keep, see `get_records`. Defaults to None.
+        """
+        PROFILER.count("records.files", len(files))
+        pool = RecordPool()
+        records_by_file = {file: cls.get_records(file, json_path, fields, pool) for file in files}
+        PROFILER.count("records.deduplicated_bytes", pool.saved)
+        logger.debug(f"Deduplicated {pool.saved} bytes of TTRPG Records across {len(files)} files.")
+        return records_by_file
+
     @staticmethod
-    def get_source_files(path: Path) -> list[Path]:
+    def get_source_files(path: Path | ArchiveMember) -> list[Path | ArchiveMember]:
         """Produces a list of path to JSON files containing TTRPG Data.
 
+        `.json` files may be compressed, as `.json.gz` or `.json.zst`, see `archive.resolve_json`.
+
         Args:
-            path (Path): Path to file or directory.
+            path (Path | ArchiveMember): Path to file or directory, on disk or within an archive.
 
         Raises:
             FileNotFoundError: If file or directory doesn't exist.
             ValueError: If non-JSON file path is provided.
         """
+        if path.suffix == ".json":
+            path = resolve_json(path) or path
         if not path.exists():
             raise FileNotFoundError(f"No data source found at {path.as_posix()}")
                 
         if not path.is_dir():
-            if path.suffix != ".json":
+            if not is_json(path):
                 raise ValueError(f"Path {path.as_posix()} is not a .json of directory.")
             return [path]
-        elif (path / "index.json").exists() and path.name != "homebrew":
-            index_data = json.loads((path / "index.json").read_text())
-            return [path / file_path for file_path in index_data.values()]
+        elif (index := resolve_json(path / "index.json")) is not None and path.name != "homebrew":
+            with open_json(index) as stream:
+                index_data = codec.loads(stream.read())
+            return [resolve_json(path / file_path) or path / file_path for file_path in index_data.values()]
         else:
-            return [*path.glob("*.json")]
+            return [file for file in path.glob("*.json*") if is_json(file)]
 
     @staticmethod
-    def get_records(file_path: Path, json_path: JSONPath) -> dict:
+    def get_records(
+        file_path: Path | ArchiveMember,
+        json_path: JSONPath,
+        fields: frozenset[str] | None = None,
+        pool: RecordPool | None = None
+    ) -> dict:
         """Produces a list of TTRPG Record from the file_path and json_path provided.
 
         Args:
-            file_path (Path): Path to a JSON file.
+            file_path (Path | ArchiveMember): Path to a plain or compressed JSON file, see `archive.open_json`.
             json_path (JSONPath): JSON path to a list of TTRPG Records.
+            fields (frozenset[str] | None, optional): Fields to keep, dropping every other field of each
+                record as it's read. Defaults to None, keeping every field.
+            pool (RecordPool | None, optional): Pool to share record values through, e.g. across the files
+                of a RecordSet. Defaults to None, sharing nothing.
         """
-        raw_data = json.loads(file_path.read_text())
+        with PROFILER.stage("records.parse"), open_json(file_path) as stream:
+            raw_data = codec.loads(stream.read())
         records = []
         for match in json_path.find(raw_data):
-            records.extend(match.value)
+            if fields is None:
+                records.extend(match.value)
+            else:
+                records.extend({key: value for key, value in record.items() if key in fields} for record in match.value)
+        if pool is not None:
+            records = [{pool.share(key): pool.share(value) for key, value in record.items()} for record in records]
+        PROFILER.records("records.parse", len(records))
         return records
     
 
     @staticmethod
-    def naiive_by_sources(source: str, sources: list[str]) -> int:
-        """Returns the index the source provided appear in sources provided.
+    @functools.cache
+    def source_ranks(sources: tuple[str, ...]) -> dict[str, int]:
+        """Returns a mapping of each source to its priority rank.
+
+        Args:
+            sources (tuple[str, ...]): TTRPG Sources, highest priority first.
+        """
+        return {source: rank for rank, source in reversed([*enumerate(sources)])}
+
+    @classmethod
+    def set_source_priority(cls, sources: list[str] | None):
+        """Sets the global source priority, used when no sources are provided to `query_record`.
+
+        Applies to every record type. Sources not listed keep their data order after listed ones.
+
+        Args:
+            sources (list[str] | None): TTRPG Sources, highest priority first. e.g. ["PC1", "CRB"].
+        """
+        cls.source_priority = tuple(sources or ())
 
-        If `source is not in sources, returns max int. If no sources
-        provided, returns 0. 
+    @cached_property
+    def _rankings(self) -> dict[tuple[str, ...], dict[str, tuple[tuple[str, int], ...]]]:
+        """:dict: Per source priority, mapping of names to (source, position) candidates, best first."""
+        return {}
+
+    def ranked_candidates(self, priority: tuple[str, ...] = ()) -> dict[str, tuple[tuple[str, int], ...]]:
+        """Returns a mapping of record names to their (source, position) candidates, sorted by priority.
+
+        Compiled once per priority and cached.
 
         Args:
-            source (str): TTRPG Source.
-            sources (list[str]): List of TTRPG Sources.
+            priority (tuple[str, ...], optional): TTRPG Sources, highest priority first. Defaults to ().
+        """
+        if (ranked := self._rankings.get(priority)) is not None:
+            return ranked
+        ranks = self.source_ranks(priority)
+        candidates: dict[str, list[tuple[str, int]]] = {}
+        names = self.index.get_level_values("name")
+        sources = self.index.get_level_values("source")
+        for position, (name, source) in enumerate(zip(names, sources)):
+            candidates.setdefault(name, []).append((source, position))
+        ranked = self._rankings[priority] = {
+            name: tuple(sorted(options, key=lambda option: ranks.get(option[0], len(ranks))))
+            for name, options in candidates.items()
+        }
+        return ranked
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Returns a record name normalised for lookup.
 
+        Ignores casing, apostrophes, punctuation, whitespace and "(Legacy)" style suffixes.
+
+        Args:
+            name (str): Record Name.
         """
-        if not sources:
-            return 0
-        try:
-            return sources.index(source)
-        except ValueError:
-            return sys.maxsize
+        name = LEGACY_SUFFIX.sub("", name.casefold())
+        name = APOSTROPHES.sub("", name)
+        return " ".join(NON_WORD.sub(" ", name).split())
 
-    
-    def query_record(self, name: str, sources: list[str] | None = None) -> dict:
-        """Returns a record TTRPG record for the provided parameters.
+    @staticmethod
+    def get_trigrams(normalized_name: str) -> set[str]:
+        """Returns the set of padded character trigrams of a normalised name."""
+        padded = f"  {normalized_name} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @cached_property
+    def name_index(self) -> dict[str, tuple[str, ...]]:
+        """:dict[str, tuple[str, ...]]: Mapping of normalised names to record names."""
+        index: dict[str, list[str]] = {}
+        for name in dict.fromkeys(self.index.get_level_values("name")):
+            index.setdefault(self.normalize_name(name), []).append(name)
+        return {normalized: tuple(names) for normalized, names in index.items()}
+
+    @cached_property
+    def trigram_index(self) -> dict[str, tuple[str, ...]]:
+        """:dict[str, tuple[str, ...]]: Mapping of trigrams to the normalised names containing them."""
+        index: dict[str, list[str]] = {}
+        for normalized in self.name_index:
+            for trigram in self.get_trigrams(normalized):
+                index.setdefault(trigram, []).append(normalized)
+        return {trigram: tuple(names) for trigram, names in index.items()}
+
+    @cached_property
+    def _trigram_counts(self) -> dict[str, int]:
+        """:dict[str, int]: Mapping of normalised names to their number of trigrams."""
+        return {normalized: len(self.get_trigrams(normalized)) for normalized in self.name_index}
+
+    def match_names(self, name: str, limit: int = 5, cutoff: float = 0.6) -> list[tuple[str, float]]:
+        """Returns record names similar to the name provided, best match first.
+
+        Exact matches after normalisation score 1.0, others score the Sørensen–Dice
+        similarity of their trigrams. Only names sharing a trigram with the provided
+        name are scored.
+
+        Args:
+            name (str): Record Name.
+            limit (int, optional): Maximum number of matches. Defaults to 5.
+            cutoff (float, optional): Minimum similarity score. Defaults to 0.6.
+        """
+        normalized = self.normalize_name(name)
+        if normalized in self.name_index:
+            return [(match, 1.0) for match in self.name_index[normalized]][:limit]
+
+        trigrams = self.get_trigrams(normalized)
+        shared = Counter(itertools.chain.from_iterable(
+            self.trigram_index.get(trigram, ()) for trigram in trigrams
+        ))
+        scores = [
+            (candidate, 2 * count / (len(trigrams) + self._trigram_counts[candidate]))
+            for candidate, count in shared.items()
+        ]
+        best = heapq.nlargest(limit, (score for score in scores if score[1] >= cutoff), key=lambda score: score[1])
+        return [
+            (match, score)
+            for candidate, score in best
+            for match in self.name_index[candidate]
+        ][:limit]
+
+    def query_record(self, name: str, sources: list[str] | None = None, fuzzy: bool = False) -> dict:
+        """Returns a record TTRPG record for the provided parameters, see `query_position`."""
+        return self.record_at(self.query_position(name, sources, fuzzy))
+
+    def query_position(self, name: str, sources: list[str] | None = None, fuzzy: bool = False) -> int:
+        """Returns the row position of the TTRPG record for the provided parameters.
+
+        If sources are provided, the first listed source with a matching record is
+        used, otherwise the global `source_priority` is.
         
         Args:
             name (str): Record Name.
             sources (list[str] | None, optional): List of TTRPG Sources. Defaults to None.
+            fuzzy (bool, optional): Whether to fall back to the closest matching name, see `match_names`,
+                if it's an exact match after normalisation or scores at least `FUZZY_MATCH_SCORE`. Defaults to False.
 
+        Raises:
+            KeyError: If no record has the provided name, listing similar names if fuzzy.
+            IndexError: If no record with the provided name is in the sources provided.
         """
-        index_selector = [name] if sources is None else self.index.intersection(
-            list(itertools.product([name], sources))
-        )
-        raw_query = self.loc[index_selector]
-        by_source = functools.partial(self.naiive_by_sources, sources=sources or [])
-        query = raw_query.sort_values(by="source", key=lambda col: col.map(by_source)).reset_index()
-        return query.iloc[0].dropna().to_dict()
+        with PROFILER.stage("records.query"):
+            ranked = self.ranked_candidates(self.source_priority)
+            if fuzzy and name not in ranked:
+                matches = self.match_names(name)
+                if not matches or matches[0][1] < FUZZY_MATCH_SCORE:
+                    PROFILER.hit("records.query", False)
+                    suggestions = ", ".join(match for match, _ in matches) or "none"
+                    raise KeyError(f"No record {name}. Similar names: {suggestions}.")
+                match, score = matches[0]
+                logger.warning(f"Resolved TTRPG Record name {name} to {match} ({score:.2f}).")
+                name = match
+            try:
+                candidates = ranked[name]
+                if sources is None:
+                    _, position = candidates[0]
+                else:
+                    ranks = self.source_ranks(tuple(sources))
+                    in_sources = [candidate for candidate in candidates if candidate[0] in ranks]
+                    if not in_sources:
+                        raise IndexError(f"No record {name} in sources {sources}.")
+                    _, position = min(in_sources, key=lambda candidate: ranks[candidate[0]])
+            except (KeyError, IndexError):
+                PROFILER.hit("records.query", False)
+                raise
+            PROFILER.hit("records.query", True)
+            return position
+
+    def record_at(self, position: int) -> dict:
+        """Returns the TTRPG Record at the row position provided, without missing values."""
+        return {
+            **dict(zip(self.index.names, self.index[position])),
+            **self.iloc[position].dropna().to_dict()
+        }
+
+    @cached_property
+    def size_indexes(self) -> dict[tuple[type, int], pd.DataFrame]:
+        """:dict[tuple[type, int], pd.DataFrame]: Measured card sizes by card class and width, see `formatting.CardData.get_size_index`."""
+        return {}
+
+    @cached_property
+    def projections(self) -> dict[type, pd.DataFrame]:
+        """:dict[type, pd.DataFrame]: Projected card properties by card class, see `formatting.CardData.get_projection`."""
+        return {}
+
+    @cached_property
+    def attribute_indexes(self) -> dict[str, dict[Hashable, frozenset[int]]]:
+        """:dict[str, dict[Hashable, frozenset[int]]]: Secondary indexes of row positions by field value, see `build_index`."""
+        return {}
+
+    def build_index(self, field: str, key: Callable[[Any], Any] | None = None) -> dict[Hashable, frozenset[int]]:
+        """Builds a secondary index of row positions by the values of a field or index level.
+
+        List values are indexed by each of their items. Missing and unhashable values aren't indexed.
+
+        Args:
+            field (str): Column or index level name.
+            key (Callable[[Any], Any] | None, optional): Function of a present value returning the value,
+                or list of values, to index by. Defaults to None.
+        """
+        if field in self.index.names:
+            values = self.index.get_level_values(field)
+        elif field in self.columns:
+            values = self[field]
+        else:
+            values = []
+
+        index: dict[Hashable, set[int]] = {}
+        for position, value in enumerate(values):
+            if value is None or value != value:
+                continue
+            if key is not None and (value := key(value)) is None:
+                continue
+            for item in (value if isinstance(value, (list, tuple)) else [value]):
+                if isinstance(item, Hashable):
+                    index.setdefault(item, set()).add(position)
+        attribute_index = self.attribute_indexes[field] = {value: frozenset(positions) for value, positions in index.items()}
+        return attribute_index
+
+    def build_indexes(self, *fields: str | tuple[str, Callable[[Any], Any]]):
+        """Builds secondary indexes for each of the fields, or (field, key) pairs, provided, see `build_index`."""
+        with PROFILER.stage("records.index"):
+            for field in fields:
+                if isinstance(field, tuple):
+                    self.build_index(*field)
+                else:
+                    self.build_index(field)
+
+    @staticmethod
+    def _match_keys(attribute_index: dict[Hashable, frozenset[int]], criterion: Any) -> list[Hashable]:
+        """Returns the keys of an attribute index matching a criterion, see `select_positions`."""
+        match criterion:
+            case slice(start=start, stop=stop):
+                matched = []
+                for value in attribute_index:
+                    try:
+                        if (start is None or start <= value) and (stop is None or value <= stop):
+                            matched.append(value)
+                    except TypeError:
+                        continue
+                return matched
+            case set() | frozenset() | list() | tuple():
+                return [*criterion]
+            case _:
+                return [criterion]
+
+    def select_positions(self, **criteria: Any) -> list[int]:
+        """Returns the row positions of TTRPG Records matching every criterion provided.
+
+        Criteria are keyed by field, and are either a value (equality, or membership for list fields),
+        a set, list or tuple of values (any of), or a slice (inclusive range). Secondary indexes are
+        built for fields without one and results combined by set intersection.
+
+        Args:
+            **criteria (Any): Criteria by field, e.g. `level=slice(1, 3), traditions={"arcane"}`.
+        """
+        matches = []
+        for field, criterion in criteria.items():
+            if (attribute_index := self.attribute_indexes.get(field)) is None:
+                attribute_index = self.build_index(field)
+            keys = self._match_keys(attribute_index, criterion)
+            matches.append(frozenset().union(*(attribute_index.get(key, ()) for key in keys)))
+        if not matches:
+            return [*range(len(self))]
+        return sorted(frozenset.intersection(*sorted(matches, key=len)))
+
+    def select(self, **criteria: Any) -> list[dict]:
+        """Returns the TTRPG Records matching every criterion provided, see `select_positions`."""
+        with PROFILER.stage("records.select"):
+            positions = self.select_positions(**criteria)
+            PROFILER.records("records.select", len(positions))
+            return [*map(self.record_at, positions)]
     
+    def patch(self, keep: list[bool], records: Self) -> Self:
+        """Returns a new TTRPGRecords instance, with the rows selected by keep followed by the records provided.
+
+        Args:
+            keep (list[bool]): Boolean mask of rows to keep, in row order.
+            records (Self): TTRPG Records to add.
+        """
+        if self.index.names != records.index.names:
+            raise ValueError("Indexes of provided TTRPGRecords do not match.")
+        combined = pd.concat([self[keep], records]).reset_index()
+        return type(self)(combined, index=self.index.names)
+
     @classmethod
     def _combine(cls, a: Self, b: Self) -> Self:
         """Combines two TRRPG records into one."""
@@ -131,6 +495,7 @@ class TTRPGRecords(pd.DataFrame):
         return cls(records, index=a.index.names)
     
     @classmethod
+    @profiled("records.combine")
     def combine(cls, ttrpg_records: list[Self]):
         """Combines a list of TTRPGRecords into a single record.
 
@@ -140,121 +505,516 @@ class TTRPGRecords(pd.DataFrame):
         return functools.reduce(cls._combine, ttrpg_records)
 
 
+class RecordSet:
+    """Descriptor for a lazily loaded set of TTRPG Records within a TTRPGData source."""
+
+    def __init__(
+        self,
+        fs_path: str,
+        json_path: str,
+        doc: str | None = None,
+        indexes: tuple[str | tuple[str, Callable], ...] = (),
+        fields: tuple[str, ...] = ()
+    ):
+        """Initialises a RecordSet.
+
+        Args:
+            fs_path (str): Path to a directory or .json file, relative to the TTRPGData source.
+            json_path (str): JSON path to TTRPG Record data.
+            doc (str | None, optional): Docstring. Defaults to None.
+            indexes (tuple[str | tuple[str, Callable], ...], optional): Fields, or (field, key) pairs, to build
+                secondary indexes on at load time, see `TTRPGRecords.build_index`. Defaults to ().
+            fields (tuple[str, ...], optional): Fields read by card classes and derived properties. Only these,
+                name, source and indexed fields are loaded, unless the data source is in full mode.
+                Defaults to (), loading every field.
+        """
+        self.fs_path = fs_path
+        self.json_path = json_path
+        self.__doc__ = doc
+        self.indexes = indexes
+        self.fields = fields
+
+    @property
+    def kept_fields(self) -> frozenset[str] | None:
+        """:frozenset[str] | None: Fields kept when pruning at load time, or None if every field is kept."""
+        if not self.fields:
+            return None
+        indexed = (index if isinstance(index, str) else index[0] for index in self.indexes)
+        return frozenset(["name", "source", *indexed, *self.fields])
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, instance: "TTRPGData | None", owner: type | None = None) -> "TTRPGRecords | RecordSet":
+        if instance is None:
+            return self
+        try:
+            records = instance.__dict__[self.name]
+        except KeyError:
+            records = self._load(instance)
+        if instance.registry is not None:
+            instance.registry.touch(instance, self.name, records)
+        return records
+
+    def __set__(self, instance: "TTRPGData", value: "TTRPGRecords"):
+        # defining __set__ makes RecordSet a data descriptor, so every access goes through __get__
+        raise AttributeError(f"RecordSet {self.name} is read-only.")
+
+    def _load(self, instance: "TTRPGData") -> "TTRPGRecords":
+        """Loads the RecordSet into the instance, unless a concurrent access already has."""
+        # single flight: concurrent first accesses wait for one loader
+        with instance._get_lock(self.name):
+            try:
+                return instance.__dict__[self.name]
+            except KeyError:
+                records = instance.__dict__[self.name] = instance._fetch_record_set(self)
+                return records
+
+
+class RecordSetState(NamedTuple):
+    """Source file state of a loaded RecordSet."""
+
+    mtimes: dict[Path, int | MemberStat]
+    origins: pd.Index
 
-    def _get_entry_summary(self) -> dict:
-        """Retrieve a summary of all entries within this Record source, sorted by type."""
-        entries = itertools.chain(*itertools.chain(*map(self._extract_entries, self["entries"])))
-        by_entry_type = lambda e: "txt" if isinstance(e, str) else e["type"]
-        return dict(
-            (name, list(data))
-            for name, data in
-            itertools.groupby(sorted(entries, key=by_entry_type), key=by_entry_type)
-        )
-    
-    @staticmethod
-    def _extract_entries(entry) -> str | dict:
-        """Utility function for recurrisvely extracting entries from TTRPG Records."""
-        entries = [entry]
-        if isinstance(entry, dict) and "entries" in entry:
-            for sub_entry in entry["entries"]:
-                entries.extend(TTRPGRecords._extract_entries(sub_entry))
-        return entries
 
-        
 class TTRPGData(Path):
 
-    def __init__(self, source_dir: str):
+    derived: dict[str, tuple[str, ...]] = {}
+    """Mapping of RecordSet names to the names of cached properties derived from them."""
+
+    registry: "DataRegistry | None" = None
+    """Registry tracking this data source's RecordSets, if opened through one."""
+
+    def __init__(self, source_dir: str, prewarm: tuple[str, ...] = (), full: bool = False):
         """Initialises a TTRPG Data Source.
 
         Args:
-            source_dir (str): Source Directory containing TTRPG Data.
+            source_dir (str): Source Directory containing TTRPG Data, or a zip or tar archive of one.
+            prewarm (tuple[str, ...], optional): Names of RecordSets to start loading in the background. Defaults to ().
+            full (bool, optional): Whether to load every field of each record, rather than those declared by
+                each RecordSet, see `RecordSet.fields`. Defaults to False.
 
         Raises:
             FileNotFoundError: If no such directory exists.
-            ValueError: If file system location is not a directory.
+            ValueError: If file system location is not a directory or archive.
         """
         super().__init__(source_dir)
         if not self.exists():
             raise FileNotFoundError()
-        if not self.is_dir():
+        if not (self.is_dir() or is_archive(self)):
             raise ValueError()
+        self._archive: DataArchive | None = None
+        self._states: dict[str, RecordSetState] = {}
+        self._subscribers: list[Callable[[str, TTRPGRecords], None]] = []
+        self._locks: dict[str, threading.Lock] = {}
+        self.full = full
+        if prewarm:
+            self.prewarm(*prewarm)
 
-    def _fetch_records(self, fs_path: str, json_path: str) -> TTRPGRecords:
-        """Fetches TTRPG Record Data from the filesystem and JSON path."""
-        return TTRPGRecords.from_paths(fs_path=Path(self) / fs_path, json_path=ext.parse(json_path))
+    @classmethod
+    def open(cls, source_dir: str, full: bool = False) -> Self:
+        """Returns the process-wide instance for the source directory provided, see `DataRegistry`.
+
+        Args:
+            source_dir (str): Source Directory containing TTRPG Data.
+            full (bool, optional): Whether to load every field of each record. Defaults to False.
+        """
+        return REGISTRY.get(cls, source_dir, full)
+
+    def evict(self, name: str):
+        """Unloads the named RecordSet and the cached properties derived from it."""
+        with self._get_lock(name):
+            self.__dict__.pop(name, None)
+            self._states.pop(name, None)
+            for derived in self.derived.get(name, ()):
+                self.__dict__.pop(derived, None)
+
+    @property
+    def archive(self) -> DataArchive | None:
+        """:DataArchive | None: Archive of the TTRPG Data, listed again whenever the archive changes. None for directories."""
+        if self.is_dir():
+            return None
+        if self._archive is None or self._archive.stamp != DataArchive.get_stamp(self):
+            self._archive = DataArchive(self)
+        return self._archive
+
+    def locate(self, record_set: RecordSet) -> Path | ArchiveMember:
+        """Returns the path of a RecordSet's file or directory, on disk or within the archive."""
+        if (archive := self.archive) is None:
+            return Path(self) / record_set.fs_path
+        return archive.member(record_set.fs_path)
+
+    def _get_lock(self, name: str) -> threading.Lock:
+        """Returns the lock guarding loading and patching of the named RecordSet."""
+        return self._locks.setdefault(name, threading.Lock())
+
+    def prewarm(self, *names: str) -> list[Future]:
+        """Starts loading the named RecordSets in background threads.
+
+        Accessing a RecordSet while it's loading waits for the load rather than starting another.
+
+        Args:
+            *names (str): RecordSet names.
+
+        Raises:
+            ValueError: If an unknown RecordSet name is provided.
+        """
+        if unknown := set(names).difference(self.record_sets()):
+            raise ValueError(f"Unknown record types: {', '.join(sorted(unknown))}.")
+        executor = ThreadPoolExecutor(max_workers=len(names) or 1, thread_name_prefix="prewarm")
+        futures = [executor.submit(getattr, self, name) for name in names]
+        executor.shutdown(wait=False)
+        return futures
+
+    @classmethod
+    def record_sets(cls) -> dict[str, RecordSet]:
+        """Returns a mapping of names to every RecordSet declared on this data source."""
+        return {
+            name: attr
+            for klass in reversed(cls.__mro__)
+            for name, attr in vars(klass).items()
+            if isinstance(attr, RecordSet)
+        }
+
+    @property
+    def loaded(self) -> list[str]:
+        """:list[str]: Names of RecordSets currently loaded."""
+        return [name for name in self.record_sets() if name in self.__dict__]
+
+    def _fetch_record_set(self, record_set: RecordSet) -> TTRPGRecords:
+        """Fetches a RecordSet's TTRPG Record Data, recording the state of its source files."""
+        files = TTRPGRecords.get_source_files(self.locate(record_set))
+        mtimes = self._get_mtimes(files)
+        records_by_file = TTRPGRecords.read_files(files, ext.parse(record_set.json_path), self.get_fields(record_set))
+        self._states[record_set.name] = RecordSetState(mtimes, self._get_origins(records_by_file))
+        records = TTRPGRecords.from_files(records_by_file)
+        records.build_indexes(*record_set.indexes)
+        return records
+
+    def get_fields(self, record_set: RecordSet) -> frozenset[str] | None:
+        """Returns the fields of a RecordSet to load, or None to load every field."""
+        return None if self.full else record_set.kept_fields
+
+    def fingerprint(self, *names: str) -> str:
+        """Returns a digest of the source files of the named RecordSets and their modification times, without loading them.
+
+        Args:
+            *names (str): RecordSet names.
+        """
+        digest = hashlib.sha256()
+        for name in names:
+            record_set = self.record_sets()[name]
+            files = TTRPGRecords.get_source_files(self.locate(record_set))
+            for file, mtime in self._get_mtimes(files).items():
+                digest.update(f"{name}:{file}:{mtime}\n".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _get_mtimes(files: list[Path | ArchiveMember]) -> dict[Path | ArchiveMember, int | MemberStat]:
+        """Returns the modification times of the files provided, or the whole status of archive members, see `MemberStat`."""
+        return {file: file.stat() if isinstance(file, ArchiveMember) else file.stat().st_mtime_ns for file in files}
+
+    @staticmethod
+    def _get_origins(records_by_file: dict[Path, list[dict]]) -> pd.Index:
+        """Returns an index of the source file of each TTRPG Record, in record order."""
+        return pd.Index([file for file, records in records_by_file.items() for _ in records], dtype="object")
+
+    def subscribe(self, callback: Callable[[str, TTRPGRecords], None]):
+        """Registers a callback, called with the RecordSet name and new records whenever a RecordSet is patched.
+
+        Args:
+            callback (Callable[[str, TTRPGRecords], None]): Callback, e.g. to invalidate rendered card caches.
+        """
+        self._subscribers.append(callback)
+
+    def refresh(self) -> dict[str, dict[str, list[Path]]]:
+        """Patches loaded RecordSets with records from added, changed or removed source files.
+
+        Only records from affected files are re-read. Cached properties derived from patched
+        RecordSets are invalidated and subscribers notified.
+
+        Returns:
+            dict[str, dict[str, list[Path]]]: Per patched RecordSet, the added, changed and removed files.
+        """
+        record_sets = self.record_sets()
+        changes = {}
+        for name in self.loaded:
+            with self._get_lock(name):
+                if (diff := self._refresh_record_set(record_sets[name])) is not None:
+                    changes[name] = diff
+        return changes
+
+    def _refresh_record_set(self, record_set: RecordSet) -> dict[str, list[Path]] | None:
+        """Patches a loaded RecordSet, returning its added, changed and removed files, or None if unchanged."""
+        name = record_set.name
+        state = self._states[name]
+        mtimes = self._get_mtimes(TTRPGRecords.get_source_files(self.locate(record_set)))
+        diff = {
+            "added": [file for file in mtimes if file not in state.mtimes],
+            "changed": [file for file in mtimes if file in state.mtimes and mtimes[file] != state.mtimes[file]],
+            "removed": [file for file in state.mtimes if file not in mtimes],
+        }
+        if not any(diff.values()):
+            return None
+        stale = [*diff["changed"], *diff["removed"]]
+        records_by_file = TTRPGRecords.read_files(
+            [*diff["added"], *diff["changed"]], ext.parse(record_set.json_path), self.get_fields(record_set)
+        )
+        records = self.__dict__[name].patch(~state.origins.isin(stale), TTRPGRecords.from_files(records_by_file))
+        self._states[name] = RecordSetState(
+            mtimes, state.origins[~state.origins.isin(stale)].append(self._get_origins(records_by_file))
+        )
+        records.build_indexes(*record_set.indexes)
+        self.__dict__[name] = records
+        for derived in self.derived.get(name, ()):
+            self.__dict__.pop(derived, None)
+        for callback in self._subscribers:
+            callback(name, records)
+        return diff
+
+    def watch(self, interval: float = 1.0, stop: threading.Event | None = None) -> threading.Thread:
+        """Polls source files of loaded RecordSets in a background thread, refreshing them on change.
+
+        Args:
+            interval (float, optional): Seconds between polls. Defaults to 1.0.
+            stop (threading.Event | None, optional): Event which stops watching once set. Defaults to None,
+                watching until the process exits.
+        """
+        stop = stop or threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                try:
+                    self.refresh()
+                except (OSError, ValueError) as error:
+                    logger.warning(f"Unable to refresh TTRPG Data at {self.as_posix()}: {error}")
+
+        thread = threading.Thread(target=poll, name=f"watch:{self.name}", daemon=True)
+        thread.start()
+        return thread
 
 
 class Dnd5eToolsData(TTRPGData):
 
+    derived = {"class_features": ("class_feature_keys",)}
 
-    @cached_property
-    def spells(self):
-        """:TTRPGRecords: DnD 5e Spell Data."""
-        return self._fetch_records("data/spells/", "$.spell")
-    
-    @cached_property
-    def items(self):
-        """:TTRPGRecords: DnD 5e Item Data."""
-        return self._fetch_records("data/items.json", "$.item")
-        
-    @cached_property
-    def homebrew_items(self):
-        """:TTRPGRecords: DnD 5e Homebrew Magic Item Data."""
-        return self._fetch_records("homebrew/", "$.item")
-    
-    @cached_property
-    def monsters(self):
-        """:TTRPGRecords: DnD 5e Monster Data."""
-        return self._fetch_records("data/beastiary/", "$.monster")
+    spells = RecordSet(
+        "data/spells/", "$.spell", ":TTRPGRecords: DnD 5e Spell Data.",
+        indexes=("source", "level", "school"),
+        fields=("time", "range", "components", "duration", "entries", "entriesHigherLevel")
+    )
+    items = RecordSet(
+        "data/items.json", "$.item", ":TTRPGRecords: DnD 5e Item Data.",
+        indexes=("source", "rarity"),
+        fields=("baseItem", "reqAttune", "tier", "charges", "entries")
+    )
+    homebrew_items = RecordSet(
+        "homebrew/", "$.item", ":TTRPGRecords: DnD 5e Homebrew Magic Item Data.",
+        indexes=("source", "rarity"),
+        fields=("baseItem", "reqAttune", "tier", "charges", "entries")
+    )
+    monsters = RecordSet(
+        "data/beastiary/", "$.monster", ":TTRPGRecords: DnD 5e Monster Data.",
+        indexes=("source", ("cr", utils.challenge_rating), ("type", utils.creature_type), "environment"),
+        fields=(
+            "size", "alignment", "ac", "hp", "speed", "str", "dex", "con", "int", "wis", "cha", "save", "skill",
+            "vulnerable", "resist", "immune", "conditionImmune", "senses", "passive", "languages",
+            "trait", "action", "bonus", "reaction", "legendary", "mythic",
+        )
+    )
+    class_features = RecordSet(
+        "data/class/", "$.classFeature|subclassFeature", ":TTRPGRecords: DnD 5e Class Feature Data.",
+        indexes=("source", "level"),
+        fields=("className", "subclassShortName", "entries")
+    )
+    feats = RecordSet(
+        "data/feats.json", "$.feat", ":TTRPGRecords: DnD 5e Feat Data.",
+        indexes=("source",),
+        fields=("prerequisite", "entries")
+    )
 
     @cached_property
-    def class_features(self):
-        """:TTRPGRecords: DnD 5e Class Feature Data."""
-        return self._fetch_records("data/class/", "$.classFeature|subclassFeature")
+    def class_feature_keys(self) -> pd.DataFrame:
+        """:pd.DataFrame: Class and subclass feature keys, one row per (name, className, subclassShortName, level, source).
 
-    @cached_property
-    def feats(self):
-        """:TTRPGRecords: DnD 5e Feat Data."""
-        return self._fetch_records("data/feats.json", "$.feat")
+        `key` is the feature's normalised name, see `TTRPGRecords.normalize_name`,
+        `subclassShortName` is None for class features, and `position` is the feature's
+        position within the Class Feature Data.
+        """
+        features = self.class_features.reset_index()
+        subclasses = features["subclassShortName"] if "subclassShortName" in features else [None] * len(features)
+        return pd.DataFrame({
+            "key": features["name"].map(TTRPGRecords.normalize_name),
+            "className": features["className"],
+            "subclassShortName": [subclass if isinstance(subclass, str) else None for subclass in subclasses],
+            "level": features["level"],
+            "source": features["source"],
+            "position": range(len(features)),
+        })
 
 
 class PF2eToolsData(TTRPGData):
 
-    @cached_property
-    def feats(self):
-        """:TTRPGRecords: Pathfinder 2e Feat Data."""
-        return self._fetch_records("data/feats/", "$.feat")
+    derived = {"actions": ("basic_action_requirements",)}
 
+    feats = RecordSet(
+        "data/feats/", "$.feat", ":TTRPGRecords: Pathfinder 2e Feat Data.",
+        indexes=("source", "level", "traits"),
+        fields=("activity", "trigger", "cost", "frequency", "requirements", "special", "entries")
+    )
+    actions = RecordSet(
+        "data/actions.json", "$.action", ":TTRPGRecords: Pathfinder 2e Action Data.",
+        indexes=("source", "traits"),
+        fields=("actionType", "level", "activity", "trigger", "cost", "frequency", "requirements", "special", "entries")
+    )
+    spells = RecordSet(
+        "data/spells/", "$.spell", ":TTRPGRecords: Pathfinder 2e Spell Data.",
+        indexes=("source", "level", "traditions", "traits"),
+        fields=(
+            "domains", "cast", "components", "requirements", "range", "area", "duration", "targets",
+            "savingThrow", "heightened", "entries",
+        )
+    )
 
     @cached_property
-    def actions(self):
-        """:TTRPGRecords: Pathfinder 2e Action Data."""
-        return self._fetch_records("data/actions.json", "$.action")
-    
-    @cached_property
-    def spells(self) -> TTRPGRecords:
-        """:TTRPGRecords: Pathfinder 2e Spell Data."""
-        return self._fetch_records("data/spells/", "$.spell")
+    def basic_action_requirements(self) -> pd.DataFrame:
+        """:pd.DataFrame: Basic Action proficiency requirements, one row per (name, source, skill, rank).
 
+        `rank` is the Pathbuilder proficiency value required (0 untrained, 2 trained, ...) and
+        `position` is the Action's position within the Action Data.
+        """
+        actions = self.actions.reset_index()
+        action_types = actions["actionType"] if "actionType" in actions else [None] * len(actions)
+        requirements = [
+            (name, source, skill, utils.static.PROFICIENCY_RANKS[level], position)
+            for position, (name, source, action_type) in enumerate(zip(actions["name"], actions["source"], action_types))
+            if isinstance(action_type, dict) and action_type.get("basic", False)
+            for level, skills in action_type.get("skill", {}).items()
+            for skill in skills
+        ]
+        return pd.DataFrame(requirements, columns=["name", "source", "skill", "rank", "position"])
 
-def main(argv: None | list[str] = None):
-    """Command Line Interface for retreiving entry data."""
-    parser = ArgumentParser(
-        prog="data_auditor",
-        description="Exports a JSON summary of Entry Data."
-    )
-    parser.add_argument("system_source", choices=["dnd5e", "pf2e"])
-    parser.add_argument("record_type")
 
-    args = parser.parse_args(argv)
-    if args.system_source == "dnd5e":
-        data_source = Dnd5eToolsData(utils.get_env_variable("DND_DATA_PATH"))
-    else:
-        data_source = PF2eToolsData(utils.get_env_variable("PATHFINDER_DATA_PATH"))
-    records  = getattr(data_source, args.record_type)
-    print(json.dumps(TTRPGRecords._get_data_summary(records), indent=4))
+class DataRegistry:
+    """Process-wide registry of TTRPGData sources and the memory used by their loaded RecordSets.
+
+    Once loaded RecordSets exceed the memory budget, the least recently used are evicted, and
+    reloaded on next access.
+    """
+
+    def __init__(self, memory_budget: int | None = None):
+        """Initialises a DataRegistry.
+
+        Args:
+            memory_budget (int | None, optional): Approximate bytes of loaded RecordSets to keep. Defaults to None, unlimited.
+        """
+        self.memory_budget = memory_budget
+        self.sources: dict[tuple[type[TTRPGData], Path, bool], TTRPGData] = {}
+        self.stats = Counter({"hits": 0, "loads": 0, "evictions": 0})
+        self._usage: OrderedDict[tuple[int, str], tuple[TTRPGData, int, int]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def get_memory_budget() -> int | None:
+        """Returns the memory budget set by the `TTRPG_DATA_MEMORY_BUDGET_MB` environment variable, in bytes.
+
+        None, for unlimited, if the variable is unset or isn't a positive number of megabytes.
+        """
+        if not (budget := os.environ.get("TTRPG_DATA_MEMORY_BUDGET_MB")):
+            return None
+        try:
+            megabytes = float(budget)
+        except ValueError:
+            megabytes = 0
+        if not 0 < megabytes < float("inf"):
+            logger.warning(f"Ignoring TTRPG_DATA_MEMORY_BUDGET_MB={budget!r}, expected a positive number of megabytes.")
+            return None
+        return int(megabytes * 2**20)
+
+    def get(self, data_cls: type[TTRPGData], source_dir: str, full: bool = False) -> TTRPGData:
+        """Returns the registered data source for the class and directory provided, creating it if needed.
+
+        Args:
+            data_cls (type[TTRPGData]): TTRPGData subclass.
+            source_dir (str): Source Directory containing TTRPG Data.
+            full (bool, optional): Whether the data source loads every field of each record. Defaults to False.
+        """
+        key = (data_cls, Path(source_dir).resolve(), full)
+        with self._lock:
+            if (data_source := self.sources.get(key)) is None:
+                data_source = self.sources[key] = data_cls(source_dir, full=full)
+                data_source.registry = self
+            return data_source
+
+    @staticmethod
+    def get_size(records: TTRPGRecords) -> int:
+        """Returns the approximate memory used by the records provided, in bytes."""
+        return int(records.memory_usage(index=True, deep=True).sum())
+
+    def touch(self, data_source: TTRPGData, name: str, records: TTRPGRecords):
+        """Marks a RecordSet as most recently used, accounting for its memory if newly loaded.
+
+        Args:
+            data_source (TTRPGData): Data source of the RecordSet.
+            name (str): RecordSet name.
+            records (TTRPGRecords): Loaded records.
+        """
+        key = (id(data_source), name)
+        with self._lock:
+            if (usage := self._usage.get(key)) is not None and usage[1] == id(records):
+                self.stats["hits"] += 1
+            else:
+                self.stats["loads"] += 1
+                self._usage[key] = (data_source, id(records), self.get_size(records))
+            self._usage.move_to_end(key)
+            evicted = self._select_evictions()
+        for data_source, name in evicted:
+            data_source.evict(name)
+
+    def _select_evictions(self) -> list[tuple[TTRPGData, str]]:
+        """Removes and returns least recently used RecordSets until within budget, keeping the most recent."""
+        evicted = []
+        if self.memory_budget is None:
+            return evicted
+        while len(self._usage) > 1 and self.size > self.memory_budget:
+            (_, name), (data_source, *_) = self._usage.popitem(last=False)
+            evicted.append((data_source, name))
+            self.stats["evictions"] += 1
+        return evicted
+
+    @property
+    def size(self) -> int:
+        """:int: Approximate memory used by loaded RecordSets, in bytes."""
+        return sum(size for *_, size in self._usage.values())
+
+    def usage(self) -> dict:
+        """Returns a JSON serialisable summary of loaded RecordSets, memory use and hit, load and eviction counts."""
+        with self._lock:
+            return {
+                **self.stats,
+                "bytes": self.size,
+                "memory_budget": self.memory_budget,
+                "record_sets": [
+                    {
+                        "data": type(data_source).__name__,
+                        "path": data_source.as_posix(),
+                        "record_type": name,
+                        "bytes": size,
+                    }
+                    for (_, name), (data_source, _, size) in reversed(self._usage.items())
+                ],
+            }
+
+
+REGISTRY = DataRegistry(memory_budget=DataRegistry.get_memory_budget())
+
+
+def main(argv: None | list[str] = None):
+    """Command Line Interface for retreiving entry data, see `auditor.main`."""
+    from auditor import main as audit_main
+    audit_main(argv)
 
     
 if __name__ == "__main__":
     main()
-
@@ -17,4 +17,32 @@ def word_list(*words: str, sep=",", join="and"):
         case [a, b]:
             return " ".join([a, join, b])
         case [*ws, a, b]:
-            return "{} {}".format(f"{sep} ".join(ws), word_list(a, b, join=join))
\ No newline at end of file
+            return "{} {}".format(f"{sep} ".join(ws), word_list(a, b, join=join))
+
+def challenge_rating(cr: str | dict) -> float | None:
+    match cr:
+        case {"cr": rating}:
+            return challenge_rating(rating)
+        case str() if "/" in cr:
+            numerator, denominator = cr.split("/")
+            return int(numerator) / int(denominator)
+        case _:
+            try:
+                return float(cr)
+            except (TypeError, ValueError):
+                return None
+
+def shard(shard: str) -> tuple[int, int]:
+    index, shards = map(int, shard.split("/"))
+    if not 1 <= index <= shards:
+        raise ValueError(f"Shard {shard} must be formatted `I/N`, with I from 1 to N.")
+    return index, shards
+
+def creature_type(creature: str | dict) -> str | list[str]:
+    match creature:
+        case {"type": {"choose": [*types]}}:
+            return types
+        case {"type": str(type)}:
+            return type
+        case _:
+            return creature
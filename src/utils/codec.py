@@ -0,0 +1,76 @@
+"""Implements JSON encoding and decoding through the fastest installed backend.
+
+orjson is preferred, then msgspec, then the standard library. Every backend reads and writes
+UTF-8 bytes, so files needn't be decoded before parsing, and produces the same JSON. Compact
+JSON leaves non-ASCII characters unescaped. Indented JSON, i.e. printed decks and reports, is
+always written by the standard library with 4 space indentation and ASCII escaping, so it's
+unchanged whichever backend is installed.
+"""
+import json
+import sys
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKENDS: tuple[str, ...] = tuple(
+    name for name, module in (("orjson", orjson), ("msgspec", msgspec), ("json", json)) if module is not None
+)
+"""Names of the installed backends, fastest first."""
+
+BACKEND: str = BACKENDS[0]
+"""Name of the backend used by default."""
+
+
+def loads(data: bytes | str, backend: str | None = None) -> Any:
+    """Parses JSON data.
+
+    Args:
+        data (bytes | str): UTF-8 encoded JSON data, or a JSON string.
+        backend (str | None, optional): Backend name, see `BACKENDS`. Defaults to None, `BACKEND`.
+    """
+    match backend or BACKEND:
+        case "orjson":
+            return orjson.loads(data)
+        case "msgspec":
+            return msgspec.json.decode(data)
+        case _:
+            return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, backend: str | None = None) -> bytes:
+    """Serialises an object to UTF-8 encoded JSON.
+
+    Objects a faster backend can't serialise, e.g. with non-string keys, fall back to the standard library.
+
+    Args:
+        obj (Any): JSON serialisable object.
+        indent (bool, optional): Whether to indent the output by 4 spaces, escaping non-ASCII characters,
+            through the standard library. Defaults to False.
+        backend (str | None, optional): Backend name, see `BACKENDS`. Defaults to None, `BACKEND`.
+    """
+    if indent:
+        return json.dumps(obj, indent=4).encode()
+    try:
+        match backend or BACKEND:
+            case "orjson":
+                return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+            case "msgspec":
+                return msgspec.json.encode(obj)
+    except TypeError:
+        pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def echo(data: bytes):
+    """Writes serialised JSON to stdout, followed by a newline, like `print`."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data + b"\n")
+    sys.stdout.buffer.flush()
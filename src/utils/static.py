@@ -1,5 +1,6 @@
 SOURCES: list[str] = ["PC1", "CRB", "APG", "LOME"]
 PROFICIENCY_LEVELS: list[str] = ["untrained", "trained", "expert", "master", "legendary"]
+PROFICIENCY_RANKS: dict[str, int] = {level: rank * 2 for rank, level in enumerate(PROFICIENCY_LEVELS)}
 SCHOOL_MAPPING = {
 	"C": "conjuration",
 	"A": "abjuration",
@@ -9,4 +10,32 @@ SCHOOL_MAPPING = {
     "I": "illusion",
     "N": "necromancy",
     "T": "transmutation"
-}
\ No newline at end of file
+}
+SIZE_MAPPING = {
+    "T": "tiny",
+    "S": "small",
+    "M": "medium",
+    "L": "large",
+    "H": "huge",
+    "G": "gargantuan"
+}
+ALIGNMENT_MAPPING = {
+    "L": "lawful",
+    "N": "neutral",
+    "NX": "neutral",
+    "NY": "neutral",
+    "C": "chaotic",
+    "G": "good",
+    "E": "evil",
+    "U": "unaligned",
+    "A": "any alignment"
+}
+ABILITIES: list[str] = ["str", "dex", "con", "int", "wis", "cha"]
+ATTACK_TYPES = {
+    "mw": "Melee Weapon Attack",
+    "rw": "Ranged Weapon Attack",
+    "mw,rw": "Melee or Ranged Weapon Attack",
+    "ms": "Melee Spell Attack",
+    "rs": "Ranged Spell Attack",
+    "ms,rs": "Melee or Ranged Spell Attack"
+}
@@ -0,0 +1,35 @@
+import json
+
+from auditor import audit, audit_file, iter_entries
+from pathfinder2e.card import Card
+
+
+ENTRIES = [
+    "Plain {@spell fireball} text.",
+    {"type": "entries", "name": "Nested", "entries": ["Deep {@condition blinded}.", {"type": "list", "items": ["a", "b"]}]},
+    {"type": "successDegree", "entries": {"Success": "Nothing."}},
+    {"type": "unknownThing", "entries": []},
+]
+
+
+def test_iter_entries_is_depth_first():
+    types = [entry if isinstance(entry, str) else entry["type"] for entry in iter_entries(ENTRIES)]
+    assert types == [
+        "Plain {@spell fireball} text.", "entries", "Deep {@condition blinded}.", "list", "a", "b",
+        "successDegree", "Nothing.", "unknownThing"
+    ]
+
+
+def test_audit_reports_unsupported_entries(tmp_path):
+    for i in range(2):
+        (tmp_path / f"spells-{i}.json").write_text(json.dumps({"spell": [{"name": f"Spell {i}", "entries": ENTRIES}]}))
+    files = sorted(tmp_path.glob("*.json"))
+
+    assert audit_file(files[0], "$.spell")["tags"] == {"spell": 1, "condition": 1}
+
+    summary = audit(files, "$.spell", Card, workers=1)
+    assert summary["records"] == 2
+    assert summary["entry_types"]["entries"] == 2
+    assert summary["tags"] == {"spell": 2, "condition": 2}
+    assert [*summary["unsupported"]] == ["unknownThing"]
+    assert summary["unsupported"]["unknownThing"]["count"] == 2
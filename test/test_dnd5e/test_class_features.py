@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from dnd5e import DnDBeyond
+from records import Dnd5eToolsData, TTRPGRecords
+
+FEATURES = [
+    {"name": "Arcane Recovery", "source": "PHB", "className": "Wizard", "classSource": "PHB", "level": 1, "entries": ["Regain."]},
+    {"name": "Arcane Recovery", "source": "XPHB", "className": "Wizard", "classSource": "XPHB", "level": 1, "entries": ["Regain more."]},
+    {"name": "Extra Attack", "source": "PHB", "className": "Fighter", "classSource": "PHB", "level": 5, "entries": ["Attack twice."]},
+    {"name": "Extra Attack", "source": "PHB", "className": "Paladin", "classSource": "PHB", "level": 5, "entries": ["Attack twice."]},
+]
+SUBCLASS_FEATURES = [
+    {
+        "name": "Evocation Savant", "source": "PHB", "className": "Wizard", "classSource": "PHB",
+        "subclassShortName": "Evocation", "level": 2, "entries": ["Savant."],
+    },
+    {
+        "name": "Bonus Proficiency", "source": "PHB", "className": "Cleric", "classSource": "PHB",
+        "subclassShortName": "Life", "level": 1, "entries": ["Heavy armor."],
+    },
+    {
+        "name": "Bonus Proficiency", "source": "PHB", "className": "Cleric", "classSource": "PHB",
+        "subclassShortName": "Light", "level": 1, "entries": ["Light cantrip."],
+    },
+]
+
+
+def ddb_class(
+    name: str,
+    level: int,
+    features: list[tuple[str, int]],
+    subclass_features: list[tuple[str, int]] = (),
+    subclass: str = "Subclass",
+):
+    as_features = lambda features: [{"definition": {"name": name, "requiredLevel": level}} for name, level in features]
+    return {
+        "level": level,
+        "definition": {"name": name},
+        "classFeatures": as_features(features),
+        "subclassDefinition": {"name": subclass, "classFeatures": as_features(subclass_features)},
+    }
+
+
+@pytest.fixture
+def data_source(tmp_path):
+    (tmp_path / "data" / "class").mkdir(parents=True)
+    (tmp_path / "data" / "class" / "class-test.json").write_text(
+        json.dumps({"classFeature": FEATURES, "subclassFeature": SUBCLASS_FEATURES})
+    )
+    return Dnd5eToolsData(tmp_path)
+
+
+@pytest.fixture
+def build():
+    return DnDBeyond({
+        "classes": [
+            ddb_class(
+                "Wizard", 3, [("Arcane Recovery", 1), ("Arcane Tradition", 2)], [("Evocation Savant", 2), ("Overchannel", 14)],
+                subclass="School of Evocation",
+            ),
+            ddb_class("Fighter", 5, [("Extra Attack", 5)]),
+        ],
+        "classSpells": [],
+        "spells": {},
+        "inventory": [],
+        "feats": [],
+    })
+
+
+def test_class_features(build):
+    assert build.class_features[["name", "className", "level"]].values.tolist() == [
+        ["Arcane Recovery", "Wizard", 1],
+        ["Arcane Tradition", "Wizard", 2],
+        ["Evocation Savant", "Wizard", 2],
+        ["Extra Attack", "Fighter", 5],
+    ]
+    assert build.class_features["subclass"].fillna("").tolist() == ["", "", "School of Evocation", ""]
+
+
+@pytest.mark.parametrize(
+    argnames=("sources", "expected_sources"),
+    argvalues=[((), ["PHB", "PHB", "PHB"]), (("XPHB",), ["XPHB", "PHB", "PHB"])]
+)
+def test_eligible_class_features(build, data_source, sources, expected_sources):
+    positions = build.eligible_class_features(data_source.class_feature_keys, sources)
+    records = [data_source.class_features.record_at(position) for position in positions]
+    assert [(record["name"], record["className"]) for record in records] == [
+        ("Arcane Recovery", "Wizard"), ("Evocation Savant", "Wizard"), ("Extra Attack", "Fighter")
+    ]
+    assert [record["source"] for record in records] == expected_sources
+
+
+@pytest.mark.parametrize(argnames="subclass", argvalues=["Life Domain", "Light Domain"])
+def test_eligible_subclass_features_match_subclass(data_source, subclass):
+    build = DnDBeyond({
+        "classes": [ddb_class("Cleric", 1, [], [("Bonus Proficiency", 1)], subclass=subclass)],
+        "classSpells": [],
+        "spells": {},
+        "inventory": [],
+        "feats": [],
+    })
+    records = [
+        data_source.class_features.record_at(position)
+        for position in build.eligible_class_features(data_source.class_feature_keys)
+    ]
+    assert [record["subclassShortName"] for record in records] == [subclass.split()[0]]
+    assert not DnDBeyond.is_subclass("Twilight Domain", "Light")
+    assert not DnDBeyond.is_subclass(None, "Light")
+
+
+def test_class_feature_keys_invalidated(data_source):
+    assert len(data_source.class_feature_keys) == len(FEATURES) + len(SUBCLASS_FEATURES)
+    data_source.evict("class_features")
+    assert "class_feature_keys" not in data_source.__dict__
+
+
+def test_load_prewarms_needed_records(data_source, build, tmp_path, monkeypatch):
+    prewarmed = []
+    monkeypatch.setattr(data_source, "prewarm", lambda *names: prewarmed.append(names))
+    monkeypatch.setattr(DnDBeyond, "from_json", classmethod(lambda cls, _: prewarmed.append("fetch") or build))
+    json_path = tmp_path / "build.json"
+    json_path.write_text("{}")
+
+    DnDBeyond.load(json_path, None, data_source, eager=("class_features",), needed=("class_features", "feats", "items"))
+    assert prewarmed == [("class_features",), "fetch"]
+    assert build.record_types == ["class_features"]
+
+    with pytest.raises(ValueError):
+        DnDBeyond.load(None, None, data_source)
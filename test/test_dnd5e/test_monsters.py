@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from dnd5e.card import MonsterCard
+from formatting import render_cards
+from records import Dnd5eToolsData
+import utils
+
+GOBLIN = {
+    "name": "Goblin",
+    "source": "MM",
+    "size": ["S"],
+    "type": {"type": "humanoid", "tags": ["goblinoid"]},
+    "alignment": ["N", "E"],
+    "ac": [{"ac": 15, "from": ["leather armor", "shield"]}],
+    "hp": {"average": 7, "formula": "2d6"},
+    "speed": {"walk": 30},
+    "str": 8, "dex": 14, "con": 10, "int": 10, "wis": 8, "cha": 8,
+    "passive": 9,
+    "languages": ["Common", "Goblin"],
+    "cr": "1/4",
+    "action": [{"name": "Scimitar", "entries": ["{@atk mw} {@hit 4} to hit. {@h}5 ({@damage 1d6 + 2}) slashing damage."]}],
+    "environment": ["forest"],
+}
+DRAGON = {
+    "name": "Adult Red Dragon", "source": "MM", "size": ["H"], "type": "dragon", "alignment": ["C", "E"],
+    "cr": {"cr": "17", "lair": "18"}, "environment": ["mountain"], "action": [{"name": "Bite", "entries": ["Big bite."]}],
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "data" / "beastiary").mkdir(parents=True)
+    (tmp_path / "data" / "beastiary" / "bestiary-mm.json").write_text(json.dumps({"monster": [GOBLIN, DRAGON]}))
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    argnames=("cr", "expected"),
+    argvalues=[("1/4", 0.25), ("17", 17.0), ({"cr": "1/2", "lair": "1"}, 0.5), ("Unknown", None)]
+)
+def test_challenge_rating(cr, expected):
+    assert utils.challenge_rating(cr) == expected
+
+
+@pytest.mark.parametrize(
+    argnames=("criteria", "expected"),
+    argvalues=[
+        ({"cr": slice(0, 1)}, ["Goblin"]),
+        ({"type": "dragon"}, ["Adult Red Dragon"]),
+        ({"environment": {"forest", "mountain"}, "cr": slice(10, None)}, ["Adult Red Dragon"]),
+    ]
+)
+def test_select_monsters(data_dir, criteria, expected):
+    monsters = Dnd5eToolsData(data_dir).monsters
+    assert {"cr", "type", "environment"} <= monsters.attribute_indexes.keys()
+    assert [record["name"] for record in monsters.select(**criteria)] == expected
+
+
+def test_monster_card():
+    card = MonsterCard(GOBLIN)
+    assert card.header[:3] == ["subtitle | Small humanoid (goblinoid), neutral evil", "rule", "property | Armor Class | 15 (leather armor, shield)"]
+    assert "dndstats | 8 | 14 | 10 | 10 | 8 | 8" in card.header
+    assert card.body == ["section | Actions", "property | Scimitar | <i>Melee Weapon Attack:</i> +4 to hit. <i>Hit:</i> 5 (1d6 + 2) slashing damage."]
+    assert card.tags == ["monster", "humanoid"]
+
+
+def test_parallel_render_matches_sequential():
+    cards = [MonsterCard(GOBLIN), MonsterCard(DRAGON)]
+    sequential = render_cards(cards, height=20, width=40, card_params={})
+    parallel = render_cards(cards, height=20, width=40, card_params={}, workers=2)
+    assert parallel == sequential
+    assert parallel[0][0].params is sequential[0][0].params
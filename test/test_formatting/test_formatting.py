@@ -0,0 +1,192 @@
+from collections import OrderedDict
+import math
+import pickle
+
+import pytest
+
+import formatting
+from formatting import CardData, CardFace, CardPage, entry_handler, estimate_deck, export_deck, merge_shards
+from records import TTRPGRecords
+from pathfinder2e.card import Card, SpellCard
+
+
+def test_handle_entry_dispatch():
+	assert Card.handle_entry("Some text.") == ["text | Some text."]
+	assert Card.handle_entry({"type": "list", "items": ["Title", "a"]}) == ["text | Title", "bullet | a"]
+	assert Card.handle_entry({"type": "successDegree", "entries": {"Success": "Nothing."}}) == ["property | Success | Nothing."]
+	assert Card.handle_entry({"type": "pf2-h3", "name": "Heading", "entries": []}) == []
+	assert "pf2-h3" in Card.entry_handlers
+	with pytest.raises(ValueError):
+		Card.handle_entry({"type": "unknownThing"})
+
+
+def test_subclass_handlers_do_not_leak_to_parent():
+	assert Card.supports_entry("successDegree")
+	assert not CardData.supports_entry("successDegree")
+
+
+def test_registered_entries_propagate_to_subclasses():
+	CardData.register_entry("plugin", lambda cls, entry: [f"text | {cls.__name__}"])
+	try:
+		assert SpellCard.handle_entry({"type": "plugin"}) == ["text | SpellCard"]
+	finally:
+		del CardData.entry_handlers["plugin"]
+
+
+def test_entry_handler_overrides():
+	class CustomCard(Card):
+
+		@entry_handler("table")
+		def _table_entry(cls, entry):
+			return ["text | custom table"]
+
+	assert CustomCard.handle_entry({"type": "table"}) == ["text | custom table"]
+	assert Card.handle_entry({"type": "table"}) == ["text | <b> See source table </b>"]
+
+
+def test_collapse_duplicates():
+	params = CardFace.intern_params({"count": 1, "icon": None, "tags": []})
+	front = CardFace(params, "Heal", ["text | a"])
+	other = CardFace(CardFace.intern_params({"count": "2"}), "Shield", ["text | b"])
+	collapsed = CardPage.collapse_duplicates([(front, CardFace(params)), (other, other), (front, CardFace(params))])
+	assert [[face.to_dict() for face in pair] for pair in collapsed] == [
+		[{"title": "Heal", "contents": ["text | a"], "count": 2, "icon": None, "tags": []}, {"count": 2, "icon": None, "tags": []}],
+		[{"title": "Shield", "contents": ["text | b"], "count": "2"}] * 2,
+	]
+	assert params["count"] == 1
+
+
+def test_intern_params(monkeypatch):
+	assert CardFace.intern_params({"count": 1, "tags": ["a"]}) is CardFace.intern_params({"count": 1, "tags": ["a"]})
+	assert CardFace.intern_params({"count": True}) is not CardFace.intern_params({"count": 1})
+
+	monkeypatch.setattr(CardFace, "interned", OrderedDict())
+	monkeypatch.setattr(formatting, "INTERNED_PARAMS", 2)
+	first = CardFace.intern_params({"count": 1})
+	CardFace.intern_params({"count": 2})
+	CardFace.intern_params({"count": 1})
+	CardFace.intern_params({"count": 3})
+	assert len(CardFace.interned) == 2
+	assert CardFace.intern_params({"count": 1}) is first
+
+
+def test_pages_from_pairs():
+	params = CardFace.intern_params({"count": 1})
+	pairs = [(CardFace(params, f"{i}", []), CardFace(params, f"{i} back", [])) for i in range(5)]
+	front, back, next_front, next_back = CardPage.from_pairs(pairs, height=2, width=2)
+	assert [card.get("title") for card in front.export()] == ["0", "1", "2", "3"]
+	assert [card.get("title") for card in back.export()] == ["1 back", "0 back", "3 back", "2 back"]
+	assert next_front.export() == [{"title": "4", "contents": [], "count": 1}, {}, {}, {}]
+	assert next_back.export() == [{}, {"title": "4 back", "contents": [], "count": 1}, {}, {}]
+
+
+@pytest.mark.parametrize("width", [8, 20, 33, 57])
+def test_block_heights_match_scalar(width):
+	lines = [
+		"text | A short line.",
+		"text | " + " ".join(["word"] * 40),
+		"property | Range | 30 feet, a supercalifragilisticexpialidocious distance",
+		"bullet | Some bulleted text that wraps around more than once at small widths.",
+		"p2e_activity | Cast | 2 | A verbose activity that goes on and on.",
+		"rule",
+		"boxes | 3 | 2.5",
+		"p2e_trait | uncommon | rare",
+		"p2e_end_trait_section",
+		"subtitle | Level 1",
+	]
+	assert Card.get_block_heights(lines, width=width).tolist() == [Card.get_block_height(line, width=width) for line in lines]
+	assert Card.get_block_heights([], width=width).tolist() == []
+
+
+class NoteCard(CardData):
+
+	@property
+	def header(self):
+		return ["text | A note."]
+
+
+def test_estimate_card_counts_match_splits():
+	cards = [NoteCard({"name": f"Note {n}", "entries": ["Lorem ipsum dolor sit amet."] * n}) for n in (1, 5, 12, 30)]
+	header, body = CardData.measure(cards, width=30)
+	estimates = CardData.estimate_card_counts(header, body, height=12).tolist()
+	assert estimates == [math.ceil(len(card.split_body(height=12, width=30)) / 2) for card in cards]
+	assert estimate_deck(CardData.estimate_card_counts(header, body, height=12), page_layout=(2, 2)) == {
+		"records": 4, "unmeasured": 0, "cards": sum(estimates), "pages": 2 * math.ceil(sum(estimates) / 4)
+	}
+
+
+def test_size_index_is_cached_with_records():
+	records = TTRPGRecords(
+		[{"name": "Short", "source": "A", "entries": ["Text."]}, {"name": "Broken", "source": "A"}],
+		index=["name", "source"]
+	)
+	size_index = NoteCard.get_size_index(records, width=30)
+	assert NoteCard.get_size_index(records, width=30) is size_index
+	assert size_index.loc[("Short", "A"), "header"] == CardData.get_block_height("text | A note.", width=30)
+	assert math.isnan(size_index.loc[("Broken", "A"), "body"])
+
+
+def test_sizes_are_looked_up_by_record_position():
+	records = TTRPGRecords(
+		[{"name": f"Note {n}", "source": "A", "entries": ["Lorem ipsum dolor sit amet."] * n} for n in (1, 5, 12)],
+		index=["name", "source"]
+	)
+	cards = [
+		NoteCard.from_records(records, 2),
+		NoteCard.from_records(records, 0, name="Note (Wizard)"),
+		NoteCard({"name": "Loose", "entries": ["Text."]}),
+	]
+	header, body = CardData.get_sizes(cards, width=30)
+	assert records.size_indexes[(NoteCard, 30)]["measured"].tolist() == [True, False, True]
+	expected = CardData.measure([NoteCard(records.record_at(2)), NoteCard(records.record_at(0)), cards[2]], width=30)
+	assert header.tolist() == expected[0].tolist()
+	assert body.tolist() == expected[1].tolist()
+	assert pickle.loads(pickle.dumps(cards[0])).origin is None
+
+
+def test_from_overlay_leaves_record_untouched():
+	record = {"name": "Note", "entries": ["Text."]}
+	card = NoteCard.from_overlay(record, card_params={"count": 2}, name="Note (Wizard)")
+	card["extra"] = True
+	assert card.name == "Note (Wizard)"
+	assert card["entries"] == ["Text."]
+	assert record == {"name": "Note", "entries": ["Text."]}
+	(front, back), = card.get_card_pairs(height=20, width=30)
+	assert front.title == "Note (Wizard)"
+	assert front.params["count"] == back.params["count"] == 2
+	assert NoteCard(record).overlay_params == {}
+
+
+def test_projection_is_read_by_cards():
+	records = TTRPGRecords(
+		[
+			{"name": "Shard", "source": "PC1", "level": 1, "cast": {"number": 2, "unit": "action"}, "range": {"number": 30, "unit": "feet"}},
+			{"name": "Odd", "source": "PC1", "level": 1, "cast": {"number": 1, "unit": "action"}, "savingThrow": {"type": ["Q"]}},
+		],
+		index=["name", "source"]
+	)
+	projection = SpellCard.get_projection(records)
+	assert SpellCard.get_projection(records) is projection
+	assert {"spell_cast", "spell_range", "saving_throw", "heightened"} <= {*SpellCard.projected_properties()}
+	assert projection["projected"].tolist() == [True, False]
+
+	card = SpellCard.from_records(records, 0)
+	assert card.projection is not None
+	assert card.spell_range == SpellCard(records.record_at(0)).spell_range == "30 feet"
+	assert SpellCard.from_records(records, 1).projection is None
+	with pytest.raises(ValueError):
+		SpellCard.from_records(records, 1).saving_throw
+
+
+def test_merged_shards_match_single_export():
+	cards = [
+		NoteCard({"name": f"Note {i % 7}", "source": f"S{i % 3}", "entries": ["Text. " * (i * 20)]})
+		for i in range(12)
+	]
+	layouts = ({}, (3, 2), (20, 30))
+	shards = [export_deck(cards, *layouts, shard=(i, 3)) for i in (3, 1, 2)]
+	assert sorted(len(shard["pairs"]) for shard in shards) != [0, 0, 12]
+	assert merge_shards(shards, (3, 2)) == export_deck(cards, *layouts)
+	assert export_deck(cards, *layouts, shard=(2, 3)) == shards[2]
+	with pytest.raises(ValueError):
+		merge_shards(shards[:2], (3, 2))
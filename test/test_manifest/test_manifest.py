@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from dnd5e.card import MagicItemCard
+from manifest import Manifest
+from records import Dnd5eToolsData
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "homebrew").mkdir()
+    (tmp_path / "homebrew" / "hats.json").write_text(json.dumps({"item": [{"name": "Cool Hat", "source": "HB", "entries": ["A hat."]}]}))
+    return tmp_path
+
+
+def open_manifest(path, data_source):
+    return Manifest.open(path, data_source, ["homebrew_items"], card_params={}, card_layout=(20, 40))
+
+
+def render(manifest, data_source, names):
+    cards = []
+    for name in names:
+        try:
+            cards.append(manifest.card(f"MagicItemCard:{name}", lambda: MagicItemCard(data_source.homebrew_items.query_record(name))))
+        except KeyError:
+            continue
+    pairs = [[face.to_dict() for face in pair] for card in cards for pair in card.get_card_pairs(height=20, width=40)]
+    manifest.save()
+    return pairs
+
+
+def test_manifest_reuses_cards_without_loading(data_dir, tmp_path):
+    path = tmp_path / "manifest.json"
+    expected = render(open_manifest(path, Dnd5eToolsData(data_dir)), Dnd5eToolsData(data_dir), ["Cool Hat", "Missing"])
+    assert json.loads(path.read_text())["cards"]["MagicItemCard:Missing"] is None
+
+    data_source = Dnd5eToolsData(data_dir)
+    assert render(open_manifest(path, data_source), data_source, ["Cool Hat", "Missing"]) == expected
+    assert data_source.loaded == []
+
+
+def test_manifest_is_discarded_when_data_changes(data_dir, tmp_path):
+    path = tmp_path / "manifest.json"
+    render(open_manifest(path, Dnd5eToolsData(data_dir)), Dnd5eToolsData(data_dir), ["Cool Hat"])
+
+    (data_dir / "homebrew" / "boots.json").write_text(json.dumps({"item": [{"name": "Boots", "source": "HB", "entries": []}]}))
+    data_source = Dnd5eToolsData(data_dir)
+    manifest = open_manifest(path, data_source)
+    assert manifest.cached == {}
+    render(manifest, data_source, ["Cool Hat"])
+    assert data_source.loaded == ["homebrew_items"]
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from pathfinder2e import Pathbuilder
+
+
+ACTIONS = [
+	{"name": "Strike", "source": "PC1", "actionType": {"basic": True, "skill": {"untrained": ["athletics"]}}},
+	{"name": "Treat Wounds", "source": "PC1", "actionType": {"basic": True, "skill": {"trained": ["medicine"]}}},
+	{"name": "Battle Medicine", "source": "PC2", "actionType": {"basic": True, "skill": {"expert": ["medicine"]}}},
+	{"name": "Tumble", "source": "PC1", "actionType": {"basic": True, "skill": {"trained": ["acrobatics", "athletics"]}}},
+	{"name": "Aid", "source": "CRB", "actionType": {"basic": True, "skill": {"trained": ["athletics"]}}},
+]
+
+REQUIREMENTS = pd.DataFrame(
+	[
+		("Strike", "PC1", "athletics", 0, 0),
+		("Treat Wounds", "PC1", "medicine", 2, 1),
+		("Battle Medicine", "PC2", "medicine", 4, 2),
+		("Tumble", "PC1", "acrobatics", 2, 3),
+		("Tumble", "PC1", "athletics", 2, 3),
+		("Aid", "CRB", "athletics", 2, 4),
+	],
+	columns=["name", "source", "skill", "rank", "position"]
+)
+
+
+@pytest.mark.parametrize(
+	argnames="proficiencies",
+	argvalues=[
+		{},
+		{"athletics": 2},
+		{"medicine": 2, "acrobatics": 4},
+		{"medicine": 4, "athletics": 8},
+	]
+)
+def test_eligible_basic_actions_matches_meets_requirements(proficiencies):
+	build = Pathbuilder({"proficiencies": proficiencies})
+	expected = [
+		(action["name"], action["source"])
+		for source in ["PC1", "PC2"]
+		for action in ACTIONS
+		if action["source"] == source and build.meets_requirements(action)
+	]
+	assert [*build.eligible_basic_actions(REQUIREMENTS, ["PC1", "PC2"])] == expected
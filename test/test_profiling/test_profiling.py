@@ -0,0 +1,56 @@
+import tracemalloc
+
+import pytest
+
+from profiling import Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.stage("load"):
+        profiler.count("files")
+        profiler.hit("query", True)
+    assert profiler.report() == {"stages": {}, "counters": {}, "caches": {}}
+
+
+def test_stage_timings_accumulate():
+    profiler = Profiler()
+    profiler.start(trace_memory=False)
+    for _ in range(3):
+        with profiler.stage("render"):
+            profiler.records("render", 2)
+    profiler.stop()
+    stages = profiler.report()["stages"]
+    assert stages["render"]["calls"] == 3
+    assert stages["render"]["records"] == 6
+    assert stages["render"]["wall"] >= 0
+
+
+def test_cache_hit_rate():
+    profiler = Profiler()
+    profiler.start(trace_memory=False)
+    for hit in [True, True, True, False]:
+        profiler.hit("query", hit)
+    assert profiler.report()["caches"]["query"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+
+
+def test_dump_stats_requires_profile(tmp_path):
+    profiler = Profiler()
+    profiler.start(trace_memory=False)
+    with pytest.raises(ValueError):
+        profiler.dump_stats(tmp_path / "run.prof")
+
+
+def test_memory_tracing_is_opt_in():
+    profiler = Profiler()
+    profiler.start()
+    assert not tracemalloc.is_tracing()
+    profiler.stop()
+    assert "peak_memory_bytes" not in profiler.report()
+
+    profiler.start(trace_memory=True)
+    assert tracemalloc.is_tracing()
+    allocated = [0] * 1000
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+    assert profiler.report()["peak_memory_bytes"] >= len(allocated)
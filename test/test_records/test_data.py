@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+
+import pytest
+
+from records import DataRegistry, Dnd5eToolsData
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "homebrew").mkdir()
+    (tmp_path / "homebrew" / "hats.json").write_text(json.dumps({"item": [{"name": "Cool Hat", "source": "HB"}]}))
+    return tmp_path
+
+
+def test_record_sets_load_lazily(data_dir):
+    data_source = Dnd5eToolsData(data_dir)
+    assert data_source.loaded == []
+    assert [*data_source.homebrew_items.index] == [("Cool Hat", "HB")]
+    assert data_source.loaded == ["homebrew_items"]
+
+
+def test_refresh_patches_changed_files(data_dir):
+    data_source = Dnd5eToolsData(data_dir)
+    notified = []
+    data_source.subscribe(lambda name, records: notified.append((name, len(records))))
+    data_source.homebrew_items
+
+    (data_dir / "homebrew" / "boots.json").write_text(json.dumps({"item": [{"name": "Boots", "source": "HB"}]}))
+    changes = data_source.refresh()
+    assert changes["homebrew_items"]["added"] == [data_dir / "homebrew" / "boots.json"]
+    assert sorted(data_source.homebrew_items.index) == [("Boots", "HB"), ("Cool Hat", "HB")]
+
+    (data_dir / "homebrew" / "hats.json").unlink()
+    data_source.refresh()
+    assert [*data_source.homebrew_items.index] == [("Boots", "HB")]
+    assert notified == [("homebrew_items", 2), ("homebrew_items", 1)]
+    assert data_source.refresh() == {}
+
+
+def test_concurrent_access_loads_once(data_dir, monkeypatch):
+    loads = []
+    fetch = Dnd5eToolsData._fetch_record_set
+
+    def slow_fetch(self, record_set):
+        loads.append(record_set.name)
+        time.sleep(0.05)
+        return fetch(self, record_set)
+
+    monkeypatch.setattr(Dnd5eToolsData, "_fetch_record_set", slow_fetch)
+    data_source = Dnd5eToolsData(data_dir)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = [*executor.map(lambda _: data_source.homebrew_items, range(8))]
+    assert loads == ["homebrew_items"]
+    assert all(records is results[0] for records in results)
+
+
+def test_prewarm(data_dir):
+    data_source = Dnd5eToolsData(data_dir)
+    future, = data_source.prewarm("homebrew_items")
+    assert future.result() is data_source.homebrew_items
+    with pytest.raises(ValueError):
+        data_source.prewarm("bogus")
+
+
+def test_registry_evicts_least_recently_used(data_dir):
+    (data_dir / "data").mkdir()
+    (data_dir / "data" / "feats.json").write_text(json.dumps({"feat": [{"name": "Alert", "source": "PHB"}]}))
+    registry = DataRegistry()
+    data_source = registry.get(Dnd5eToolsData, data_dir)
+    assert registry.get(Dnd5eToolsData, data_dir) is data_source
+
+    data_source.homebrew_items
+    data_source.feats
+    data_source.homebrew_items
+    assert registry.usage()["loads"] == 2
+    assert registry.usage()["hits"] == 1
+
+    registry.memory_budget = registry.usage()["bytes"] - 1
+    data_source.homebrew_items
+    assert data_source.loaded == ["homebrew_items"]
+    data_source.feats
+    assert data_source.loaded == ["feats"]
+    assert registry.usage()["evictions"] == 2
+    assert [record_set["record_type"] for record_set in registry.usage()["record_sets"]] == ["feats"]
+
+
+def test_record_sets_prune_unused_fields(data_dir):
+    (data_dir / "homebrew" / "cloaks.json").write_text(json.dumps({"item": [
+        {"name": "Cloak", "source": "HB", "rarity": "rare", "entries": ["Warm."], "page": 12, "fluff": {"images": []}}
+    ]}))
+    pruned = Dnd5eToolsData(data_dir).homebrew_items
+    assert {"rarity", "entries"} <= {*pruned.columns}
+    assert not {"page", "fluff"} & {*pruned.columns}
+
+    full = Dnd5eToolsData(data_dir, full=True).homebrew_items
+    assert {"page", "fluff"} <= {*full.columns}
+    registry = DataRegistry()
+    assert registry.get(Dnd5eToolsData, data_dir, full=True) is not registry.get(Dnd5eToolsData, data_dir)
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "gztar"])
+def test_archive_data_sources(data_dir, tmp_path_factory, archive_format):
+    (data_dir / "data").mkdir()
+    with gzip.open(data_dir / "data" / "feats.json.gz", "wt") as feats:
+        json.dump({"feat": [{"name": "Alert", "source": "PHB"}]}, feats)
+    archive = shutil.make_archive(
+        tmp_path_factory.mktemp("archives") / "5etools", archive_format, root_dir=data_dir.parent, base_dir=data_dir.name
+    )
+
+    data_source = Dnd5eToolsData(archive)
+    assert [*data_source.feats.index] == [("Alert", "PHB")]
+    assert [*data_source.homebrew_items.index] == [("Cool Hat", "HB")]
+    with pytest.raises(FileNotFoundError):
+        data_source.monsters
+
+
+def write_reproducible_archive(path, archive_format, feat):
+    """Writes an archive of a feats file, with fixed member and archive modification times."""
+    content = json.dumps({"feat": [{"name": feat, "source": "PHB"}]}).encode()
+    if archive_format == "zip":
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr(zipfile.ZipInfo("data/feats.json", date_time=(1980, 1, 1, 0, 0, 0)), content)
+    else:
+        with tarfile.open(path, "w:gz") as archive:
+            info = tarfile.TarInfo("data/feats.json")
+            info.size, info.mtime = len(content), 0
+            archive.addfile(info, io.BytesIO(content))
+    os.utime(path, ns=(0, 0))
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+def test_rebuilt_archive_changes_fingerprint(tmp_path, archive_format):
+    path = tmp_path / f"5etools.{archive_format}"
+    write_reproducible_archive(path, archive_format, "Alert")
+    data_source = Dnd5eToolsData(path)
+    assert [*data_source.feats.index] == [("Alert", "PHB")]
+    fingerprint = data_source.fingerprint("feats")
+
+    write_reproducible_archive(path, archive_format, "Lucky")
+    assert data_source.fingerprint("feats") != fingerprint
+    assert [*data_source.refresh()] == ["feats"]
+    assert [*data_source.feats.index] == [("Lucky", "PHB")]
+
+
+def test_tar_members_checksummed_when_used(tmp_path):
+    path = tmp_path / "5etools.tar.gz"
+    write_reproducible_archive(path, "tar.gz", "Alert")
+    data_source = Dnd5eToolsData(path)
+    assert data_source.archive.files["data/feats.json"].checksum is None
+
+    data_source.fingerprint("feats")
+    assert data_source.archive.files["data/feats.json"].checksum is not None
+    with data_source.archive.open("data/feats.json") as stream:
+        assert not isinstance(stream, io.BytesIO)
+        assert json.load(stream) == {"feat": [{"name": "Alert", "source": "PHB"}]}
+
+
+@pytest.mark.parametrize(
+    argnames=("budget", "expected"),
+    argvalues=[("", None), ("64", 64 * 2**20), ("0.5", 2**19), ("lots", None), ("-1", None)]
+)
+def test_memory_budget_from_environment(monkeypatch, budget, expected):
+    monkeypatch.setenv("TTRPG_DATA_MEMORY_BUDGET_MB", budget)
+    assert DataRegistry.get_memory_budget() == expected
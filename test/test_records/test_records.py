@@ -0,0 +1,138 @@
+import json
+
+from jsonpath_ng import ext
+import pytest
+
+from profiling import Profiler
+from records import RecordPool, TTRPGRecords
+
+
+@pytest.fixture
+def records():
+    return TTRPGRecords(
+        [
+            {"name": "Fireball", "source": "PHB", "level": 3},
+            {"name": "Fireball", "source": "XPHB", "level": 3},
+            {"name": "Shield", "source": "PHB", "level": 1},
+            {"name": "Heal", "source": "CRB", "level": 1},
+            {"name": "Heal", "source": "PC1", "level": 1},
+        ],
+        index=["name", "source"]
+    )
+
+
+@pytest.mark.parametrize(
+    argnames=("name", "sources", "expected_source"),
+    argvalues=[
+        ("Fireball", None, "PHB"),
+        ("Fireball", ["XPHB", "PHB"], "XPHB"),
+        ("Fireball", ["PHB", "XPHB"], "PHB"),
+        ("Heal", ["PC1", "PC2"], "PC1"),
+    ]
+)
+def test_query_record_sources(records, name, sources, expected_source):
+    assert records.query_record(name, sources) == {"name": name, "source": expected_source, "level": records.loc[(name, expected_source), "level"]}
+
+
+def test_query_record_global_priority(records, monkeypatch):
+    monkeypatch.setattr(TTRPGRecords, "source_priority", ())
+    TTRPGRecords.set_source_priority(["XPHB", "PC1"])
+    assert records.query_record("Fireball")["source"] == "XPHB"
+    assert records.query_record("Heal")["source"] == "PC1"
+    assert records.query_record("Heal", ["CRB"])["source"] == "CRB"
+
+
+def test_query_record_missing(records):
+    with pytest.raises(KeyError):
+        records.query_record("Magic Missile")
+    with pytest.raises(IndexError):
+        records.query_record("Shield", ["PC1"])
+
+
+@pytest.mark.parametrize(
+    argnames=("name", "expected"),
+    argvalues=[
+        ("fireball", "Fireball"),
+        ("Fireball (Legacy)", "Fireball"),
+        ("Firebal", "Fireball"),
+        ("sheild", None),
+        ("Zzyzx", None),
+    ]
+)
+def test_match_names(records, name, expected):
+    matches = records.match_names(name, limit=1)
+    assert [match for match, _ in matches] == ([expected] if expected else [])
+
+
+def test_query_record_fuzzy(records, caplog):
+    assert records.query_record("firebal", ["XPHB"], fuzzy=True)["source"] == "XPHB"
+    assert "Resolved TTRPG Record name firebal to Fireball" in caplog.text
+    with pytest.raises(KeyError):
+        records.query_record("firebal")
+    with pytest.raises(KeyError, match="Similar names: Shield"):
+        records.query_record("Shield Wall", fuzzy=True)
+
+
+@pytest.fixture
+def spells():
+    return TTRPGRecords(
+        [
+            {"name": "Force Barrage", "source": "PC1", "level": 1, "traditions": ["arcane", "occult"]},
+            {"name": "Heal", "source": "PC1", "level": 1, "traditions": ["divine", "primal"]},
+            {"name": "Fireball", "source": "PC1", "level": 3, "traditions": ["arcane", "primal"]},
+            {"name": "Fireball", "source": "CRB", "level": 3, "traditions": ["arcane", "primal"]},
+            {"name": "Wish", "source": "PC2", "level": 10},
+        ],
+        index=["name", "source"]
+    )
+
+
+@pytest.mark.parametrize(
+    argnames=("criteria", "expected"),
+    argvalues=[
+        ({}, [0, 1, 2, 3, 4]),
+        ({"level": 1}, [0, 1]),
+        ({"traditions": "arcane"}, [0, 2, 3]),
+        ({"traditions": {"divine", "occult"}}, [0, 1]),
+        ({"level": slice(2, None)}, [2, 3, 4]),
+        ({"level": slice(1, 3), "traditions": "primal", "source": ["PC1", "PC2"]}, [1, 2]),
+        ({"level": 2}, []),
+        ({"rarity": "rare"}, []),
+    ]
+)
+def test_select_positions(spells, criteria, expected):
+    assert spells.select_positions(**criteria) == expected
+
+
+def test_select(spells):
+    spells.build_indexes("level", "traditions")
+    assert [*spells.attribute_indexes] == ["level", "traditions"]
+    assert spells.select(level=10) == [{"name": "Wish", "source": "PC2", "level": 10}]
+
+
+def test_read_files_share_repeated_values(tmp_path, monkeypatch):
+    entry = "A long sentence repeated across the entries of several spell files."
+    for source in ["PHB", "XPHB"]:
+        (tmp_path / f"spells-{source}.json").write_text(json.dumps({"spell": [
+            {"name": "Shield", "source": source, "traits": ["abjuration"], "entries": [entry], "range": {"type": "self"}}
+        ]}))
+    profiler = Profiler()
+    monkeypatch.setattr("records.PROFILER", profiler)
+    profiler.start(trace_memory=False)
+    first, second = TTRPGRecords.read_files(sorted(tmp_path.glob("*.json")), ext.parse("$.spell")).values()
+    profiler.stop()
+    (a,), (b,) = first, second
+    assert a == b | {"source": "PHB"}
+    assert a["entries"] is b["entries"] and a["range"] is b["range"]
+    assert a["traits"][0] is b["traits"][0]
+    assert profiler.report()["counters"]["records.deduplicated_bytes"] > 0
+
+
+def test_record_pool_shares_equal_values():
+    entry = "A long sentence repeated across the entries of several spell files."
+    pool = RecordPool()
+    assert pool.share([entry]) == [entry]
+    assert pool.saved == 0
+    assert pool.share([entry]) is pool.share([entry])
+    assert pool.share({"type": "self"}) is pool.share({"type": "self"})
+    assert pool.saved > 0
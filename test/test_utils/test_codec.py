@@ -0,0 +1,24 @@
+import json
+
+import pytest
+
+from utils import codec
+
+DECK = [{"title": "Mage’s Hand", "contents": ["rule"], "count": 1, "icon": None, "tags": [], "params": {}}]
+
+BACKENDS = ["orjson", "msgspec", "json"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_match_standard_library(backend):
+    pytest.importorskip(backend)
+    assert codec.loads(json.dumps(DECK).encode(), backend) == DECK
+    assert codec.loads(json.dumps(DECK), backend) == DECK
+    assert codec.dumps(DECK, indent=True, backend=backend) == json.dumps(DECK, indent=4).encode()
+    assert codec.dumps(DECK, backend=backend) == json.dumps(DECK, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_unsupported_objects_fall_back(backend):
+    pytest.importorskip(backend)
+    assert codec.loads(codec.dumps({1: "non string key"}, backend=backend)) == {"1": "non string key"}